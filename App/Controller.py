@@ -25,6 +25,9 @@ import os
 import copy
 import json
 import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # =========================================
 # extension python libraries
@@ -37,6 +40,7 @@ import validators
 import Conf
 from App.Model import Gallery
 from Lib.Recovery.Content import Page
+from Lib.Recovery.Content import NOT_MODIFIED
 from Lib.Utils import Err
 assert Conf
 assert Gallery
@@ -51,12 +55,17 @@ DATA_SCHEMA = Conf.configGlobal(CFG_FOLDER, CFG_SCHEMA)
 # default template for the element/paint dict in gallery
 DEFAULT_FRAME_SCHEMA = eval(DATA_SCHEMA.get("DEFAULT", "columns"))
 
-# defaul waiting time for scrapping data, this helps not to get blocked
-DEFAULT_SLEEP_TIME = 3.0
+# default number of concurrent workers scrapping data, 1 is sequential
+DEFAULT_WORKERS = 1
 
-# default short waiting time for scrapping data, avoids some errors if the
-# script goes to fast
-DEFAULT_SHORT_SLEEP_TIME = 0.2
+# default number of in-flight requests for the asyncio scrapping
+DEFAULT_TASKS = 100
+
+# default number of concurrent workers downloading images
+DEFAULT_DL_WORKERS = 4
+
+# seconds between the progress reports of the image downloads
+DEFAULT_REPORT_TIME = 5.0
 
 
 class Controller ():
@@ -79,6 +88,9 @@ class Controller ():
     schema = copy.deepcopy(DEFAULT_FRAME_SCHEMA)
     gallery = Gallery()
     wpage = Page()
+    workers = DEFAULT_WORKERS
+    tasks = DEFAULT_TASKS
+    dlworkers = DEFAULT_DL_WORKERS
 
     # =========================================
     # class creator
@@ -94,6 +106,12 @@ class Controller ():
             schema (list): array with the column names for the model
             gallery (Gallery): object with the gallery dataframe model
             # wpage (Page): the current webpage the controller is scrapping
+            workers (int, optional): concurrent workers for the scrap_*()
+            functions. Defaults to 1, sequential scrapping
+            tasks (int, optional): in-flight requests for the ascrap_*()
+            functions. Defaults to 100
+            dlworkers (int, optional): concurrent workers for the image
+            downloads of dlpaints(). Defaults to 4
 
         Raises:
             exp: raise a generic exception if something goes wrong
@@ -110,6 +128,9 @@ class Controller ():
             self.schema = copy.deepcopy(DEFAULT_FRAME_SCHEMA)
             self.gallery = Gallery()
             self.wpage = Page()
+            self.workers = DEFAULT_WORKERS
+            self.tasks = DEFAULT_TASKS
+            self.dlworkers = DEFAULT_DL_WORKERS
 
             # when arguments are pass as parameters
             if len(args) > 0:
@@ -141,6 +162,18 @@ class Controller ():
                     if key == "model":
                         self.gallery = kwargs[key]
 
+                    # concurrent workers for the scrapping
+                    if key == "workers":
+                        self.workers = max(1, int(kwargs[key]))
+
+                    # in-flight requests for the asyncio scrapping
+                    if key == "tasks":
+                        self.tasks = max(1, int(kwargs[key]))
+
+                    # concurrent workers for the image downloads
+                    if key == "dlworkers":
+                        self.dlworkers = max(1, int(kwargs[key]))
+
         # exception handling
         except Exception as exp:
             Err.reraise(exp, "Controller: __init__")
@@ -216,6 +249,22 @@ class Controller ():
         except Exception as exp:
             Err.reraise(exp, "Controller: create_localfolders")
 
+    def close(self):
+        """
+        closes the warm browsers of the gallery model, the view calls it
+        when its menu loop ends
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            gm = self.gallery
+            gm.close()
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Controller: close")
+
     # =========================================
     # Index functions
     # =========================================
@@ -246,6 +295,85 @@ class Controller ():
         except Exception as exp:
             Err.reraise(exp, "Controller: scrapidx")
 
+    def iterindex(self, gurl, stime, div, attrs):
+        """
+        Scrolls the gallery index and answers each element as soon as it is
+        rendered, before the whole index is loaded
+
+        Args:
+            gurl (str): URL for the gallery to scrap data
+            stime (float): waiting time between scroll steps
+            div (str): HTML <div> keyword to search and scrap
+            attrs (dict): decorative attributes in the <div> keyword to refine
+            the search and scrap
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (generator): href/title dict of each gallery element
+        """
+        try:
+            gm = self.gallery
+            ans = gm.iterindex(gurl, stime, div, attrs)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Controller: iterindex")
+
+    def get_itemcols(self, items, ide, clean, etitle, rurl, urle):
+        """
+        gets the ID, title and collection URL columns of the elements of
+        iterindex() while the index still loads
+
+        Args:
+            items (generator): href/title dict of each gallery element
+            ide (str): key of the element (paint) ID
+            clean (str): URL path to remove from the element (paint) ID
+            etitle (str): key of the element title
+            rurl (str): root URL of the domain to complete the element url
+            urle (str): key of the element URL
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (tuple): lists with the IDs, titles and collection URLs
+        """
+        try:
+            gm = self.gallery
+            ans = gm.get_itemcols(items, ide, clean, etitle, rurl, urle)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Controller: get_itemcols")
+
+    def scrapidx_sitemap(self, rurl, clean):
+        """
+        Creates a new index with the collection URLs of the site's sitemap,
+        without scrolling the gallery
+
+        Args:
+            rurl (str): root URL of the domain to complete the element url
+            clean (str): URL path to remove from the element (paint) ID
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (tuple): lists with the IDs, titles and collection URLs
+        """
+        try:
+            gm = self.gallery
+            ans = gm.scrapidx_sitemap(rurl, clean)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Controller: scrapidx_sitemap")
+
     def scrapagn(self, div, attrs):
         """
         Scrap for new information and complete the dataframe index after
@@ -271,6 +399,34 @@ class Controller ():
         except Exception as exp:
             Err.reraise(exp, "Controller: scrapagn")
 
+    def get_idxcols(self, gsoup, ide, clean, etitle, rurl, urle):
+        """
+        Gets the IDs, titles and collection URLs of the gallery elements
+        in one walk over the index
+
+        Args:
+            gsoup (bs-obj): list with gallery elements in Beatiful Soup format
+            ide (str): HTML <div> keyword to extract the element (paint) ID
+            clean (str): URL path to remove from the element (paint) ID
+            etitle (str): HTML <div> keyword to extract the element title
+            rurl (str): root URL of the domain to complete the element url
+            urle (str): HTML <div> keyword to extract the element URL
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (tuple): lists with the IDs, titles and collection URLs
+        """
+        try:
+            gm = self.gallery
+            ans = gm.get_idxcols(gsoup, ide, clean, etitle, rurl, urle)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Controller: get_idxcols")
+
     def get_idxid(self, gsoup, ide, clean):
         """
         get the unique identifier (ID) of the gallery elements (paints) and
@@ -352,6 +508,95 @@ class Controller ():
         except Exception as exp:
             Err.reraise(exp, "Controller: get_idxtitle")
 
+    # =========================================
+    # Concurrent scrapping functions
+    # =========================================
+
+    def run_tasks(self, task, items, workers=None):
+        """
+        Execute a scrapping task over each item of a list, with a pool of
+        concurrent workers if the controller has more than one, the answers
+        keep the order of the items so they line up with the dataframe rows,
+        the gallery's rate limiter paces the requests of all the workers
+
+        Args:
+            task (function): function with one item as parameter
+            items (list): items to process, ie.: gallery element urls
+            workers (int, optional): concurrent workers for this task.
+            Defaults to None, the controller's workers
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (list): answer of the task for each item, in the same order
+        """
+        try:
+            # default answer
+            ans = list()
+            if workers is None:
+                workers = self.workers
+
+            # sequential scrapping
+            if workers == 1:
+                for item in items:
+                    ans.append(task(item))
+
+            # concurrent scrapping, map() returns in the items order
+            elif workers > 1:
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    ans = list(pool.map(task, items))
+
+            # returning answer
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Controller: run_tasks")
+
+    async def arun_tasks(self, task, items):
+        """
+        asyncio version of run_tasks(), execute a coroutine task over each
+        item of a list in the same event loop with at most the controller's
+        in-flight tasks, the answers keep the order of the items and the
+        gallery's rate limiter paces the requests
+
+        Args:
+            task (coroutine function): function with one item as parameter
+            items (list): items to process, ie.: gallery element urls
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (list): answer of the task for each item, in the same order
+        """
+        try:
+            # default answer
+            ans = list()
+            gm = self.gallery
+            inflight = asyncio.Semaphore(self.tasks)
+
+            async def bounded_task(item):
+                async with inflight:
+                    return await task(item)
+
+            # gather() returns in the items order
+            try:
+                ans = await asyncio.gather(*[bounded_task(i) for i in items])
+                ans = list(ans)
+
+            # closing the client session of the event loop
+            finally:
+                await gm.wapool.close()
+
+            # returning answer
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Controller: arun_tasks")
+
     # =========================================
     # Scrap columns functions from Index
     # =========================================
@@ -388,15 +633,16 @@ class Controller ():
             elem = args[3]
             clean = args[4]
 
-            for url in self.getdata(coln):
+            opt_in = [div, attrs, elem, clean]
 
+            def scrap_element(url):
                 tsoup = gm.scrape(url, div, attrs, **kwargs)
-                tans = gm.clean_description(tsoup, elem, clean)
 
-                # compose answer
-                tans = self.to_json(tans)
-                ans.append(tans)
-                time.sleep(DEFAULT_SLEEP_TIME)
+                # the column plan, or its extractor, in JSON format
+                tans = self.clean_column("DESCRIPTION", None, tsoup, opt_in)
+                return tans
+
+            ans = self.run_tasks(scrap_element, self.getdata(coln))
 
             # returning answer
             return ans
@@ -434,16 +680,18 @@ class Controller ():
             attrs = args[3]
             elem = args[4]
 
-            # getting the element url in the gallery
-            for url in self.getdata(coln):
+            opt_in = [div, attrs, elem, None]
 
+            def scrap_element(url):
                 # scraping elements each gallery page
                 tsoup = gm.scrape(url, div, attrs, **kwargs)
-                tans = gm.clean_dlurl(tsoup, rurl, elem)
 
-                # compose answer
-                ans.append(tans)
-                time.sleep(DEFAULT_SLEEP_TIME)
+                # the column plan, or its extractor, plain URL
+                tans = self.clean_column("DOWNLOAD_URL", rurl, tsoup, opt_in)
+                return tans
+
+            # getting the element url in the gallery
+            ans = self.run_tasks(scrap_element, self.getdata(coln))
 
             # returning answer
             return ans
@@ -452,10 +700,11 @@ class Controller ():
         except Exception as exp:
             Err.reraise(exp, "Controller: scrap_paintlinks")
 
-    def dlpaints(self, *args):
+    def dlpaints(self, *args, **kwargs):
         """
         download the paint files from the list of available asset url
-        in the gallery
+        in the gallery, with the controller's download workers, the
+        gallery's connections per host and bandwidth limit
 
         Args:
             dlurl_coln (str): column name of known download URLs
@@ -464,6 +713,9 @@ class Controller ():
             attrs (dict): decorative <div> keywords to refine the scrap
             elem (str): secondary <div> keyword to refine the search
             and scrap process
+            report (function, optional): called with the downloaded files,
+            the bytes and the seconds since the start every few seconds
+            and at the end
 
         Raises:
             exp: raise a generic exception if something goes wrong
@@ -482,26 +734,43 @@ class Controller ():
             attrs = args[3]
             elem = args[4]
             clean = args[5]
+            report = kwargs.get("report")
 
-            for url in self.getdata(dlurl_coln):
+            # download progress shared by the workers
+            lock = threading.Lock()
+            start = time.monotonic()
+            progress = {"files": 0, "bytes": 0, "last": start}
+
+            def download_element(url):
+                tans = False
 
                 # the url is valid, it can be null or na or none
                 if validators.url(str(url)) is True:
-
-                    # recovers the image file name
-                    tsoup = gm.get_imgfn(url, div, attrs)
-                    # clean the name to save
-                    timgf = gm.clean_imgfn(tsoup, elem, clean)
-                    # download and save the image in the local folder
-                    tans = gm.get_imgf(gf, url, timgf)
-                    ans.append(tans)
-
-                # invalid url
-                else:
-                    tans = False
-                    ans.append(tans)
-
-                time.sleep(DEFAULT_SLEEP_TIME)
+                    tans, nbytes = gm.dlimage(gf, url, div, attrs,
+                                              elem, clean)
+
+                    # reporting the progress every few seconds
+                    with lock:
+                        progress["files"] += 1
+                        progress["bytes"] += nbytes
+                        now = time.monotonic()
+                        due = now - progress["last"] >= DEFAULT_REPORT_TIME
+                        if report is not None and due:
+                            progress["last"] = now
+                            report(progress["files"],
+                                   progress["bytes"],
+                                   now - start)
+
+                return tans
+
+            urls = self.getdata(dlurl_coln)
+            ans = self.run_tasks(download_element, urls, self.dlworkers)
+
+            # final report of the stage
+            if report is not None:
+                report(progress["files"],
+                       progress["bytes"],
+                       time.monotonic() - start)
 
             # returning answer
             return ans
@@ -543,16 +812,17 @@ class Controller ():
             elem = args[4]
             clean = args[5]
 
-            for url in self.getdata(coln):
+            opt_in = [div, attrs, elem, clean]
+
+            def scrap_element(url):
                 # scraping elements each gallery page
                 tsoup = gm.scrape(url, div, attrs, **kwargs)
-                # extracting the search tags from the soup
-                tans = gm.clean_searchtags(rurl, tsoup, elem, clean)
 
-                # compose answer
-                tans = self.to_json(tans)
-                ans.append(tans)
-                time.sleep(DEFAULT_SLEEP_TIME)
+                # the column plan, or its extractor, in JSON format
+                tans = self.clean_column("SEARCH_TAGS", rurl, tsoup, opt_in)
+                return tans
+
+            ans = self.run_tasks(scrap_element, self.getdata(coln))
 
             # returning answer
             return ans
@@ -591,15 +861,17 @@ class Controller ():
             div = args[1]
             attrs = args[2]
             elem = args[3]
-            for url in self.getdata(coln):
 
+            opt_in = [div, attrs, elem, None]
+
+            def scrap_element(url):
                 tsoup = gm.scrape(url, div, attrs, **kwargs)
-                tans = gm.clean_objdata(tsoup, elem)
 
-                # compose answer
-                tans = self.to_json(tans)
-                ans.append(tans)
-                time.sleep(DEFAULT_SLEEP_TIME)
+                # the column plan, or its extractor, in JSON format
+                tans = self.clean_column("OBJ_DATA", None, tsoup, opt_in)
+                return tans
+
+            ans = self.run_tasks(scrap_element, self.getdata(coln))
 
             # returning answer
             return ans
@@ -639,31 +911,343 @@ class Controller ():
             elem = args[4]
             clean = args[5]
 
-            for url in self.getdata(coln):
+            opt_in = [div, attrs, elem, clean]
 
+            def scrap_element(url):
                 # scraping elements each gallery page
                 tsoup = gm.scrape(url, div, attrs, **kwargs)
 
-                # # default empty dict to return
+                # the column plan, or its extractor, in JSON format
+                tans = self.clean_column("RELATED_WORKS", rurl, tsoup, opt_in)
+                return tans
+
+            ans = self.run_tasks(scrap_element, self.getdata(coln))
+
+            # returning answer
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Controller: scrap_relwork")
+
+    def scrap_collection(self, *args, **kwargs):
+        """
+        Scrap several columns from the elements (paints) collection page
+        requesting each page only once, all the configured extractors run
+        over the same HTML document
+
+        Args:
+            coln (str): ID column name of the gallery dataframe
+            rurl (str): root URL of the domain to complete the links
+            tags (dict): column names of the gallery dataframe with the
+            tuple of their HTML tags (div, attrs, elem, clean) and the
+            multiple flag to find in the page, ie.:
+            {"OBJ_DATA": (["dl", {...}, ["dt", "dd"], None], False)}
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): column names with the list of scraped data for each
+            of the gallery elements
+        """
+        try:
+            # default answer, one list for each column
+            gm = self.gallery
+            coln = args[0]
+            rurl = args[1]
+            tags = args[2]
+            ans = dict()
+            for col in tags.keys():
+                ans[col] = list()
+
+            def scrap_element(url):
+                # requesting the element page only once
+                wpage = gm.fetch(url)
                 tans = dict()
 
+                # running all the column extractors over the same page
+                for col, opts in tags.items():
+
+                    opt_in = opts[0]
+                    multiple = opts[1]
+                    tsoup = gm.scrapin(wpage,
+                                       opt_in[0],
+                                       opt_in[1],
+                                       multiple=multiple)
+                    tans[col] = self.clean_column(col, rurl, tsoup, opt_in)
+                return tans
+
+            # splitting the element answers into the columns
+            for tans in self.run_tasks(scrap_element, self.getdata(coln)):
+                for col in tags.keys():
+                    ans[col].append(tans[col])
+
+            # returning answer
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Controller: scrap_collection")
+
+    def clean_column(self, column, rurl, tsoup, opt_in):
+        """
+        Clean the scraped soup of an element page with the compiled
+        extraction plan of the dataframe column, or with its extractor, the
+        same ones the scrap_*() functions use
+
+        Args:
+            column (str): column name of the gallery dataframe
+            rurl (str): root URL of the domain to complete the links
+            tsoup (bs-obj): beatifulSoup object with the column data
+            opt_in (list): HTML tags of the column (div, attrs, elem, clean)
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (str): clean data for the column, JSON format for the
+            dictionaries
+        """
+        try:
+            # default answer
+            ans = None
+            gm = self.gallery
+            elem = opt_in[2]
+            clean = opt_in[3]
+
+            # unchanged page, the gallery keeps the column data
+            if tsoup is NOT_MODIFIED:
+                return tsoup
+
+            # compiled extraction plan of the column
+            if column in gm.get_plans():
+                ans = gm.clean_plan(column, tsoup, rurl)
+                if isinstance(ans, dict):
+                    ans = self.to_json(ans)
+
+            # download link of the image file, plain URL
+            elif column == "DOWNLOAD_URL":
+                ans = gm.clean_dlurl(tsoup, rurl, elem)
+
+            # description, search-tags, object-data and related work
+            elif column == "DESCRIPTION":
+                ans = gm.clean_description(tsoup, elem, clean)
+                ans = self.to_json(ans)
+
+            elif column == "SEARCH_TAGS":
+                ans = gm.clean_searchtags(rurl, tsoup, elem, clean)
+                ans = self.to_json(ans)
+
+            elif column == "OBJ_DATA":
+                ans = gm.clean_objdata(tsoup, elem)
+                ans = self.to_json(ans)
+
+            elif column == "RELATED_WORKS":
+                ans = dict()
                 # checking if there is any related work to process
-                if len(tsoup) > 0:
+                if tsoup is not None and len(tsoup) > 0:
+                    ans = gm.clean_relwork(rurl, tsoup, elem, clean)
+                ans = self.to_json(ans)
 
-                    # extracting the search tags from the soup
-                    tans = gm.clean_relwork(rurl, tsoup, elem, clean)
+            # returning answer
+            return ans
 
-                # compose answer
-                tans = self.to_json(tans)
-                ans.append(tans)
-                time.sleep(DEFAULT_SLEEP_TIME)
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Controller: clean_column")
+
+    # =========================================
+    # Asyncio scrap columns functions from Index
+    # =========================================
+
+    async def ascrap_collection(self, *args, **kwargs):
+        """
+        asyncio version of scrap_collection(), requests each element
+        (paint) collection page only once and runs all the configured
+        extractors over the same HTML document
+
+        Args:
+            coln (str): ID column name of the gallery dataframe
+            rurl (str): root URL of the domain to complete the links
+            tags (dict): column names of the gallery dataframe with the
+            tuple of their HTML tags (div, attrs, elem, clean) and the
+            multiple flag to find in the page
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): column names with the list of scraped data for each
+            of the gallery elements
+        """
+        try:
+            # default answer, one list for each column
+            gm = self.gallery
+            coln = args[0]
+            rurl = args[1]
+            tags = args[2]
+            ans = dict()
+            for col in tags.keys():
+                ans[col] = list()
+
+            async def scrap_element(url):
+                # requesting the element page only once
+                wpage = await gm.afetch(url)
+                tans = dict()
+
+                # running all the column extractors over the same page
+                for col, opts in tags.items():
+
+                    opt_in = opts[0]
+                    multiple = opts[1]
+                    tsoup = gm.scrapin(wpage,
+                                       opt_in[0],
+                                       opt_in[1],
+                                       multiple=multiple)
+                    tans[col] = self.clean_column(col, rurl, tsoup, opt_in)
+                return tans
+
+            # splitting the element answers into the columns
+            urls = self.getdata(coln)
+            for tans in await self.arun_tasks(scrap_element, urls):
+                for col in tags.keys():
+                    ans[col].append(tans[col])
 
             # returning answer
             return ans
 
         # exception handling
         except Exception as exp:
-            Err.reraise(exp, "Controller: scrap_relwork")
+            Err.reraise(exp, "Controller: ascrap_collection")
+
+    async def ascrap_column(self, column, coln, rurl, opt_in, **kwargs):
+        """
+        scrap a single column with the asyncio engine, same answer of the
+        column's scrap_*() function
+
+        Args:
+            column (str): column name of the gallery dataframe to scrap
+            coln (str): ID column name of the gallery dataframe
+            rurl (str): root URL of the domain to complete the links
+            opt_in (list): HTML tags of the column (div, attrs, elem, clean)
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (list): list of scraped data for the column
+        """
+        try:
+            tags = {column: (opt_in, kwargs.get("multiple"))}
+            ans = await self.ascrap_collection(coln, rurl, tags)
+            ans = ans[column]
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Controller: ascrap_column")
+
+    async def ascrap_descriptions(self, *args, **kwargs):
+        """
+        asyncio version of scrap_descriptions(), same arguments and answer
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (list): list of element descriptions in JSON format
+        """
+        try:
+            opt_in = list(args[1:5])
+            ans = await self.ascrap_column("DESCRIPTION", args[0], None,
+                                           opt_in, **kwargs)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Controller: ascrap_descriptions")
+
+    async def ascrap_paintlinks(self, *args, **kwargs):
+        """
+        asyncio version of scrap_paintlinks(), same arguments and answer
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (list): list of the URLs (HTTP) to download the elements
+        """
+        try:
+            opt_in = list(args[2:5]) + [None]
+            ans = await self.ascrap_column("DOWNLOAD_URL", args[0], args[1],
+                                           opt_in, **kwargs)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Controller: ascrap_paintlinks")
+
+    async def ascrap_searchtags(self, *args, **kwargs):
+        """
+        asyncio version of scrap_searchtags(), same arguments and answer
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (list): list of element search-tags in JSON format
+        """
+        try:
+            opt_in = list(args[2:6])
+            ans = await self.ascrap_column("SEARCH_TAGS", args[0], args[1],
+                                           opt_in, **kwargs)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Controller: ascrap_searchtags")
+
+    async def ascrap_objdata(self, *args, **kwargs):
+        """
+        asyncio version of scrap_objdata(), same arguments and answer
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (list): list of element object-data in JSON format
+        """
+        try:
+            opt_in = list(args[1:4]) + [None]
+            ans = await self.ascrap_column("OBJ_DATA", args[0], None,
+                                           opt_in, **kwargs)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Controller: ascrap_objdata")
+
+    async def ascrap_relwork(self, *args, **kwargs):
+        """
+        asyncio version of scrap_relwork(), same arguments and answer
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (list): the list of the related work recovered from the
+            gallery elements
+        """
+        try:
+            opt_in = list(args[2:6])
+            ans = await self.ascrap_column("RELATED_WORKS", args[0], args[1],
+                                           opt_in, **kwargs)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Controller: ascrap_relwork")
 
     def export_paints(self, *args):
         """
@@ -712,7 +1296,6 @@ class Controller ():
                 # compose answer
                 tans = self.to_json(tans)
                 ans.append(tans)
-                time.sleep(DEFAULT_SHORT_SLEEP_TIME)
 
             # return answer list
             return ans
@@ -764,7 +1347,6 @@ class Controller ():
                 # compose answer
                 tans = self.to_json(tans)
                 ans.append(tans)
-                time.sleep(DEFAULT_SHORT_SLEEP_TIME)
 
             # return answer list
             return ans
@@ -941,7 +1523,6 @@ class Controller ():
 
                 tfile = fname + ".json"
                 self.write_json(tdata, tfile, gfolder, tindex)
-                time.sleep(DEFAULT_SHORT_SLEEP_TIME)
 
         # exception handling
         except Exception as exp:
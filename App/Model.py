@@ -27,6 +27,14 @@ import csv
 import re
 import unicodedata
 import urllib
+import queue
+import threading
+import time
+from urllib.parse import urlsplit
+from urllib.parse import urlunsplit
+from urllib.parse import parse_qsl
+from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor
 
 # ===============================
 # extension python libraries
@@ -40,9 +48,45 @@ import cv2
 import Conf
 from Lib.Utils import Err
 from Lib.Recovery.Content import Page
+from Lib.Recovery.Content import NOT_MODIFIED
+from Lib.Recovery.Content import NOT_MODIFIED_STATUS
+from Lib.Recovery.Content import PARTIAL_STATUS
+from Lib.Recovery.Content import DEFAULT_CHUNK_SIZE
+from Lib.Recovery.Pool import Pool
+from Lib.Recovery.Limiter import Limiter
+from Lib.Recovery.Throttle import Throttle
+from Lib.Recovery.Deadline import Deadline
+from Lib.Recovery.Cache import Cache
+from Lib.Recovery.Cache import REPLAY_MISS_STATUS
+from Lib.Recovery.Validator import Validator
+from Lib.Recovery.Sitemap import Sitemap
+from Lib.Recovery.Browser import BrowserPool
+from Lib.Recovery.Parser import new_soup
+from Lib.Recovery.Parser import get_dialect
+from Lib.Recovery.Parser import new_strainer
+from Lib.Recovery.Parser import DEFAULT_HTML_PARSER
+from Lib.Recovery.AsyncContent import AsyncPage
+from Lib.Recovery.AsyncContent import AsyncPool
 from Lib.Recovery.Cleaner import Topic
+from Lib.Recovery.Cleaner import clrtexts
+from Lib.Recovery.Cleaner import TextCache
 assert Topic
+assert TextCache
+assert clrtexts
 assert Page
+assert Pool
+assert Limiter
+assert Throttle
+assert Deadline
+assert Cache
+assert Validator
+assert Sitemap
+assert BrowserPool
+assert new_soup
+assert get_dialect
+assert new_strainer
+assert AsyncPage
+assert AsyncPool
 assert Err
 assert Conf
 
@@ -56,6 +100,25 @@ DATA_SCHEMA = Conf.configGlobal(CFG_FOLDER, CFG_SCHEMA)
 # default template for the element/paint dict in gallery
 DEFAULT_FRAME_SCHEMA = eval(DATA_SCHEMA.get("DEFAULT", "columns"))
 
+# default connections per host of the image downloads
+DEFAULT_DL_PER_HOST = 4
+
+# default bandwidth of the image downloads in bytes/s, 0 is no limit
+DEFAULT_DL_BANDWIDTH = 0
+
+# default index discovery, "selenium" infinite scroll or "http" pages
+DEFAULT_INDEX = {
+    "engine": "selenium",
+    "param": "page",
+    "start": 1,
+    "batch": 4,
+    "maxpages": 500,
+    "retries": 3,
+}
+
+# seconds before the first retry of a failed listing page, it doubles
+DEFAULT_INDEX_BACKOFF = 1.0
+
 
 # ================================================
 # API for the scrapping the gallery of paintings
@@ -76,6 +139,24 @@ class Gallery():
     schema = copy.deepcopy(DEFAULT_FRAME_SCHEMA)
     data_frame = pd.DataFrame(columns=DEFAULT_FRAME_SCHEMA)
     wpage = Page()
+    wpool = None
+    wapool = None
+    wlimiter = None
+    wthrottle = None
+    wdeadline = None
+    wcache = None
+    wvalidator = None
+    wdlpool = None
+    wbandwidth = None
+    wsitemap = None
+    wbrowsers = None
+    wstrainer = None
+    wtopic = None
+    wtexts = None
+    earlyabort = False
+    index = DEFAULT_INDEX
+    scroll = dict()
+    dialect = DEFAULT_HTML_PARSER
 
     # =========================================
     # functions to create a new gallery
@@ -91,6 +172,52 @@ class Gallery():
             data_frame (data_frame, optional): panda df with data (ie.: paints)
             in the gallery, you can pass an existing df, Default is empty
             wpage (Page): the current webpage the controller is scrapping
+            pool (dict, optional): connection pool settings shared by all
+            the gallery's pages, ie.: {"poolsize": 10, "retries": 3}, the
+            "limit" and "perhost" keys configure the asyncio pages
+            rate (dict, optional): token-bucket settings for the requests of
+            each host, ie.: {"rate": 0.5, "burst": 2}
+            throttle (dict, optional): AIMD concurrency settings for the
+            in-flight requests, ie.: {"start": 2, "maximum": 16}, None
+            disables it. Defaults to None
+            cache (dict, optional): local response cache settings, ie.:
+            {"folder": "Data/Cache", "replay": True}, None disables it.
+            Defaults to None
+            validator (dict, optional): ETag/Last-Modified store settings,
+            ie.: {"fpath": "Data/validators.json", "refresh": True}, None
+            disables it. Defaults to None
+            deadline (dict, optional): connect, read and total seconds of
+            each request and the hedging of the slow ones, ie.:
+            {"total": 60, "hedge": True}. Defaults to the Deadline() ones
+            downloads (dict, optional): image downloads settings, its own
+            connections per host and bandwidth in bytes/s, ie.:
+            {"perhost": 4, "bandwidth": 1048576}
+            index (dict, optional): gallery index discovery, the "engine"
+            is "selenium" for the infinite scroll or "http" for the listing
+            pages, ie.: {"engine": "http", "param": "page", "batch": 4}
+            scroll (dict, optional): infinite scroll settings of the index
+            page, ie.: {"poll": 0.2, "maxscroll": 900}
+            browsers (dict, optional): warm headless browsers settings, ie.:
+            {"size": 1, "maxuses": 20}, None starts a new browser for each
+            index. Defaults to None
+            sitemap (dict, optional): sitemap discovery and lastmod store
+            settings, ie.: {"url": ".../sitemap.xml", "incremental": True},
+            None disables it. Defaults to None
+            dialect (str, optional): parser backend of the pages, ie.:
+            "lxml", "html.parser" replaces the ones not installed. Defaults
+            to "html.parser"
+            targets (list, optional): HTML <div> keywords and attributes of
+            the scraped sections of the collection pages, only they are
+            parsed, ie.: [("dl", {"class": "definition-list"})]. Defaults to
+            None, the whole page
+            tags (ConfigParser, optional): html-tags.ini config, the columns
+            with "fields" are compiled into extraction plans. Defaults to
+            None, no plans
+            earlyabort (bool, optional): the scraps of a single tag stream
+            the page and close it once the tag is found, the pages are not
+            saved in the cache. Defaults to False
+            texts (dict, optional): memory cache of the clean texts, ie.:
+            {"maxsize": 65536}, None cleans every text. Defaults to None
 
         Raises:
             exp: raise a generic exception if something goes wrong
@@ -107,6 +234,34 @@ class Gallery():
             self.schema = copy.deepcopy(DEFAULT_FRAME_SCHEMA)
             self.data_frame = pd.DataFrame(columns=DEFAULT_FRAME_SCHEMA)
             self.wpage = Page()
+            self.wpool = None
+            self.wapool = None
+            self.wlimiter = None
+            self.wthrottle = None
+            self.wdeadline = None
+            self.wcache = None
+            self.wvalidator = None
+            self.wdlpool = None
+            self.wbandwidth = None
+            self.wsitemap = None
+            self.wbrowsers = None
+            self.wstrainer = None
+            self.wtopic = None
+            self.wtexts = None
+            self.earlyabort = False
+            self.index = copy.deepcopy(DEFAULT_INDEX)
+            self.scroll = dict()
+            self.dialect = DEFAULT_HTML_PARSER
+            pool_cfg = dict()
+            rate_cfg = dict()
+            throttle_cfg = None
+            deadline_cfg = dict()
+            cache_cfg = None
+            validator_cfg = None
+            sitemap_cfg = None
+            browsers_cfg = None
+            tags_cfg = None
+            dl_cfg = dict()
 
             # when arguments are pass as parameters
             if len(args) > 0:
@@ -137,10 +292,133 @@ class Gallery():
                         self.schema = copy.deepcopy(kwargs[key])
                         self.data_frame = pd.DataFrame(columns=self.schema)
 
+                    # configuring the shared connection pool
+                    if key == "pool":
+                        pool_cfg = copy.deepcopy(kwargs[key])
+
+                    # configuring the requests rate limit
+                    if key == "rate":
+                        rate_cfg = copy.deepcopy(kwargs[key])
+
+                    # configuring the adaptive concurrency control
+                    if key == "throttle":
+                        throttle_cfg = copy.deepcopy(kwargs[key])
+
+                    # configuring the requests deadlines and hedging
+                    if key == "deadline":
+                        deadline_cfg = copy.deepcopy(kwargs[key])
+
+                    # configuring the local response cache
+                    if key == "cache":
+                        cache_cfg = copy.deepcopy(kwargs[key])
+
+                    # configuring the conditional requests
+                    if key == "validator":
+                        validator_cfg = copy.deepcopy(kwargs[key])
+
+                    # configuring the image downloads
+                    if key == "downloads":
+                        dl_cfg = copy.deepcopy(kwargs[key])
+
+                    # configuring the gallery index discovery
+                    if key == "index":
+                        self.index.update(copy.deepcopy(kwargs[key]))
+
+                    # configuring the infinite scroll of the index
+                    if key == "scroll":
+                        self.scroll = copy.deepcopy(kwargs[key])
+
+                    # configuring the warm browsers
+                    if key == "browsers":
+                        browsers_cfg = copy.deepcopy(kwargs[key])
+
+                    # configuring the sitemap discovery
+                    if key == "sitemap":
+                        sitemap_cfg = copy.deepcopy(kwargs[key])
+
+                    # choosing the parser backend of the pages
+                    if key == "dialect":
+                        self.dialect = get_dialect(kwargs[key])
+
+                    # parsing only the scraped sections of the pages
+                    if key == "targets":
+                        self.wstrainer = new_strainer(kwargs[key])
+
+                    # compiling the extraction plans of the columns
+                    if key == "tags":
+                        tags_cfg = kwargs[key]
+
+                    # streaming the single tag scraps
+                    if key == "earlyabort":
+                        self.earlyabort = bool(kwargs[key])
+
+                    # remembering the repeated clean texts
+                    if key == "texts" and kwargs[key] is not None:
+                        self.wtexts = TextCache(**kwargs[key])
+
+            # shared rate limiter, throttle and connection pools
+            self.wlimiter = Limiter(**rate_cfg)
+            pool_cfg["limiter"] = self.wlimiter
+
+            if throttle_cfg is not None:
+                self.wthrottle = Throttle(**throttle_cfg)
+                pool_cfg["throttle"] = self.wthrottle
+
+            self.wdeadline = Deadline(**deadline_cfg)
+            pool_cfg["deadline"] = self.wdeadline
+
+            if cache_cfg is not None:
+                self.wcache = Cache(**cache_cfg)
+
+            if validator_cfg is not None:
+                self.wvalidator = Validator(**validator_cfg)
+
+            # image downloads, own connections per host and bandwidth but
+            # the same request rate, throttle and Retry-After of the pages
+            perhost = dl_cfg.get("perhost", DEFAULT_DL_PER_HOST)
+            bandwidth = dl_cfg.get("bandwidth", DEFAULT_DL_BANDWIDTH)
+            self.wdlpool = Pool(hosts=pool_cfg.get("hosts", perhost),
+                                poolsize=perhost,
+                                block=True,
+                                limiter=self.wlimiter,
+                                throttle=self.wthrottle,
+                                deadline=self.wdeadline)
+            self.wbandwidth = Limiter(rate=bandwidth,
+                                      burst=max(bandwidth, DEFAULT_CHUNK_SIZE))
+
+            self.wpool = Pool(**pool_cfg)
+            self.wapool = AsyncPool(**pool_cfg)
+
+            if sitemap_cfg is not None:
+                self.wsitemap = Sitemap(pool=self.wpool, **sitemap_cfg)
+
+            if browsers_cfg is not None:
+                self.wbrowsers = BrowserPool(**browsers_cfg)
+
+            self.wtopic = Topic(dialect=self.dialect,
+                                clrtext=self.clrtext,
+                                tags=tags_cfg)
+
         # exception handling
         except Exception as exp:
             Err.reraise(exp, "Gallery: __init__")
 
+    def close(self):
+        """
+        closes the warm browsers of the gallery, the app calls it when it
+        ends
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            if self.wbrowsers is not None:
+                self.wbrowsers.close()
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: close")
+
     # =========================================
     # Index functions
     # =========================================
@@ -164,11 +442,20 @@ class Gallery():
         """
         try:
             # reset working web page
-            self.wpage = Page()
+            self.wpage = Page(browsers=self.wbrowsers,
+                              dialect=self.dialect,
+                              **self.scroll)
             ans = None
 
-            # getting the basic element list from gallery online index
-            self.wpage.get_collection(gurl, stime)
+            # paging the listing over plain HTTP, without browser
+            if self.index.get("engine") == "http":
+                self.wpage = self.scrapidx_pages(gurl, div, attrs)
+
+            # getting the basic element list from gallery online index,
+            # harvested while it scrolls
+            else:
+                self.wpage.get_collection(gurl, stime, div, attrs)
+
             ans = self.wpage.findin(div, attributes=attrs)
 
             # returning answer
@@ -178,6 +465,247 @@ class Gallery():
         except Exception as exp:
             Err.reraise(exp, "Gallery: scrapidx")
 
+    def iterindex(self, gurl, stime, div, attrs):
+        """
+        Scrolls the gallery index in a background thread and answers each
+        element as soon as it is rendered, so the per element scrap can
+        start while the index is still loading. the working page keeps the
+        whole index for scrapagn() once the iteration ends, an error of the
+        scroll is raised here instead of ending an incomplete index. if the
+        consumer stops early the scroll stops too and its thread is joined
+
+        Args:
+            gurl (str): gallery URL to scrap data
+            stime (float): waiting time between scroll steps
+            div (str): HTML <div> keyword to search and scrap
+            attrs (dict): decorative attributes in the <div> keyword to refine
+            the search and scrap
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (generator): href/title dict of each gallery element
+        """
+        try:
+            harvest = queue.Queue()
+            stop = threading.Event()
+            self.wpage = Page(browsers=self.wbrowsers,
+                              dialect=self.dialect,
+                              **self.scroll)
+            scroll = threading.Thread(target=self.wpage.get_collection,
+                                      args=(gurl, stime, div, attrs,
+                                            harvest, stop),
+                                      daemon=True)
+            scroll.start()
+
+            try:
+                # the scroll ends the harvest with None or its error
+                item = harvest.get()
+                while item is not None:
+                    if isinstance(item, Exception):
+                        raise item
+
+                    yield item
+                    item = harvest.get()
+
+            # a consumer that stops early or fails stops the scroll, so
+            # the browser is released before the thread ends
+            finally:
+                stop.set()
+                scroll.join()
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: iterindex")
+
+    def get_pageurl(self, gurl, npage):
+        """
+        creates the URL of a listing page of the gallery index, the page
+        number goes in the query parameter of the index configuration
+
+        Args:
+            gurl (str): gallery URL to scrap data
+            npage (int): number of the listing page
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (str): URL of the listing page
+        """
+        try:
+            parts = urlsplit(gurl)
+            param = self.index.get("param")
+            query = [(k, v) for k, v in parse_qsl(parts.query,
+                                                   keep_blank_values=True)
+                     if k != param]
+            query.append((param, str(npage)))
+
+            ans = urlunsplit((parts.scheme, parts.netloc, parts.path,
+                              urlencode(query), parts.fragment))
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: get_pageurl")
+
+    def get_pageidx(self, purl, div, attrs):
+        """
+        requests one listing page of the gallery index and recovers its
+        elements, the page never uses the validators because the index
+        needs all the elements of each page. a page that fails is requested
+        again after a backoff up to the index retries
+
+        Args:
+            purl (str): URL of the listing page
+            div (str): HTML <div> keyword to search and scrap
+            attrs (dict): decorative attributes in the <div> keyword to refine
+            the search and scrap
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (tuple): the status code of the page and its elements in
+            bs-obj, empty if the page failed
+        """
+        try:
+            ans = None
+            attempts = 0
+            retries = int(self.index.get("retries"))
+
+            while ans is None or (ans[0] != 200 and attempts <= retries):
+                # waiting before the next attempt
+                if attempts > 0:
+                    time.sleep(DEFAULT_INDEX_BACKOFF * 2 ** (attempts - 1))
+
+                wpage = Page(pool=self.wpool,
+                             cache=self.wcache,
+                             dialect=self.dialect)
+                status = wpage.get_body(purl)
+                elements = list()
+
+                if status == 200:
+                    elements = list(wpage.findin(div, attributes=attrs))
+
+                ans = (status, elements)
+                attempts += 1
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: get_pageidx")
+
+    def scrapidx_pages(self, gurl, div, attrs):
+        """
+        Scrap the gallery index paging its listing over plain HTTP, each
+        batch of pages goes in parallel with the shared pool until a page
+        answers 200 without new elements, a page that keeps failing stops
+        the index with an error instead of leaving it incomplete
+
+        Args:
+            gurl (str): gallery URL to scrap data
+            div (str): HTML <div> keyword to search and scrap
+            attrs (dict): decorative attributes in the <div> keyword to refine
+            the search and scrap
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (Page): page with all the index elements in its body, ready
+            for findin()
+        """
+        try:
+            npage = int(self.index.get("start"))
+            batch = max(1, int(self.index.get("batch")))
+            last = npage + int(self.index.get("maxpages"))
+            harvest = dict()
+            done = False
+
+            with ThreadPoolExecutor(max_workers=batch) as pool:
+
+                while not done and npage < last:
+                    purls = [self.get_pageurl(gurl, n)
+                             for n in range(npage, min(npage + batch, last))]
+                    pages = pool.map(self.get_pageidx, purls,
+                                     [div] * len(purls), [attrs] * len(purls))
+
+                    # the pages in order, the listing ends with no new element
+                    for purl, (status, elements) in zip(purls, pages):
+
+                        # a failed page is not the end of the listing
+                        if status != 200:
+                            raise ConnectionError("index page " + purl +
+                                                  " answered " + str(status))
+
+                        found = 0
+                        for element in elements:
+                            key = element.get("href") or str(element)
+                            if key not in harvest:
+                                harvest[key] = str(element)
+                                found += 1
+
+                        if found == 0:
+                            done = True
+                            break
+
+                    npage = npage + batch
+
+            # only the elements of the index in the body
+            ans = Page(dialect=self.dialect)
+            ans.sbody = new_soup(str().join(harvest.values()), ans.dialect)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: scrapidx_pages")
+
+    def scrapidx_sitemap(self, rurl, clean):
+        """
+        Creates the gallery index with the collection URLs of the sitemap,
+        the sitemap is streamed and its lastmod recorded for the next
+        incremental scraps
+
+        Args:
+            rurl (str): root URL of the domain to complete the element url
+            clean (str): URL path to remove from the element (paint) ID
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (tuple): lists with the IDs, titles and collection URLs
+        """
+        try:
+            ids, titles, urls = list(), list(), list()
+            seen = set()
+
+            for loc, lastmod, title in self.wsitemap.iterurls():
+                path = urlsplit(loc).path
+
+                # the same work can be in several sitemaps
+                if path in seen:
+                    continue
+                seen.add(path)
+
+                ids.append(path.replace(clean, ""))
+
+                # default unknown element name, as the other engines
+                if title is None:
+                    title = "untitled"
+                titles.append(title)
+                urls.append(urllib.parse.urljoin(rurl, path))
+
+            ans = (ids, titles, urls)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: scrapidx_sitemap")
+
     def scrapagn(self, div, attrs):
         """
         Using the scrapidx() results, scrap for new information
@@ -235,6 +763,100 @@ class Gallery():
         except Exception as exp:
             Err.reraise(exp, "Gallery: newidx")
 
+    def get_idxcols(self, gsoup, ide, clean, etitle, rurl, urle):
+        """
+        walks the gallery index once and gets the ID, the title and the
+        collection URL of each element (paint), the columns are allocated
+        with the size of the index before the walk
+
+        Args:
+            gsoup (bs-obj): list with gallery elements in Beatiful Soup format
+            ide (str): HTML <div> keyword to extract the element (paint) ID
+            clean (str): URL path to remove from the element (paint) ID
+            etitle (str): HTML <div> keyword to extract the element title
+            rurl (str): root URL of the domain to complete the element url
+            urle (str): HTML <div> keyword to extract the element URL
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (tuple): lists with the IDs, titles and collection URLs
+        """
+        try:
+            size = len(gsoup)
+            ids = [None] * size
+            titles = [None] * size
+            urls = [None] * size
+            urljoin = urllib.parse.urljoin
+
+            for i, element in enumerate(gsoup):
+                eattrs = element.attrs
+
+                ids[i] = eattrs.get(ide).replace(clean, "")
+                urls[i] = urljoin(rurl, eattrs.get(urle))
+
+                # default unknown element name
+                title = eattrs.get(etitle)
+                if title is None:
+                    title = "untitled"
+                titles[i] = title
+
+            ans = (ids, titles, urls)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: get_idxcols")
+
+    def get_itemcols(self, items, ide, clean, etitle, rurl, urle):
+        """
+        gets the ID, the title and the collection URL of each element
+        (paint) as iterindex() answers it, while the index still loads
+
+        Args:
+            items (generator): href/title dict of each gallery element
+            ide (str): key of the element (paint) ID, ie.: "href"
+            clean (str): URL path to remove from the element (paint) ID
+            etitle (str): key of the element title, ie.: "title"
+            rurl (str): root URL of the domain to complete the element url
+            urle (str): key of the element URL, ie.: "href"
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (tuple): lists with the IDs, titles and collection URLs
+        """
+        try:
+            ids = list()
+            titles = list()
+            urls = list()
+            urljoin = urllib.parse.urljoin
+
+            try:
+                for item in items:
+                    ids.append(item.get(ide).replace(clean, ""))
+                    urls.append(urljoin(rurl, item.get(urle)))
+
+                    # default unknown element name
+                    title = item.get(etitle)
+                    if title is None:
+                        title = "untitled"
+                    titles.append(title)
+
+            # a failed element stops the scroll of the index at once
+            finally:
+                if hasattr(items, "close"):
+                    items.close()
+
+            ans = (ids, titles, urls)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: get_itemcols")
+
     def get_idxid(self, gsoup, ide, clean):
         # TODO: remove after implement the Topic() class
         """
@@ -345,6 +967,103 @@ class Gallery():
     # Scrap columns functions in Index
     # =========================================
 
+    def fetch(self, eurl, targets=None):
+        """
+        request the gallery's element url only once, so several scrapin()
+        calls can extract different columns from the same HTML document.
+        with targets and early abort on, the page is streamed and only
+        their first tags are kept
+
+        Args:
+            eurl (str): gallery's element url
+            targets (list, optional): HTML <div> keywords and attributes of
+            the only tags to scrap, ie.: [("a", {"class": "btn-icon"})].
+            Defaults to None, the whole page
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (Page): the requested page, None if the request failed
+        """
+        try:
+
+            # the work did not change since the last scrap
+            if self.wsitemap is not None and self.wsitemap.unchanged(eurl):
+                return NOT_MODIFIED
+
+            # page of this request only, the workers share the pool and cache
+            wpage = Page(pool=self.wpool,
+                         cache=self.wcache,
+                         validator=self.wvalidator,
+                         dialect=self.dialect,
+                         strainer=self.wstrainer)
+            stream = targets is not None and self.earlyabort is True
+
+            # the cache keeps the whole pages, they are not streamed
+            if stream is True and self.wcache is None:
+                rstatus = wpage.get_fields(eurl, targets)
+
+            # get the body of the element url
+            else:
+                rstatus = wpage.get_body(eurl)
+            ans = None
+
+            if rstatus == 200:
+                ans = wpage
+
+            # the page did not change since the last scrap
+            elif rstatus == NOT_MODIFIED_STATUS:
+                ans = NOT_MODIFIED
+
+            # the stage has the data of the work's lastmod
+            if ans is not None and self.wsitemap is not None:
+                self.wsitemap.update(eurl)
+
+            # returning answer
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: fetch")
+
+    def scrapin(self, wpage, div, attrs, **kwargs):
+        """
+        scrap elements within an already requested page based on the <div>,
+        html marks and other attributes or decoratos
+
+        Args:
+            wpage (Page): page recovered with fetch()
+            div (str): HTML <div> keyword to search and scrap
+            attrs (dict): decorative attributes in the <div> keyword to refine
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bs-obj): HTML divs as a beatifulsoup object
+        """
+        try:
+            ans = None
+
+            # unchanged page, nothing to scrap
+            if wpage is NOT_MODIFIED:
+                ans = NOT_MODIFIED
+
+            elif wpage is not None:
+                # find element inside the html body
+                ans = wpage.findin(
+                    div,
+                    attributes=attrs,
+                    multiple=kwargs.get("multiple"))
+
+            # returning answer
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: scrapin")
+
     def scrape(self, eurl, div, attrs, **kwargs):
         """
         scrap elements within a link based on the <div>, html marks
@@ -362,28 +1081,106 @@ class Gallery():
             ans (bs-obj): HTML divs as a beatifulsoup object
         """
         try:
+            targets = None
 
-            # reset working web page
-            self.wpage = Page()
+            # a single tag can stop the request once it is found
+            if kwargs.get("multiple") is False:
+                targets = [(div, attrs)]
+
+            # get the body of the element url
+            wpage = self.fetch(eurl, targets=targets)
+
+            # find element inside the html body
+            ans = self.scrapin(wpage, div, attrs, **kwargs)
+
+            # returning answer
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: scrape")
+
+    async def afetch(self, eurl):
+        """
+        asyncio version of fetch(), request the gallery's element url only
+        once without blocking the event loop
+
+        Args:
+            eurl (str): gallery's element url
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (AsyncPage): the requested page, None if the request failed
+        """
+        try:
+
+            # the work did not change since the last scrap
+            if self.wsitemap is not None and self.wsitemap.unchanged(eurl):
+                return NOT_MODIFIED
+
+            # working web page with the shared client session and cache
+            wpage = AsyncPage(pool=self.wapool,
+                              cache=self.wcache,
+                              validator=self.wvalidator,
+                              dialect=self.dialect,
+                              strainer=self.wstrainer)
 
             # get the body of the element url
-            rstatus = self.wpage.get_body(eurl)
+            rstatus = await wpage.get_body(eurl)
             ans = None
 
             if rstatus == 200:
-                # find element inside the html body
-                ans = self.wpage.findin(
-                    div,
-                    attributes=attrs,
-                    multiple=kwargs.get("multiple"))
+                ans = wpage
+
+            # the page did not change since the last scrap
+            elif rstatus == NOT_MODIFIED_STATUS:
+                ans = NOT_MODIFIED
+
+            # the stage has the data of the work's lastmod
+            if ans is not None and self.wsitemap is not None:
+                self.wsitemap.update(eurl)
+
             # returning answer
             return ans
 
         # exception handling
         except Exception as exp:
-            Err.reraise(exp, "Gallery: scrape")
+            Err.reraise(exp, "Gallery: afetch")
+
+    async def ascrape(self, eurl, div, attrs, **kwargs):
+        """
+        asyncio version of scrape(), scrap elements within a link based on
+        the <div>, html marks and other attributes or decoratos
+
+        Args:
+            eurl (str): gallery's element url
+            div (str): HTML <div> keyword to search and scrap
+            attrs (dict): decorative attributes in the <div> keyword to refine
 
-    def get_imgfn(self, eurl, div, attrs):
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bs-obj): HTML divs as a beatifulsoup object
+        """
+        try:
+
+            # get the body of the element url
+            wpage = await self.afetch(eurl)
+
+            # find element inside the html body
+            ans = self.scrapin(wpage, div, attrs, **kwargs)
+
+            # returning answer
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: ascrape")
+
+    def get_imgfn(self, eurl, div, attrs, wpage, part=None):
         """
         scrap elements within a link based on the <div>, html marks
         and other attributes or decoratos
@@ -392,6 +1189,11 @@ class Gallery():
             eurl (str): gallery's element url
             div (str): HTML <div> keyword to search and scrap
             attrs (dict): decorative attributes in the <div> keyword to refine
+            wpage (Page): page of this download only, its body is saved with
+            get_imgf()
+            part (str, optional): partial file of an interrupted download of
+            the image, the request asks only for the missing bytes. Defaults
+            to None
 
         Raises:
             exp: raise a generic exception if something goes wrong
@@ -401,22 +1203,34 @@ class Gallery():
         """
         try:
 
-            # reset working web page
-            self.wpage = Page()
+            # one request, the headers now and the body in get_imgf()
+            rstatus = wpage.get_stream(eurl, part=part)
+
+            # the image did not change, the local file stays
+            if rstatus == NOT_MODIFIED_STATUS:
+                wpage.close_stream()
+                return NOT_MODIFIED
 
-            # get the headers and the content from the url
-            rstatus = self.wpage.get_header(eurl)
-            rstatus = self.wpage.get_content()
+            # the cache never keeps the streamed images, in replay mode the
+            # miss says nothing about the local file so it stays
+            if self.wcache is not None and self.wcache.replay is True:
+                if rstatus == REPLAY_MISS_STATUS:
+                    wpage.close_stream()
+                    return NOT_MODIFIED
 
             ans = str()
 
-            if rstatus == 200:
+            if rstatus in (200, PARTIAL_STATUS):
                 # find attribute inside the headers
-                if attrs.items() <= self.wpage.shead.items():
-                    headers = self.wpage.shead
+                if attrs.items() <= wpage.shead.items():
+                    headers = wpage.shead
                     ans = headers.get(div)
                     ans = str(ans)
 
+            # nothing to download
+            else:
+                wpage.close_stream()
+
             # returning answer
             return ans
 
@@ -452,16 +1266,22 @@ class Gallery():
         except Exception as exp:
             Err.reraise(exp, "Gallery: clean_imgfn")
 
-    def get_imgf(self, gfolder, dlurl, pfn):
+    def get_imgf(self, gfolder, dlurl, pfn, wpage):
         # TODO: remove after implement the Topic() class
         """
-        save the paint file from the asset URL in the local folder path
+        save the paint file from the asset URL in the local folder path,
+        streaming the body of the get_imgfn() request to disk, if the file
+        already exists with the expected size the body is not read and the
+        Range answer of a ".part" file of an interrupted download continues
+        it. a file without expected size is downloaded again, only a body
+        read whole with its checksum counts as downloaded
 
         Args:
             gfolder (str): root local dirpath where the file is going to be
             save
             dlurl (str): url address with the downlodable image file
             pfn (str): filename to save the image
+            wpage (Page): page of the get_imgfn() request
 
         Raises:
             exp: raise a generic exception if something goes wrong
@@ -475,28 +1295,28 @@ class Gallery():
             ans = False
 
             # parsing the URL to choose the local folder to save the file
-            imgf = urllib.parse.urlparse(dlurl)
-            imgf = imgf.path.split("/")[len(imgf.path.split("/"))-1]
-            fp = os.path.join(gfolder, imgf, pfn)
-
-            # if the file doesnt exists
-            if not os.path.exists(fp):
+            fp = os.path.join(self.get_imgdir(gfolder, dlurl), pfn)
 
-                # saving file from content requests in bit form
-                data = self.wpage.content
-                with open(fp, "wb") as file:
+            # expected size of the file, None if the server does not say it
+            size = wpage.get_length()
 
-                    file.write(data)
-                    file.close()
-                    ans = True
-                    return ans
-
-            # if the file already exists
-            elif os.path.exists(fp):
+            # if the file already exists with the right size
+            if os.path.exists(fp) and size == os.path.getsize(fp):
 
+                # closing the request before the body
+                wpage.close_stream()
+                if wpage.validator is not None:
+                    headers = wpage.request.headers
+                    wpage.validator.update(wpage.url, headers, fp)
                 ans = True
                 return ans
 
+            # streaming the body into the file, complete or nothing
+            else:
+                wpage.save_stream(fp)
+                ans = wpage.checksum is not None
+                return ans
+
             # returning answer
             return ans
 
@@ -504,10 +1324,89 @@ class Gallery():
         except Exception as exp:
             Err.reraise(exp, "Gallery: get_imgf")
 
+    def get_imgdir(self, gfolder, dlurl):
+        """
+        gets the local folder of the image file of an asset URL, the last
+        part of the URL path
+
+        Args:
+            gfolder (str): root local dirpath of the gallery
+            dlurl (str): url address with the downlodable image file
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (str): local dirpath of the image file
+        """
+        try:
+            imgf = urllib.parse.urlparse(dlurl)
+            imgf = imgf.path.split("/")[len(imgf.path.split("/"))-1]
+            ans = os.path.join(gfolder, imgf)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: get_imgdir")
+
+    def dlimage(self, gfolder, dlurl, div, attrs, elem, clean):
+        """
+        download the image file of an asset URL with its own page, so the
+        concurrent downloads do not share the working web page, using the
+        download connections and bandwidth of the gallery
+
+        Args:
+            gfolder (str): root local dirpath to save the file
+            dlurl (str): url address with the downlodable image file
+            div (str): header with the file name, ie.: Content-Disposition
+            attrs (dict): headers the response must have
+            elem (str): keyword to split the file name header
+            clean (str): keyword to clean in the file name
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (tuple): HAS_PICTURE answer (True, False or NOT_MODIFIED) and
+            the bytes downloaded
+        """
+        try:
+            wpage = Page(pool=self.wdlpool,
+                         cache=self.wcache,
+                         validator=self.wvalidator,
+                         bandwidth=self.wbandwidth)
+
+            # an interrupted download continues with the first request
+            part = wpage.find_part(self.get_imgdir(gfolder, dlurl))
+
+            # recovers the image file name
+            tsoup = self.get_imgfn(dlurl, div, attrs, wpage, part=part)
+
+            # unchanged image, the local file stays
+            if tsoup is NOT_MODIFIED:
+                return (NOT_MODIFIED, 0)
+
+            # no image file in the response
+            if elem not in tsoup:
+                wpage.close_stream()
+                return (False, 0)
+
+            # clean the name, download and save the image
+            timgf = self.clean_imgfn(tsoup, elem, clean)
+            tans = self.get_imgf(gfolder, dlurl, timgf, wpage)
+
+            ans = (tans, wpage.received)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: dlimage")
+
     def updata(self, column, data):
         """
         updates a single column with new data, the size of the data needs to be
-        the same as the existing records
+        the same as the existing records, the NOT_MODIFIED items keep the
+        existing record of the unchanged pages
 
         Args:
             column (str): name of the column in the dataframe to update
@@ -521,6 +1420,16 @@ class Gallery():
         """
         try:
             ans = False
+
+            # keeping the records of the unchanged pages
+            if any(item is NOT_MODIFIED for item in data):
+                old = [None] * len(data)
+                if column in self.data_frame.columns:
+                    old = list(self.data_frame[column])
+
+                data = [o if d is NOT_MODIFIED else d
+                        for d, o in zip(data, old)]
+
             self.data_frame[column] = data
             if self.data_frame[column] is not None:
                 ans = True
@@ -896,6 +1805,48 @@ class Gallery():
     # clean scraped information functions
     # =========================================
 
+    def get_plans(self):
+        """
+        gets the extraction plans of the columns compiled from the
+        html-tags.ini config
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): column names with their extraction plan
+        """
+        try:
+            ans = self.wtopic.plans
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: get_plans")
+
+    def clean_plan(self, column, soup, rurl):
+        """
+        Clean the scraped soup with the extraction plan of the column
+
+        Args:
+            column (str): column name with an extraction plan
+            soup (bs-obj): beatifulSoup object with the column data
+            rurl (str): domain root URL to complete the links
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict|str): clean data of the column
+        """
+        try:
+            ans = self.wtopic.extract(column, soup, rurl)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: clean_plan")
+
     def clean_description(self, soup, elem, clean):
         # TODO: remove after implement the Topic() class
         """
@@ -1036,10 +1987,11 @@ class Gallery():
                     # processing the search tags
                     if len(tags) > 0 and isinstance(tags, list) is True:
 
-                        for tag in tags:
+                        # cleaning all the tag names at once
+                        keys = self.clrtexts([tag.string for tag in tags])
+
+                        for tag, key in zip(tags, keys):
                             # cleaning data
-                            key = str(tag.string)
-                            key = self.clrtext(key)
                             url = tag.get(clean)
 
                             # reconstructing all the url from the page
@@ -1085,16 +2037,17 @@ class Gallery():
                 # soup keys and values must have data
                 if len(keys) > 0 and len(values) > 0:
 
+                    # cleaning data for dictionary, all at once
+                    pairs = list(zip(keys, values))
+                    texts = [key.string for key, value in pairs]
+                    texts.extend(value.string for key, value in pairs)
+                    texts = self.clrtexts(texts)
+                    keys = texts[:len(pairs)]
+                    values = texts[len(pairs):]
+
                     # looping over the <dt> and <dd> data
                     for key, value in zip(keys, values):
 
-                        # cleaning data for dictionary
-                        key = str(key.string)
-                        key = self.clrtext(key)
-
-                        value = str(value.string)
-                        value = self.clrtext(value)
-
                         # temp dict for complete answer
                         td = {key: value}
                         # updating answer dict
@@ -1195,6 +2148,33 @@ class Gallery():
         except Exception as exp:
             Err.reraise(exp, "Gallery: clean_dlurl")
 
+    def clrtexts(self, texts):
+        """
+        batch version of clrtext(), cleans a list or a pandas Series of
+        texts at once with the same answer of cleaning them one by one
+
+        Args:
+            texts (list|pd.Series): texts to clean
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (list|pd.Series): clean texts in the same order
+        """
+        try:
+            # the repeated texts come from the text cache
+            if self.wtexts is not None:
+                ans = self.wtexts.get_batch(texts)
+
+            else:
+                ans = clrtexts(texts)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: clrtexts")
+
     def clrtext(self, text):
         # TODO: remove after implement the Topic() class
         """
@@ -1211,6 +2191,10 @@ class Gallery():
             ans(str): clean text
         """
         try:
+            # the repeated texts come from the text cache
+            if self.wtexts is not None:
+                return self.wtexts.get(text)
+
             # asigning text as ans
             ans = str(text)
 
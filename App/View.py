@@ -24,6 +24,7 @@ import sys
 import re
 import os
 import copy
+import asyncio
 
 # =======================================================
 # extension python libraries
@@ -36,8 +37,10 @@ import copy
 import Conf
 from App.Controller import Controller
 from App.Model import Gallery
+from Lib.Recovery.Cleaner import literal
 assert Controller
 assert Gallery
+assert literal
 assert Conf
 assert re
 
@@ -49,6 +52,10 @@ CFG_FOLDER = "Config"
 CFG_APP = "app-config.ini"
 CFG_SCHEMA = "df-schema.ini"
 CFG_WEB_TAGS = "html-tags.ini"
+
+# types of the html-tags.ini options, the first option of each column
+CFG_TYPES = {"str": str, "int": int, "float": float,
+             "dict": dict, "list": list, "tuple": tuple}
 CFG_DATA_APP = Conf.configGlobal(CFG_FOLDER, CFG_APP)
 
 # url query for VVG gallery request
@@ -82,6 +89,127 @@ srcf = CFG_DATA_APP.get("Paths", "sourceFolder")
 dataf = CFG_DATA_APP.get("Paths", "dataFolder")
 imgf = CFG_DATA_APP.get("Paths", "imageFolder")
 
+# shared keep-alive connection pool for the gallery requests
+pool_cfg = {
+    "hosts": CFG_DATA_APP.getint("Session", "hosts"),
+    "poolsize": CFG_DATA_APP.getint("Session", "poolsize"),
+    "retries": CFG_DATA_APP.getint("Session", "retries"),
+    "backoff": CFG_DATA_APP.getfloat("Session", "backoff"),
+    "keepalive": CFG_DATA_APP.getboolean("Session", "keepalive"),
+    "limit": CFG_DATA_APP.getint("Session", "limit"),
+    "perhost": CFG_DATA_APP.getint("Session", "perhost"),
+}
+
+# concurrent workers scrapping the gallery elements
+nworkers = CFG_DATA_APP.getint("Workers", "workers")
+engine = CFG_DATA_APP.get("Workers", "engine")
+ntasks = CFG_DATA_APP.getint("Workers", "tasks")
+
+# token-bucket rate limit for the requests of each host
+rate_cfg = {
+    "rate": CFG_DATA_APP.getfloat("RateLimit", "rate"),
+    "burst": CFG_DATA_APP.getfloat("RateLimit", "burst"),
+}
+
+# AIMD concurrency control of the in-flight requests, None disables it
+throttle_cfg = None
+if CFG_DATA_APP.getboolean("Throttle", "enabled"):
+    throttle_cfg = {
+        "start": CFG_DATA_APP.getfloat("Throttle", "start"),
+        "minimum": CFG_DATA_APP.getfloat("Throttle", "minimum"),
+        "maximum": CFG_DATA_APP.getfloat("Throttle", "maximum"),
+        "decrease": CFG_DATA_APP.getfloat("Throttle", "decrease"),
+        "tolerance": CFG_DATA_APP.getfloat("Throttle", "tolerance"),
+    }
+
+# connect, read and total deadlines of the requests and their hedging
+deadline_cfg = {
+    "connect": CFG_DATA_APP.getfloat("Deadline", "connect"),
+    "read": CFG_DATA_APP.getfloat("Deadline", "read"),
+    "total": CFG_DATA_APP.getfloat("Deadline", "total"),
+    "hedge": CFG_DATA_APP.getboolean("Deadline", "hedge"),
+    "quantile": CFG_DATA_APP.getfloat("Deadline", "quantile"),
+}
+
+# gallery index discovery, selenium infinite scroll or http listing pages
+index_cfg = {
+    "engine": CFG_DATA_APP.get("Index", "engine"),
+    "param": CFG_DATA_APP.get("Index", "param"),
+    "start": CFG_DATA_APP.getint("Index", "start"),
+    "batch": CFG_DATA_APP.getint("Index", "batch"),
+    "maxpages": CFG_DATA_APP.getint("Index", "maxpages"),
+    "retries": CFG_DATA_APP.getint("Index", "retries"),
+}
+
+# infinite scroll of the selenium index, patience is the max wait for new
+# elements after each scroll step
+scroll_patience = CFG_DATA_APP.getfloat("Scroll", "patience")
+scroll_cfg = {
+    "poll": CFG_DATA_APP.getfloat("Scroll", "poll"),
+    "maxscroll": CFG_DATA_APP.getfloat("Scroll", "maxtime"),
+}
+
+# parser backend of the pages, "html.parser" if its library is missing
+parser_dialect = CFG_DATA_APP.get("Parser", "dialect")
+
+# parse only the sections of the collection pages in html-tags.ini
+parser_strainer = CFG_DATA_APP.getboolean("Parser", "strainer")
+
+# stream the single tag scraps and close the pages once the tag is found
+parser_earlyabort = CFG_DATA_APP.getboolean("Parser", "earlyabort")
+
+# memory cache of the repeated clean texts, None disables it
+texts_cfg = None
+if CFG_DATA_APP.getboolean("Text", "enabled"):
+    texts_cfg = {
+        "maxsize": CFG_DATA_APP.getint("Text", "maxsize"),
+    }
+
+# warm headless browsers for the selenium index, None disables them
+browsers_cfg = None
+if CFG_DATA_APP.getboolean("Browser", "enabled"):
+    browsers_cfg = {
+        "size": CFG_DATA_APP.getint("Browser", "size"),
+        "headless": CFG_DATA_APP.getboolean("Browser", "headless"),
+        "maxuses": CFG_DATA_APP.getint("Browser", "maxuses"),
+        "maxgrowth": CFG_DATA_APP.getint("Browser", "maxgrowth"),
+    }
+
+# sitemap discovery and lastmod of the works, None disables them
+sitemap_cfg = None
+if (index_cfg.get("engine") == "sitemap"
+        or CFG_DATA_APP.getboolean("Sitemap", "incremental")):
+    sitemap_cfg = {
+        "url": CFG_DATA_APP.get("Sitemap", "url"),
+        "pattern": CFG_DATA_APP.get("Sitemap", "pattern"),
+        "fpath": os.path.join(dataf, CFG_DATA_APP.get("Sitemap", "file")),
+        "incremental": CFG_DATA_APP.getboolean("Sitemap", "incremental"),
+    }
+
+# local response cache under the data folder, None disables it
+cache_cfg = None
+if CFG_DATA_APP.getboolean("Cache", "enabled"):
+    cache_cfg = {
+        "folder": os.path.join(dataf, CFG_DATA_APP.get("Cache", "folder")),
+        "maxsize": CFG_DATA_APP.getint("Cache", "maxsize") * 1024 * 1024,
+        "replay": CFG_DATA_APP.getboolean("Cache", "replay"),
+    }
+
+# ETag/Last-Modified validators under the data folder, None disables them
+validator_cfg = None
+if CFG_DATA_APP.getboolean("Revalidate", "enabled"):
+    validator_cfg = {
+        "fpath": os.path.join(dataf, CFG_DATA_APP.get("Revalidate", "file")),
+        "refresh": CFG_DATA_APP.getboolean("Revalidate", "refresh"),
+    }
+
+# concurrent image downloads, own connections per host and bandwidth
+ndlworkers = CFG_DATA_APP.getint("Downloads", "workers")
+dl_cfg = {
+    "perhost": CFG_DATA_APP.getint("Downloads", "perhost"),
+    "bandwidth": CFG_DATA_APP.getint("Downloads", "bandwidth") * 1024,
+}
+
 # cresting the export file for the data
 bfn = CFG_DATA_APP.get("ExportFiles", "basicfile")
 fext = CFG_DATA_APP.get("ExportFiles", "fext")
@@ -133,6 +261,16 @@ rwork_col = str(VVG_DF_COLS[VVG_DF_COLS.index("RELATED_WORKS")])
 img_col = str(VVG_DF_COLS[VVG_DF_COLS.index("IMG_DATA")])
 shape_col = str(VVG_DF_COLS[VVG_DF_COLS.index("IMG_SHAPE")])
 
+# columns scraped together from each collection page in a single request
+# with the multiple flag to find their HTML tags
+page_cols = {
+    desc_col: True,
+    dl_col: False,
+    search_col: True,
+    obj_col: False,
+    rwork_col: True,
+}
+
 
 class View():
     """
@@ -155,6 +293,9 @@ class View():
     # config file for scraped html tags
     scrapy_cfg = None
 
+    # HTML tags of the columns, evaluated once from the config file
+    wtags = dict()
+
     # input variables
     inputs = -1
 
@@ -180,6 +321,7 @@ class View():
             self.webg_path = str()
             self.schema = copy.deepcopy(VVG_DF_COLS)
             self.scrapy_cfg = Conf.configGlobal(CFG_FOLDER, CFG_WEB_TAGS)
+            self.wtags = dict()
             self.inputs = -1
 
             # if args parameters are input in the creator
@@ -197,16 +339,36 @@ class View():
 
                     if i == 3:
                         self.scrapy_cfg = Conf.configGlobal(args[i])
+                        self.wtags = dict()
 
                 wg = self.webg_path
                 gp = self.localg_path
                 ip = self.imgd_path
                 mod = self.gallery_model
-                self.gallery_model = Gallery(wg, gp, ip)
+                self.gallery_model = Gallery(wg, gp, ip,
+                                             pool=pool_cfg,
+                                             rate=rate_cfg,
+                                             throttle=throttle_cfg,
+                                             deadline=deadline_cfg,
+                                             cache=cache_cfg,
+                                             validator=validator_cfg,
+                                             downloads=dl_cfg,
+                                             index=index_cfg,
+                                             scroll=scroll_cfg,
+                                             browsers=browsers_cfg,
+                                             dialect=parser_dialect,
+                                             targets=self.get_targets(),
+                                             earlyabort=parser_earlyabort,
+                                             texts=texts_cfg,
+                                             tags=self.scrapy_cfg,
+                                             sitemap=sitemap_cfg)
                 sch = self.schema
                 self.gallery_controller = Controller(wg, gp, ip,
                                                      model=mod,
-                                                     schema=sch)
+                                                     schema=sch,
+                                                     workers=nworkers,
+                                                     tasks=ntasks,
+                                                     dlworkers=ndlworkers)
 
         # exception handling
         except Exception as exp:
@@ -241,7 +403,9 @@ class View():
             print("10) Get Gallery elements related work (RELATED_WORKS)")
             print("11) Process Gallery images (IMG_DATA, IMG_SHAPE)")
             print("12) Export DataFrame to JSON Files (from CSV to Local dir)")
-            print("99) Auto script for options (3, 5, 6, 7, 8, 9, 10, 11, 12)")
+            # options 5, 6, 8, 9 and 10 with one request per element
+            print("13) Get all collection page columns in a single pass")
+            print("99) Auto script for options (13, 7, 11, 12)")
             print("0) EXIT (last option)")
             # finish program
 
@@ -281,7 +445,24 @@ class View():
             ip = self.imgd_path
             vdfc = VVG_DF_COLS
 
-            self.gallery_model = Gallery(wg, gp, ip, schema=vdfc)
+            self.gallery_model = Gallery(wg, gp, ip,
+                                         schema=vdfc,
+                                         pool=pool_cfg,
+                                         rate=rate_cfg,
+                                         throttle=throttle_cfg,
+                                         deadline=deadline_cfg,
+                                         cache=cache_cfg,
+                                         validator=validator_cfg,
+                                         downloads=dl_cfg,
+                                         index=index_cfg,
+                                         scroll=scroll_cfg,
+                                         browsers=browsers_cfg,
+                                         dialect=parser_dialect,
+                                         targets=self.get_targets(),
+                                         earlyabort=parser_earlyabort,
+                                         texts=texts_cfg,
+                                         tags=self.scrapy_cfg,
+                                         sitemap=sitemap_cfg)
             print("============== Creating Gallery Model ==============")
             print("Model gallery localpath: " +
                   str(self.gallery_model.localg_path))
@@ -296,7 +477,10 @@ class View():
             # creating the gallery controller
             self.gallery_controller = Controller(wg, gp, ip,
                                                  model=gm,
-                                                 schema=vdfc)
+                                                 schema=vdfc,
+                                                 workers=nworkers,
+                                                 tasks=ntasks,
+                                                 dlworkers=ndlworkers)
             print("============ Crating Gallery Controller ============")
             print("Controller gallery localpath: " +
                   str(self.gallery_controller.localg_path))
@@ -314,7 +498,8 @@ class View():
     def get_wtags(self, column):
         """
         gets the HTML tags from a config file needed by beatifulsoup to
-        create the dataframe column with the same name
+        create the dataframe column with the same name, the tags of each
+        column are evaluated only the first time
 
         Args:
             column (str): name of the column to get the HTML tags
@@ -330,6 +515,10 @@ class View():
                 - cleanup: optional HTML tags for clean up scraped data
         """
         try:
+            # the tags of the column were already evaluated
+            if column in self.wtags:
+                return list(self.wtags[column])
+
             # default ans for the method
             ans = (None, None, None, None)
             cfg = self.scrapy_cfg
@@ -343,8 +532,8 @@ class View():
                 keys = cfg.options(column)
                 # get datatype from first key
                 types = cfg.get(column, keys[0])
-                # eval() the type list and removing the first key
-                types = eval(types)
+                # reading the type list and removing the first key
+                types = literal(types, CFG_TYPES)
                 keys.pop(0)
 
                 # iterating the column keys and types
@@ -354,7 +543,7 @@ class View():
 
                     # ifs for different types
                     if t in (dict, list, tuple, None):
-                        temp = eval(temp)
+                        temp = literal(temp)
                     elif t is int:
                         temp = int(temp)
                     elif t is float:
@@ -363,6 +552,63 @@ class View():
                         temp = str(temp)
                     ans.append(temp)
 
+                self.wtags[column] = list(ans)
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            raise exp
+
+    def get_targets(self):
+        """
+        gets the HTML tags of the sections scraped from the collection
+        pages, so the pages only parse them
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (list): tuples with the main HTML tag and its attributes of
+            each page column, None if the pages parse all their HTML
+        """
+        try:
+            ans = None
+
+            if parser_strainer is True:
+                ans = list()
+                for col in self.get_pagecols(page_cols).keys():
+                    tags = self.get_wtags(col)
+                    ans.append((tags[0], tags[1]))
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            raise exp
+
+    def get_pagecols(self, cols):
+        """
+        gets the columns scraped from the collection pages, the given ones
+        and the ones with an extraction plan in the config file
+
+        Args:
+            cols (dict): df-schema column names with their multiple flag
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): column names with their multiple flag
+        """
+        try:
+            ans = dict(cols)
+            cfg = self.scrapy_cfg
+
+            for col in cfg.sections():
+                if cfg.has_option(col, "fields"):
+                    ans[col] = cfg.getboolean(col, "multiple")
+
             return ans
 
         # exception handling
@@ -400,8 +646,8 @@ class View():
                 keys = cfg.options(column)
                 # get datatype from first key
                 types = cfg.get(column, keys[0])
-                # eval() the type list and removing the first key
-                types = eval(types)
+                # reading the type list and removing the first key
+                types = literal(types, CFG_TYPES)
                 keys.pop(0)
 
                 # iterating the column keys and types
@@ -411,7 +657,7 @@ class View():
 
                     # ifs for different types
                     if t in (dict, list, tuple, None):
-                        temp = eval(temp)
+                        temp = literal(temp)
                     elif t is str:
                         temp = str(temp)
                     ans.append(temp)
@@ -422,6 +668,148 @@ class View():
         except Exception as exp:
             raise exp
 
+    def run_stage(self, stage, *args, **kwargs):
+        """
+        runs a scrap_*() function of the controller with the configured
+        engine, the worker threads or its asyncio ascrap_*() version
+
+        Args:
+            stage (str): name of the controller's scrap_*() function
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (list/dict): answer of the controller's function
+        """
+        try:
+            gc = self.gallery_controller
+            self.start_stage(stage)
+
+            # asyncio engine, one event loop for the whole stage
+            if engine == "asyncio":
+                stage = getattr(gc, "a" + stage)
+                ans = asyncio.run(stage(*args, **kwargs))
+
+            # worker threads engine
+            else:
+                stage = getattr(gc, stage)
+                ans = stage(*args, **kwargs)
+
+            self.end_stage()
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            raise exp
+
+    def start_stage(self, stage):
+        """
+        sets the stage of the validators and the sitemap, the stages that
+        request the same pages keep their own ETag/Last-Modified and lastmod
+
+        Args:
+            stage (str): name of the controller's function of the stage
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            gm = self.gallery_model
+
+            if gm.wvalidator is not None:
+                gm.wvalidator.use(stage)
+
+            if gm.wsitemap is not None:
+                gm.wsitemap.use(stage)
+
+        # exception handling
+        except Exception as exp:
+            raise exp
+
+    def end_stage(self):
+        """
+        reports the use of the local response and text caches and the
+        requests deadlines, and saves the validators of the new responses
+        after a scrapping stage
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            gm = self.gallery_model
+
+            # reporting the use of the local response cache
+            if gm.wcache is not None:
+                stats = gm.wcache.stats()
+                print("Cache hits: " + str(stats.get("hits")) +
+                      " misses: " + str(stats.get("misses")) +
+                      " hit rate: " + str(round(stats.get("rate"), 3)) +
+                      " size: " + str(stats.get("size")) + " bytes")
+
+            # reporting the use of the clean texts cache
+            if gm.wtexts is not None:
+                stats = gm.wtexts.stats()
+                print("Text cache hits: " + str(stats.get("hits")) +
+                      " misses: " + str(stats.get("misses")) +
+                      " hit rate: " + str(round(stats.get("rate"), 3)) +
+                      " texts: " + str(stats.get("texts")) +
+                      " saved: " + str(round(stats.get("saved"), 3)) + " s" +
+                      " shared: " + str(stats.get("shared")) + " bytes")
+
+            # reporting the requests hedged or over their deadline
+            if gm.wdeadline is not None:
+                stats = gm.wdeadline.stats()
+                print("Hedged requests: " + str(stats.get("hedged")) +
+                      " timeouts: " + str(stats.get("timeouts")))
+
+            # saving the ETag/Last-Modified for the next refresh
+            if gm.wvalidator is not None:
+                gm.wvalidator.save()
+
+            # saving the sitemap lastmod for the next incremental scrap
+            if gm.wsitemap is not None:
+                gm.wsitemap.save()
+
+        # exception handling
+        except Exception as exp:
+            raise exp
+
+    def show_scroll(self):
+        """
+        prints the progress metrics of the gallery infinite scroll
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            stats = self.gallery_model.wpage.scroll_stats
+
+            if stats is not None:
+                print("Scroll rounds: " + str(stats.get("rounds")) +
+                      " elements: " + str(stats.get("items")) +
+                      " (" + str(round(stats.get("rate"), 2)) + " items/s)" +
+                      " in " + str(round(stats.get("elapsed"), 2)) + " s")
+
+        # exception handling
+        except Exception as exp:
+            raise exp
+
+    def show_download(self, files, nbytes, elapsed):
+        """
+        prints the progress of the image downloads
+
+        Args:
+            files (int): number of processed files
+            nbytes (int): number of downloaded bytes
+            elapsed (float): seconds since the start of the downloads
+        """
+        elapsed = max(elapsed, 0.001)
+        print("Downloaded files: " + str(files) +
+              " (" + str(round(files / elapsed, 2)) + " files/s)" +
+              " bytes: " + str(nbytes) +
+              " (" + str(round(nbytes / elapsed / 1024, 1)) + " KB/s)")
+
     def one(self, *args):
         """
         Option 1, it creates a new dataframe with new IDs, Tittles and
@@ -447,27 +835,45 @@ class View():
             wg = self.webg_path
             gp = self.localg_path
 
-            # starting the gallery index (gain) from scratch
+            # starting the gallery index from the site's sitemap
             id_in = self.get_wtags(args[0])
-            gain = gc.scrapidx(wg, 5.0, id_in[0], id_in[1])
-            id_data = gc.get_idxid(gain, id_in[2], id_in[3])
-            print("Gallery IDs were processed...")
-
-            ti_in = self.get_wtags(args[1])
-            gain = gc.scrapagn(ti_in[0], ti_in[1])
-            title_data = gc.get_idxtitle(gain, ti_in[2])
-            print("Gallery Titles were processed...")
+            if index_cfg.get("engine") == "sitemap":
+                data = gc.scrapidx_sitemap(args[3], id_in[3])
+                print("Gallery IDs, Titles and collection URLs were "
+                      "processed...")
+
+            # starting the gallery index (gain) from the listing pages, the
+            # ID elements also have the title and the collection URL
+            elif index_cfg.get("engine") == "http":
+                gain = gc.scrapidx(wg, scroll_patience, id_in[0], id_in[1])
+
+                ti_in = self.get_wtags(args[1])
+                url_in = self.get_wtags(args[2])
+                data = gc.get_idxcols(gain, id_in[2], id_in[3],
+                                      ti_in[2], args[3], url_in[2])
+                del gain
+                print("Gallery IDs, Titles and collection URLs were "
+                      "processed...")
+
+            # the columns of the scrolled gallery grow with each element
+            # harvested, while the index is still loading
+            else:
+                items = gc.iterindex(wg, scroll_patience,
+                                     id_in[0], id_in[1])
+
+                ti_in = self.get_wtags(args[1])
+                url_in = self.get_wtags(args[2])
+                data = gc.get_itemcols(items, id_in[2], id_in[3],
+                                       ti_in[2], args[3], url_in[2])
+                self.show_scroll()
+                print("Gallery IDs, Titles and collection URLs were "
+                      "processed...")
 
-            url_in = self.get_wtags(args[2])
-            gain = gc.scrapagn(url_in[0], url_in[1])
-            url_data = gc.get_idxurl(gain, args[3], url_in[2])
-            print("Gallery collection URLs were processed...")
-
-            data = (id_data, title_data, url_data)
             ans = gc.newdf(args, data)
             print("New Gallery Model was created...")
             gc.create_localfolders(gp, args[0])
             print("Local Gallery folders were created...")
+            self.end_stage()
             return ans
 
         # exception handling
@@ -565,7 +971,8 @@ class View():
 
             gc = self.gallery_controller
             opt_in = self.get_wtags(args[0])
-            descrip_data = gc.scrap_descriptions(
+            descrip_data = self.run_stage(
+                "scrap_descriptions",
                 args[1],
                 opt_in[0],
                 opt_in[1],
@@ -601,7 +1008,8 @@ class View():
 
             gc = self.gallery_controller
             opt_in = self.get_wtags(args[0])
-            urlpic_data = gc.scrap_paintlinks(
+            urlpic_data = self.run_stage(
+                "scrap_paintlinks",
                 args[1],
                 args[2],
                 opt_in[0],
@@ -638,14 +1046,17 @@ class View():
             gc = self.gallery_controller
             gp = self.localg_path
             opt_in = self.get_wtags(args[1])
+            self.start_stage("dlpaints")
             haspic_data = gc.dlpaints(
                                 args[0],
                                 gp,
                                 opt_in[0],
                                 opt_in[1],
                                 opt_in[2],
-                                opt_in[3])
+                                opt_in[3],
+                                report=self.show_download)
 
+            self.end_stage()
             ans = gc.updata(args[1], haspic_data)
             return ans
         # exception handling
@@ -673,7 +1084,8 @@ class View():
 
             gc = self.gallery_controller
             opt_in = self.get_wtags(args[0])
-            search_data = gc.scrap_searchtags(
+            search_data = self.run_stage(
+                                "scrap_searchtags",
                                 args[1],
                                 args[2],
                                 opt_in[0],
@@ -709,7 +1121,8 @@ class View():
 
             gc = self.gallery_controller
             opt_in = self.get_wtags(args[0])
-            object_data = gc.scrap_objdata(
+            object_data = self.run_stage(
+                                "scrap_objdata",
                                 args[1],
                                 opt_in[0],
                                 opt_in[1],
@@ -744,7 +1157,8 @@ class View():
 
             gc = self.gallery_controller
             opt_in = self.get_wtags(args[0])
-            rwork_data = gc.scrap_relwork(
+            rwork_data = self.run_stage(
+                                "scrap_relwork",
                                 args[1],
                                 args[2],
                                 opt_in[0],
@@ -838,6 +1252,49 @@ class View():
         except Exception as exp:
             raise exp
 
+    def thirteen(self, *args):
+        """
+        Option 13, based on the results of option 1, it requests each
+        gallery element page only once and scrap the DESCRIPTION,
+        DOWNLOAD_URL, SEARCH_TAGS, OBJ_DATA and RELATED_WORKS columns
+
+        Args:
+            curl_col (str): df-schema column name of the COLLECTION
+            vvg_url (str): web gallery root URL for the collection
+            page_cols (dict): df-schema column names to scrap with their
+            multiple flag
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): boolean to confirm success of the task
+        """
+        try:
+            print("Recovering all collection page columns in a single pass")
+
+            ans = False
+            gc = self.gallery_controller
+
+            # HTML tags for each of the columns
+            tags = dict()
+            for col, multiple in self.get_pagecols(args[2]).items():
+                tags[col] = (self.get_wtags(col), multiple)
+
+            page_data = self.run_stage("scrap_collection",
+                                       args[0],
+                                       args[1],
+                                       tags)
+
+            # update the CSV columns with the data
+            for col, data in page_data.items():
+                ans = gc.updata(col, data)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            raise exp
+
     def printre(self, report):
         """
         prints the report tittle in the console
@@ -921,26 +1378,20 @@ class View():
                     self.twelve(id_col, json_index_cols)
                     ans = True
 
+                # recovering all the collection page columns at once
+                elif int(inp) == 13:
+                    ans = self.thirteen(curl_col, vvg_url, page_cols)
+
                 elif int(inp) == 99:
                     # list of automatic steps
-                    # (3, 4, 5, 6, 7, 2, 8, 2, 9, 2, 10, 2, 11, 2, 12)
-                    print("Auto executing options 5 to 12!!!...")
-                    ans = self.five(desc_col, curl_col)
+                    # (13, 2, 7, 2, 11, 2, 12, 2)
+                    print("Auto executing options 13, 7, 11 and 12!!!...")
+                    ans = self.thirteen(curl_col, vvg_url, page_cols)
                     ans = self.two(expf, dataf)
 
-                    ans = self.six(dl_col, curl_col, vvg_url)
                     ans = self.seven(dl_col, haspic_col)
                     ans = self.two(expf, dataf)
 
-                    ans = self.eight(search_col, curl_col, vvg_url)
-                    ans = self.two(expf, dataf)
-
-                    ans = self.nine(obj_col, curl_col)
-                    ans = self.two(expf, dataf)
-
-                    ans = self.ten(rwork_col, curl_col, vvg_url)
-                    ans = self.two(expf, dataf)
-
                     ans = self.eleven(id_col, img_col, shape_col)
                     ans = self.two(expf, dataf)
 
@@ -949,7 +1400,7 @@ class View():
 
                     self.inputs = -1
 
-                # exit program
+                # exit program, the browsers close in the finally
                 elif int(inp) == 0:
                     sys.exit(0)
 
@@ -965,6 +1416,11 @@ class View():
             print(exp)
             self.run()
 
+        # the warm browsers close however the menu loop ends
+        finally:
+            self.gallery_model.close()
+            self.gallery_controller.close()
+
 
 # main of the program
 if __name__ == "__main__":
@@ -0,0 +1,796 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# =========================================
+# Standard library imports
+# =========================================
+import time
+import asyncio
+
+# =========================================
+# Third party imports
+# =========================================
+# aiohttp is only needed by the asyncio scrapping engine
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# =========================================
+# Local application imports
+# =========================================
+import Conf
+from Lib.Utils import Err
+from Lib.Recovery.Parser import new_soup
+from Lib.Recovery.Throttle import retry_seconds
+assert Conf
+assert Err
+
+# =========================================
+# Global variables
+# =========================================
+DEFAULT_HTML_PARSER = "html.parser"
+
+# max number of in-flight connections of the event loop
+DEFAULT_ASYNC_LIMIT = 1000
+
+# max number of in-flight connections for each host
+DEFAULT_ASYNC_PER_HOST = 100
+
+# number of retries for 429/503 answers after their Retry-After time
+DEFAULT_MAX_RETRIES = 3
+
+# backoff factor of the 429/503 retries without Retry-After, ie.: 0.5, 1.0
+DEFAULT_BACKOFF = 0.5
+
+# HTTP status codes of an overloaded server
+OVERLOAD_STATUS = (429, 503)
+
+# status code of an unchanged page after a conditional request
+NOT_MODIFIED_STATUS = 304
+
+# status code and body of a request over its deadline
+TIMEOUT_STATUS = 504
+TIMEOUT_BODY = b"<html></html>"
+
+
+class AsyncPool():
+    """
+    this module keeps one aiohttp client session for the event loop, all
+    the AsyncPage() requests share its connections
+    """
+
+    # =========================================
+    # class variables
+    # =========================================
+    session = None
+    limit = DEFAULT_ASYNC_LIMIT
+    perhost = DEFAULT_ASYNC_PER_HOST
+    retries = DEFAULT_MAX_RETRIES
+    limiter = None
+    throttle = None
+    deadline = None
+
+    def __init__(self, *args, **kwargs):
+        """
+        class creator for AsyncPool(), the session opens with the first
+        request so it belongs to the running event loop
+
+        Args:
+            limit (int, optional): max in-flight connections. Defaults to
+            1000
+            perhost (int, optional): max in-flight connections per host.
+            Defaults to 100
+            retries (int, optional): retries for 429/503 answers. Defaults
+            to 3
+            limiter (Limiter, optional): rate limiter to await before each
+            request. Defaults to None, no limit
+            throttle (Throttle, optional): adaptive concurrency control for
+            the in-flight requests. Defaults to None, no control
+            deadline (Deadline, optional): connect, read and total deadlines
+            of the requests and their hedging. Defaults to None, no limit
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+
+            # default object attributes
+            self.session = None
+            self.limit = DEFAULT_ASYNC_LIMIT
+            self.perhost = DEFAULT_ASYNC_PER_HOST
+            self.retries = DEFAULT_MAX_RETRIES
+            self.limiter = None
+            self.throttle = None
+            self.deadline = None
+
+            # if there are dict decrators in the creator
+            if len(kwargs) > 0:
+
+                # iterating all over the decorators
+                for key in list(kwargs.keys()):
+
+                    # updating the connection limits
+                    if key == "limit":
+                        self.limit = int(kwargs.get("limit"))
+
+                    if key == "perhost":
+                        self.perhost = int(kwargs.get("perhost"))
+
+                    if key == "retries":
+                        self.retries = int(kwargs.get("retries"))
+
+                    if key == "limiter":
+                        self.limiter = kwargs.get("limiter")
+
+                    if key == "throttle":
+                        self.throttle = kwargs.get("throttle")
+
+                    if key == "deadline":
+                        self.deadline = kwargs.get("deadline")
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "AsyncPool: __init__")
+
+    def open(self):
+        """
+        opens the client session in the running event loop
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (aiohttp.ClientSession): the shared client session
+        """
+        try:
+            if aiohttp is None:
+                raise ImportError("aiohttp is needed for the async engine")
+
+            # creating the session only once
+            if self.session is None or self.session.closed:
+                connector = aiohttp.TCPConnector(limit=self.limit,
+                                                 limit_per_host=self.perhost)
+                self.session = aiohttp.ClientSession(connector=connector)
+
+            ans = self.session
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "AsyncPool: open")
+
+    async def get(self, url, **kwargs):
+        """
+        Request the URL with the shared session and read the whole body,
+        waiting first for the rate limiter and the concurrency throttle if
+        the pool has them. 429/503 answers are retried once the server's
+        Retry-After time is over
+
+        Args:
+            url (str): page url to recover
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (tuple): the page's response (aiohttp.ClientResponse) and its
+            body in bytes, the connection is already released. the response
+            is None if the request went over its deadline
+        """
+        try:
+            ans = None
+            attempts = 0
+            session = self.open()
+
+            while ans is None or (ans[0] is not None
+                                  and ans[0].status in OVERLOAD_STATUS
+                                  and attempts <= self.retries):
+                # waiting for the host token
+                if self.limiter is not None:
+                    await self.limiter.await_token(url)
+
+                # without throttle the request goes straight away
+                if self.throttle is None:
+                    response, body, latency = await self.send(session, url,
+                                                              **kwargs)
+                    ans = (response, body)
+                    attempts += 1
+
+                    # waiting as the overloaded server asks
+                    if (response is not None
+                            and response.status in OVERLOAD_STATUS
+                            and attempts <= self.retries):
+                        retry = response.headers.get("Retry-After")
+                        await asyncio.sleep(self.overload_wait(retry,
+                                                               attempts))
+                    continue
+
+                # waiting for an in-flight slot
+                await self.throttle.aacquire()
+                status, latency, retry = None, None, None
+                try:
+                    response, body, latency = await self.send(session, url,
+                                                              **kwargs)
+                    status = TIMEOUT_STATUS
+                    if response is not None:
+                        status = response.status
+                        retry = response.headers.get("Retry-After")
+                    ans = (response, body)
+
+                # the slot is free even if the request fails
+                finally:
+                    self.throttle.release(status, latency, retry)
+                attempts += 1
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "AsyncPool: get")
+
+    def overload_wait(self, retry, attempts):
+        """
+        seconds to wait before retrying a 429/503 answer without throttle,
+        the Retry-After of the server or the backoff of the attempt
+
+        Args:
+            retry (str): Retry-After header of the response, None if the
+            server did not send it
+            attempts (int): requests already sent for the URL
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (float): seconds to wait
+        """
+        try:
+            ans = DEFAULT_BACKOFF * (2 ** (attempts - 1))
+
+            if retry is not None:
+                ans = retry_seconds(retry)
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "AsyncPool: overload_wait")
+
+    async def send(self, session, url, **kwargs):
+        """
+        sends the request within its deadlines, if hedging is on and the
+        request is still pending past the recent p95 latency a duplicate
+        is sent if the rate limiter and the throttle allow it now, the first
+        good answer wins and the other one is cancelled
+
+        Args:
+            session (aiohttp.ClientSession): the shared client session
+            url (str): page url to recover
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (tuple): the page's response, its body in bytes and its time
+            to first byte in seconds
+        """
+        try:
+            delay = None
+            if self.deadline is not None:
+                delay = self.deadline.hedge_delay()
+
+            # no hedging, the plain request
+            if delay is None:
+                ans = await self.request(session, url, **kwargs)
+                return ans
+
+            first = asyncio.ensure_future(self.request(session, url,
+                                                       **kwargs))
+            done, pending = await asyncio.wait([first], timeout=delay)
+
+            # slow request, sending the duplicate if the host allows it
+            if len(done) == 0 and self.allow_hedge(url):
+                self.deadline.add_hedged()
+                second = asyncio.ensure_future(self.request(session, url,
+                                                            **kwargs))
+
+                # the duplicate frees its throttle slot with its answer
+                if self.throttle is not None:
+                    second.add_done_callback(self.release_hedge)
+
+                futures = [first, second]
+                done, pending = await asyncio.wait(
+                    futures, return_when=asyncio.FIRST_COMPLETED)
+
+                # an error or a timeout waits for the other answer
+                if not any(self.answered(f) for f in done):
+                    if len(pending) > 0:
+                        await asyncio.wait(pending)
+
+                ans = self.pick(futures)
+
+                # the late request frees its connection
+                for late in futures:
+                    if late is not ans and not late.done():
+                        late.cancel()
+
+                return ans.result()
+
+            ans = await first
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "AsyncPool: send")
+
+    def allow_hedge(self, url):
+        """
+        checks if a duplicate request can go now with the rate limiter and
+        the throttle of the pool, a duplicate never waits for them
+
+        Args:
+            url (str): page url to recover
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): True if the duplicate can be sent, its throttle slot
+            is already taken
+        """
+        try:
+            ans = True
+
+            if self.throttle is not None:
+                ans = self.throttle.acquire_now()
+
+            # without a token the slot goes back untouched
+            if ans is True and self.limiter is not None:
+                ans = self.limiter.take(url)
+                if ans is False and self.throttle is not None:
+                    self.throttle.giveback()
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "AsyncPool: allow_hedge")
+
+    def release_hedge(self, future):
+        """
+        frees the throttle slot of a duplicate request with its answer
+
+        Args:
+            future (asyncio.Future): the duplicate request
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            status, latency, retry = None, None, None
+
+            if not future.cancelled() and future.exception() is None:
+                response, body, latency = future.result()
+                if response is not None:
+                    status = response.status
+                    retry = response.headers.get("Retry-After")
+
+            # a cancelled duplicate says nothing about the server
+            if future.cancelled():
+                self.throttle.giveback()
+            else:
+                self.throttle.release(status, latency, retry)
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "AsyncPool: release_hedge")
+
+    def answered(self, future):
+        """
+        checks if a finished request has a real answer, not an error nor the
+        timeout of its deadline
+
+        Args:
+            future (asyncio.Future): the finished request
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): True if the server answered
+        """
+        try:
+            ans = not future.cancelled() and future.exception() is None
+            if ans is True:
+                ans = future.result()[0] is not None
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "AsyncPool: answered")
+
+    def pick(self, futures):
+        """
+        chooses the answer of the hedged requests, the first finished one
+        with a real answer, otherwise the first finished one
+
+        Args:
+            futures (list): the request and its duplicate
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (asyncio.Future): the winning request
+        """
+        try:
+            finished = [f for f in futures if f.done()]
+            good = [f for f in finished if self.answered(f)]
+            ans = (good or finished)[0]
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "AsyncPool: pick")
+
+    async def request(self, session, url, **kwargs):
+        """
+        one request with the connect, read and total deadlines, a timeout
+        answers without response instead of stopping the scrap
+
+        Args:
+            session (aiohttp.ClientSession): the shared client session
+            url (str): page url to recover
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (tuple): the page's response, its body in bytes and its time
+            to first byte in seconds, the response is None over the deadline
+        """
+        try:
+            if self.deadline is not None:
+                kwargs.setdefault("timeout", aiohttp.ClientTimeout(
+                    total=self.deadline.total or None,
+                    connect=self.deadline.connect,
+                    sock_read=self.deadline.read))
+
+            start = time.monotonic()
+            try:
+                async with session.get(url, **kwargs) as response:
+                    # time to first byte, the headers are already here
+                    latency = time.monotonic() - start
+                    if self.deadline is not None:
+                        self.deadline.record(latency)
+                    body = await response.read()
+                ans = (response, body, latency)
+
+            # a stalled connection or a read over the deadline
+            except asyncio.TimeoutError:
+                if self.deadline is None:
+                    raise
+                self.deadline.add_timeout()
+                latency = time.monotonic() - start
+                ans = (None, TIMEOUT_BODY, latency)
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "AsyncPool: request")
+
+    async def close(self):
+        """
+        closes the client session and all its connections
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            if self.session is not None:
+                await self.session.close()
+                self.session = None
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "AsyncPool: close")
+
+
+class AsyncPage():
+    """
+    this module is the asyncio counterpart of Page(), make a request of an
+    URL without blocking the event loop and helps translate data into
+    readable information for the dataframe
+    """
+
+    # =========================================
+    # class variables
+    # =========================================
+    url = str()
+    request = None
+    sbody = None
+    shead = None
+    content = None
+    dialect = DEFAULT_HTML_PARSER
+    strainer = None
+    pool = None
+    cache = None
+    validator = None
+
+    def __init__(self, *args, **kwargs):
+        """
+        class creator for AsyncPage()
+
+        Args:
+            url (str, optional): page url to recover. Defaults is empty str
+            dialect (str, optional): beautifulSoup parser dialect. Defaults
+            "html.parser"
+            strainer (SoupStrainer, optional): sections of the page to
+            parse. Defaults to None, the whole page
+            pool (AsyncPool, optional): shared client session for the
+            requests. Defaults to a new AsyncPool()
+            cache (Cache, optional): local response cache consulted before
+            each request. Defaults to None, no cache
+            validator (Validator, optional): ETag/Last-Modified store for the
+            conditional requests. Defaults to None, no conditions
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+
+            # default object attributes
+            self.url = str()
+            self.dialect = DEFAULT_HTML_PARSER
+            self.strainer = None
+            self.request = None
+            self.sbody = None
+            self.shead = None
+            self.content = None
+            self.pool = None
+            self.cache = None
+            self.validator = None
+
+            # when arguments are pass as parameters
+            if len(args) > 0:
+                self.url = args[0]
+
+            # if there are dict decrators in the creator
+            if len(kwargs) > 0:
+
+                # iterating all over the decorators
+                for key in list(kwargs.keys()):
+
+                    # updating the parser dialect
+                    if key == "dialect":
+                        self.dialect = kwargs.get("dialect")
+
+                    # parsing only the scraped sections
+                    if key == "strainer":
+                        self.strainer = kwargs.get("strainer")
+
+                    # sharing the client session between pages
+                    if key == "pool":
+                        self.pool = kwargs.get("pool")
+
+                    # sharing the response cache between pages
+                    if key == "cache":
+                        self.cache = kwargs.get("cache")
+
+                    # sharing the validators between pages
+                    if key == "validator":
+                        self.validator = kwargs.get("validator")
+
+            # default client session
+            if self.pool is None:
+                self.pool = AsyncPool()
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "AsyncPage: __init__")
+
+    def findin(self, division, attributes=None, multiple=True):
+        """
+        find HTML tags inside a BeautifulSoup class attribute.
+
+        Args:
+            division (str): HTML tag to find in soup ie.: "div", or
+            "li"
+            attributes (dict, optional): decorators to highlight the divs
+            options. Defaults to None.
+            multiple (bool, optional): True to find multiple tag occurrences in
+            the HTML, False if not. Default to True
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bs-obj): filtered BeautifulSoup object
+        """
+        try:
+            ans = None
+
+            if multiple is True:
+                ans = self.sbody.findAll(division, attrs=attributes)
+
+            elif multiple is False:
+                ans = self.sbody.find(division, attrs=attributes)
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "AsyncPage: findin")
+
+    async def get_response(self, *args):
+        """
+        Request the URL with the shared client session, updating the page
+        url if it is a parameter. if the page has a cache it answers first
+        and saves the new 200 responses, in replay mode a missing URL
+        answers 504 without any request. with a validator the request is
+        conditional and an unchanged page answers 304 without body, or the
+        cached page if the cache has it
+
+        Args:
+            url (str, optional): page url to recover. Defaults to empty str.
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (tuple): the page's status code, headers and body in bytes
+        """
+        try:
+            # requesting the page with the url parameter
+            if len(args) > 0:
+                self.url = args[0]
+
+            # looking for the response in the cache
+            cached = None
+            if self.cache is not None:
+                cached = self.cache.load(self.url)
+
+                if cached is None and self.cache.replay is True:
+                    cached = self.cache.missing(self.url)
+
+            # ETag/Last-Modified of the previous scrap, nothing goes to the
+            # server in replay mode
+            headers = dict()
+            replay = self.cache is not None and self.cache.replay is True
+            if self.validator is not None and not replay:
+                headers = self.validator.conditions(self.url)
+
+            # without validators the cached page answers at once
+            if cached is not None and len(headers) == 0:
+                self.request = cached
+                ans = (cached.status_code, cached.headers, cached.content)
+                return ans
+
+            response, body = await self.pool.get(self.url, headers=headers)
+            self.request = response
+
+            # the server says the cached page is still the same
+            if response is not None and cached is not None:
+                if response.status == NOT_MODIFIED_STATUS:
+                    self.request = cached
+                    ans = (cached.status_code, cached.headers,
+                           cached.content)
+                    return ans
+
+            # the request went over its deadline
+            if response is None:
+                ans = (TIMEOUT_STATUS, dict(), body)
+                return ans
+
+            ans = (response.status, response.headers, body)
+
+            # saving the good responses for the next time
+            if response.status == 200:
+                if self.cache is not None:
+                    self.cache.save(self.url, response.status,
+                                    response.headers, body)
+
+                if self.validator is not None:
+                    self.validator.update(self.url, response.headers)
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "AsyncPage: get_response")
+
+    async def get_body(self, *args):
+        """
+        Request the URL. if succesfull returns the REST page's status code and
+        updates the BODY attribute of AsyncPage() with the information
+        collected it
+
+        Args:
+            url (str, optional): page url to recover. Defaults to empty str.
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (int): page's request status code (i.e: 200)
+        """
+        try:
+            status, headers, body = await self.get_response(*args)
+            ans = status
+
+            # unchanged pages have no body to parse
+            if ans != NOT_MODIFIED_STATUS:
+                self.sbody = new_soup(body, self.dialect, self.strainer)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "AsyncPage: get_body")
+
+    async def get_header(self, *args):
+        """
+        Request the URL. if succesfull returns the REST page's status code and
+        updates the HEAD attribute of AsyncPage() with the information
+        collected it
+
+        Args:
+            url (str, optional): page url to recover. Defaults to empty str.
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (int): page's request status code (i.e: 200)
+        """
+        try:
+            status, headers, body = await self.get_response(*args)
+            self.shead = dict(headers)
+            ans = status
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "AsyncPage: get_header")
+
+    async def get_content(self, *args):
+        """
+        Request the URL. if succesfull returns the REST page's status code
+        and updates the Content attribute of AsyncPage() with the information
+        collected it
+
+        Args:
+            url (str, optional): page url to recover. Defaults to empty str.
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (int): page's request status code (i.e: 200)
+        """
+        try:
+            status, headers, body = await self.get_response(*args)
+            self.content = body
+            ans = status
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "AsyncPage: get_content")
@@ -0,0 +1,349 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# =========================================
+# Standard library imports
+# =========================================
+import threading
+
+# =========================================
+# Third party imports
+# =========================================
+from selenium import webdriver
+
+# psutil is only needed to recycle the browsers on memory growth
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# =========================================
+# Local application imports
+# =========================================
+import Conf
+from Lib.Utils import Err
+assert Conf
+assert Err
+
+# =========================================
+# Global variables
+# =========================================
+# max number of browsers open at the same time
+DEFAULT_BROWSERS = 1
+
+# run the browsers without window
+DEFAULT_HEADLESS = True
+
+# uses of a browser before it is replaced by a new one
+DEFAULT_MAX_USES = 20
+
+# memory growth of a browser in MB before it is replaced, 0 is no limit
+DEFAULT_MAX_GROWTH = 512
+
+# seconds the browser waits for the elements of a page
+DEFAULT_IMPLICIT_WAIT = 30
+
+
+class BrowserPool():
+    """
+    this module keeps a pool of warm headless Firefox browsers for the
+    pages that need javascript rendering, the pages take a browser and give
+    it back when they finish instead of starting a new one, each browser is
+    recycled after a number of uses or when its memory grows too much
+    """
+
+    # =========================================
+    # class variables
+    # =========================================
+    size = DEFAULT_BROWSERS
+    headless = DEFAULT_HEADLESS
+    maxuses = DEFAULT_MAX_USES
+    maxgrowth = DEFAULT_MAX_GROWTH
+    idle = list()
+    uses = dict()
+    baseline = dict()
+    opened = 0
+    recycled = 0
+    cond = None
+
+    def __init__(self, *args, **kwargs):
+        """
+        class creator for BrowserPool(), the browsers start with the first
+        pages that need them
+
+        Args:
+            size (int, optional): max number of open browsers. Defaults to 1
+            headless (bool, optional): run the browsers without window.
+            Defaults to True
+            maxuses (int, optional): uses before a browser is recycled.
+            Defaults to 20
+            maxgrowth (int, optional): memory growth in MB before a browser
+            is recycled, 0 is no limit, it needs psutil. Defaults to 512
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+
+            # default object attributes
+            self.size = DEFAULT_BROWSERS
+            self.headless = DEFAULT_HEADLESS
+            self.maxuses = DEFAULT_MAX_USES
+            self.maxgrowth = DEFAULT_MAX_GROWTH
+            self.idle = list()
+            self.uses = dict()
+            self.baseline = dict()
+            self.opened = 0
+            self.recycled = 0
+            self.cond = threading.Condition()
+
+            # if there are dict decrators in the creator
+            if len(kwargs) > 0:
+
+                # iterating all over the decorators
+                for key in list(kwargs.keys()):
+
+                    # updating the browsers configuration
+                    if key == "size":
+                        self.size = max(1, int(kwargs.get("size")))
+
+                    if key == "headless":
+                        self.headless = bool(kwargs.get("headless"))
+
+                    if key == "maxuses":
+                        self.maxuses = int(kwargs.get("maxuses"))
+
+                    if key == "maxgrowth":
+                        self.maxgrowth = int(kwargs.get("maxgrowth"))
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "BrowserPool: __init__")
+
+    def new_driver(self):
+        """
+        starts a new Firefox browser and records its memory at the start
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (webdriver.Firefox): the new browser
+        """
+        try:
+            options = webdriver.FirefoxOptions()
+            if self.headless is True:
+                options.add_argument("-headless")
+
+            ans = webdriver.Firefox(options=options)
+            ans.implicitly_wait(DEFAULT_IMPLICIT_WAIT)
+
+            self.uses[id(ans)] = 0
+            self.baseline[id(ans)] = self.get_memory(ans)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "BrowserPool: new_driver")
+
+    def get_memory(self, driver):
+        """
+        measures the resident memory of the browser and its content
+        processes
+
+        Args:
+            driver (webdriver.Firefox): the browser to measure
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (int): memory in bytes, None without psutil or pid
+        """
+        try:
+            ans = None
+            pid = driver.capabilities.get("moz:processID")
+
+            if psutil is not None and pid is not None:
+                try:
+                    proc = psutil.Process(pid)
+                    ans = proc.memory_info().rss
+                    for child in proc.children(recursive=True):
+                        ans += child.memory_info().rss
+
+                # the browser closed while it was measured
+                except psutil.Error:
+                    ans = None
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "BrowserPool: get_memory")
+
+    def expired(self, driver):
+        """
+        checks if the browser must be replaced by a new one
+
+        Args:
+            driver (webdriver.Firefox): the browser given back to the pool
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): True if it reached its max uses or memory growth
+        """
+        try:
+            ans = False
+
+            uses = self.uses.get(id(driver), 0)
+
+            if self.maxuses > 0 and uses >= self.maxuses:
+                ans = True
+
+            elif self.maxgrowth > 0:
+                start = self.baseline.get(id(driver))
+                current = self.get_memory(driver)
+
+                if start is not None and current is not None:
+                    growth = (current - start) / (1024 * 1024)
+                    ans = growth > self.maxgrowth
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "BrowserPool: expired")
+
+    def acquire(self):
+        """
+        takes a warm browser from the pool, it starts a new one if there is
+        room or waits until another page gives one back
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (webdriver.Firefox): the browser for the page
+        """
+        try:
+            ans = None
+
+            with self.cond:
+                while len(self.idle) == 0 and self.opened >= self.size:
+                    self.cond.wait()
+
+                if len(self.idle) > 0:
+                    ans = self.idle.pop()
+
+                # the new browser starts out of the lock
+                else:
+                    self.opened += 1
+
+            if ans is None:
+                try:
+                    ans = self.new_driver()
+
+                except Exception:
+                    with self.cond:
+                        self.opened -= 1
+                        self.cond.notify()
+                    raise
+
+            self.uses[id(ans)] += 1
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "BrowserPool: acquire")
+
+    def release(self, driver, broken=False):
+        """
+        gives the browser back to the pool, it is closed if it failed or it
+        must be recycled
+
+        Args:
+            driver (webdriver.Firefox): the browser of the page
+            broken (bool, optional): the page failed with the browser.
+            Defaults to False
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            if broken is True or self.expired(driver):
+                self.quit(driver)
+                with self.cond:
+                    self.opened -= 1
+                    self.recycled += 1
+                    self.cond.notify()
+
+            else:
+                with self.cond:
+                    self.idle.append(driver)
+                    self.cond.notify()
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "BrowserPool: release")
+
+    def quit(self, driver):
+        """
+        closes the browser and forgets its counters
+
+        Args:
+            driver (webdriver.Firefox): the browser to close
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            self.uses.pop(id(driver), None)
+            self.baseline.pop(id(driver), None)
+
+            # a broken browser can fail to quit, it is gone anyway
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "BrowserPool: quit")
+
+    def close(self):
+        """
+        closes all the idle browsers of the pool
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            with self.cond:
+                idle = self.idle
+                self.idle = list()
+                self.opened -= len(idle)
+
+            for driver in idle:
+                self.quit(driver)
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "BrowserPool: close")
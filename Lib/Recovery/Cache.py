@@ -0,0 +1,452 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# =========================================
+# Standard library imports
+# =========================================
+import os
+import gzip
+import json
+import hashlib
+import datetime
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit
+from urllib.parse import urlunsplit
+from urllib.parse import parse_qsl
+from urllib.parse import urlencode
+
+# =========================================
+# Third party imports
+# =========================================
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# =========================================
+# Local application imports
+# =========================================
+import Conf
+from Lib.Utils import Err
+assert Conf
+assert Err
+
+# =========================================
+# Global variables
+# =========================================
+# local folder for the cached responses
+DEFAULT_CACHE_FOLDER = os.path.join("Data", "Cache")
+
+# max size of the cache folder in bytes, 512 MB
+DEFAULT_CACHE_SIZE = 512 * 1024 * 1024
+
+# serve every request from the cache without network requests
+DEFAULT_REPLAY = False
+
+# extension of the cached response files
+CACHE_EXT = ".gz"
+
+# default ports removed from the normalized URLs
+DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+# status code and body of a replay request without a cached response
+REPLAY_MISS_STATUS = 504
+REPLAY_MISS_BODY = b"<html></html>"
+
+
+class Cache():
+    """
+    this module keeps a persistent cache of the HTTP responses in a local
+    folder, each response is a gzip file named with the hash of its
+    normalized URL with the status, headers and body, the least recently
+    used files are removed when the folder grows over its max size
+    """
+
+    # =========================================
+    # class variables
+    # =========================================
+    folder = DEFAULT_CACHE_FOLDER
+    maxsize = DEFAULT_CACHE_SIZE
+    replay = DEFAULT_REPLAY
+    index = OrderedDict()
+    size = 0
+    hits = 0
+    misses = 0
+    lock = None
+
+    def __init__(self, *args, **kwargs):
+        """
+        class creator for Cache(), it creates the folder if it does not
+        exists and loads the index of the cached files
+
+        Args:
+            folder (str, optional): local folder for the responses. Defaults
+            to "Data/Cache"
+            maxsize (int, optional): max size of the folder in bytes.
+            Defaults to 512 MB
+            replay (bool, optional): serve every request from the cache, a
+            missing URL answers 504 without network request. Defaults to
+            False
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+
+            # default object attributes
+            self.folder = DEFAULT_CACHE_FOLDER
+            self.maxsize = DEFAULT_CACHE_SIZE
+            self.replay = DEFAULT_REPLAY
+            self.index = OrderedDict()
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
+            self.lock = threading.Lock()
+
+            # if there are dict decrators in the creator
+            if len(kwargs) > 0:
+
+                # iterating all over the decorators
+                for key in list(kwargs.keys()):
+
+                    # updating the cache configuration
+                    if key == "folder":
+                        self.folder = kwargs.get("folder")
+
+                    if key == "maxsize":
+                        self.maxsize = int(kwargs.get("maxsize"))
+
+                    if key == "replay":
+                        self.replay = bool(kwargs.get("replay"))
+
+            # creating the folder and loading the index
+            if not os.path.exists(self.folder):
+                os.makedirs(self.folder)
+
+            self.load_index()
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Cache: __init__")
+
+    def load_index(self):
+        """
+        loads the cached files in the folder from the least to the most
+        recently used with their size
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            files = list()
+
+            for fname in os.listdir(self.folder):
+                if fname.endswith(CACHE_EXT):
+                    fpath = os.path.join(self.folder, fname)
+                    fstat = os.stat(fpath)
+                    files.append((fstat.st_mtime, fname, fstat.st_size))
+
+            # the modification time is the last time the file was used
+            files.sort()
+            self.index = OrderedDict()
+            self.size = 0
+
+            for mtime, fname, fsize in files:
+                self.index[fname] = fsize
+                self.size += fsize
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Cache: load_index")
+
+    def normalize(self, url):
+        """
+        normalize the URL so the same page always has the same key, lower
+        case scheme and host, no default port, no fragment and sorted query
+        parameters
+
+        Args:
+            url (str): URL to normalize
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (str): normalized URL
+        """
+        try:
+            parts = urlsplit(url.strip())
+            scheme = parts.scheme.lower()
+            host = parts.netloc.lower()
+
+            # removing the default port of the scheme
+            port = DEFAULT_PORTS.get(scheme)
+            if port is not None and host.endswith(":" + port):
+                host = host[:-len(port) - 1]
+
+            path = parts.path or "/"
+            query = urlencode(sorted(parse_qsl(parts.query,
+                                               keep_blank_values=True)))
+
+            ans = urlunsplit((scheme, host, path, query, str()))
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Cache: normalize")
+
+    def get_fname(self, url):
+        """
+        creates the cache file name of the URL with the sha256 hash of its
+        normalized version
+
+        Args:
+            url (str): URL of the response
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (str): file name of the cached response
+        """
+        try:
+            nurl = self.normalize(url).encode("utf-8")
+            ans = hashlib.sha256(nurl).hexdigest() + CACHE_EXT
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Cache: get_fname")
+
+    def load(self, url):
+        """
+        recovers the cached response of the URL and updates the hit/miss
+        counters
+
+        Args:
+            url (str): URL of the response
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (requests.Response): the cached response, None if the URL is
+            not in the cache
+        """
+        try:
+            ans = None
+            fname = self.get_fname(url)
+
+            with self.lock:
+                cached = fname in self.index
+
+                # the file is the most recently used now
+                if cached:
+                    self.index.move_to_end(fname)
+                    self.hits += 1
+
+                else:
+                    self.misses += 1
+
+            if cached:
+                fpath = os.path.join(self.folder, fname)
+
+                try:
+                    with gzip.open(fpath, "rb") as file:
+                        meta = json.loads(file.readline().decode("utf-8"))
+                        body = file.read()
+
+                    # saving the use time for the next index
+                    os.utime(fpath)
+
+                # a concurrent save() evicted the file, it is a miss
+                except FileNotFoundError:
+                    with self.lock:
+                        self.hits -= 1
+                        self.misses += 1
+
+                        if not os.path.exists(fpath):
+                            self.size -= self.index.pop(fname, 0)
+
+                    return ans
+
+                ans = self.to_response(url, meta.get("status"),
+                                       meta.get("headers"), body)
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Cache: load")
+
+    def save(self, url, status, headers, body):
+        """
+        saves the response of the URL in the cache folder and removes the
+        least recently used files if the folder is over its max size
+
+        Args:
+            url (str): URL of the response
+            status (int): HTTP status code of the response
+            headers (dict): headers of the response
+            body (bytes): body of the response
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            fname = self.get_fname(url)
+            fpath = os.path.join(self.folder, fname)
+
+            # the body is already decoded, its old encoding no longer applies
+            headers = dict(headers)
+            lkeys = [key.lower() for key in headers.keys()]
+            drop = ["transfer-encoding"]
+            if "content-encoding" in lkeys:
+                drop = drop + ["content-encoding", "content-length"]
+
+            for key in list(headers.keys()):
+                if key.lower() in drop:
+                    headers.pop(key)
+
+            meta = {
+                "url": self.normalize(url),
+                "status": status,
+                "headers": headers,
+            }
+
+            # writing a temporal file first so readers never get half a file
+            tpath = fpath + "." + str(threading.get_ident())
+            with gzip.open(tpath, "wb") as file:
+                file.write(json.dumps(meta).encode("utf-8") + b"\n")
+                file.write(body)
+            os.replace(tpath, fpath)
+
+            fsize = os.path.getsize(fpath)
+
+            with self.lock:
+                self.size += fsize - self.index.get(fname, 0)
+                self.index[fname] = fsize
+                self.index.move_to_end(fname)
+                self.evict()
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Cache: save")
+
+    def evict(self):
+        """
+        removes the least recently used files until the cache folder is
+        under its max size, the caller must hold the lock
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            while self.size > self.maxsize and len(self.index) > 1:
+                fname, fsize = self.index.popitem(last=False)
+                self.size -= fsize
+                fpath = os.path.join(self.folder, fname)
+
+                if os.path.exists(fpath):
+                    os.remove(fpath)
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Cache: evict")
+
+    def to_response(self, url, status, headers, body):
+        """
+        creates a requests.Response with the cached data so the pages use
+        it as any other response
+
+        Args:
+            url (str): URL of the response
+            status (int): HTTP status code of the response
+            headers (dict): headers of the response
+            body (bytes): body of the response
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (requests.Response): the response with the cached data
+        """
+        try:
+            ans = Response()
+            ans.url = url
+            ans.status_code = status
+            ans.headers = CaseInsensitiveDict(headers or dict())
+            ans.encoding = get_encoding_from_headers(ans.headers)
+            ans.elapsed = datetime.timedelta(0)
+            ans._content = body
+            # the body is already read, iter_content() streams it from memory
+            ans._content_consumed = True
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Cache: to_response")
+
+    def missing(self, url):
+        """
+        creates the answer of a replay request without cached response
+
+        Args:
+            url (str): URL of the request
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (requests.Response): empty page with the 504 status
+        """
+        try:
+            ans = self.to_response(url, REPLAY_MISS_STATUS,
+                                   dict(), REPLAY_MISS_BODY)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Cache: missing")
+
+    def stats(self):
+        """
+        reports the use of the cache
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): hits, misses, hit rate, files and size in bytes
+        """
+        try:
+            with self.lock:
+                total = self.hits + self.misses
+                ans = {
+                    "hits": self.hits,
+                    "misses": self.misses,
+                    "rate": self.hits / total if total > 0 else 0.0,
+                    "files": len(self.index),
+                    "size": self.size,
+                }
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Cache: stats")
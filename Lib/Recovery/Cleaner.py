@@ -21,17 +21,21 @@
 # =========================================
 # native python libraries
 # =========================================
-# import re
-# import os
-# import copy
-# import urllib
-# import requests
+import re
+import ast
+import sys
+import time
+import threading
+import unicodedata
+from collections import OrderedDict
+from urllib.parse import urljoin
 
 # =========================================
 # extension python libraries
 # =========================================
 # from urllib.parse import urlparse
-# import unicodedata
+import pandas as pd
+import soupsieve
 
 # =========================================
 # developed python libraries
@@ -40,17 +44,452 @@ import Conf
 from Lib.Utils import Err
 assert Conf
 assert Err
+assert re
 
 # =========================================
 # Global variables
 # =========================================
 DEFAULT_HTML_PARSER = "html.parser"
 
+# config keys of the columns with an extraction plan
+PLAN_KEYS = ("divs", "attrs", "multiple", "fields")
+
+# joins the texts of a batch, it is not whitespace nor part of the cleaned
+# patterns and the unicode normalization does not combine it
+BATCH_SEPARATOR = "\x00"
+
+# extra spaces and HTML leftovers removed by the text cleaner
+SPACES_RE = re.compile(r" \s+")
+LEFTOVERS_RE = re.compile(r"None{1,3}")
+
+# newlines to sentences and no single quotes, in one pass
+TEXT_TABLE = str.maketrans({"\n": ". ", "'": None})
+
+# max number of clean texts kept by the text cache
+DEFAULT_TEXT_CACHE = 65536
+
+# the only call the config literals can have, the attribute patterns
+REGEX_CALL = ("re", "compile")
+
+
+def normalize(text):
+    """
+    runs the steps of Gallery.clrtext() after the strip over the text,
+    with the precompiled patterns and the translation table
+
+    Args:
+        text (str): stripped text, or a batch of them
+
+    Raises:
+        exp: raise a generic exception if something goes wrong
+
+    Returns:
+        ans (str): clean text
+    """
+    try:
+        ans = text
+
+        # fix encoding, the plain ASCII texts are already fine
+        if not ans.isascii():
+            ans = unicodedata.normalize("NFD", ans)
+            ans = ans.encode("ascii", "ignore").decode("utf-8")
+
+        ans = SPACES_RE.sub(" ", ans)
+        ans = ans.translate(TEXT_TABLE)
+        ans = LEFTOVERS_RE.sub(" ", ans)
+        ans = SPACES_RE.sub(" ", ans)
+        return ans
+
+    # exception handling
+    except Exception as exp:
+        Err.reraise(exp, "Cleaner: normalize")
+
+
+def clean_text(text):
+    """
+    cleans one text the same as Gallery.clrtext()
+
+    Args:
+        text (str): text to clean, it is cast to str
+
+    Raises:
+        exp: raise a generic exception if something goes wrong
+
+    Returns:
+        ans (str): clean text
+    """
+    try:
+        ans = normalize(str(text).strip())
+        return ans
+
+    # exception handling
+    except Exception as exp:
+        Err.reraise(exp, "Cleaner: clean_text")
+
+
+def clrtexts(texts):
+    """
+    batch version of Gallery.clrtext(), the texts are joined and cleaned
+    at once so each regular expression runs one time for all of them, the
+    answers are the same of cleaning them one by one
+
+    Args:
+        texts (list|pd.Series): texts to clean, the items are cast to str
+
+    Raises:
+        exp: raise a generic exception if something goes wrong
+
+    Returns:
+        ans (list|pd.Series): clean texts in the same order, a Series
+        keeps its index and name
+    """
+    try:
+        items = [str(text).strip() for text in texts]
+        joined = BATCH_SEPARATOR.join(items)
+
+        # a text with the separator would split in two
+        if joined.count(BATCH_SEPARATOR) == max(len(items) - 1, 0):
+            ans = normalize(joined).split(BATCH_SEPARATOR)
+        else:
+            ans = [normalize(item) for item in items]
+
+        if len(items) == 0:
+            ans = list()
+
+        if isinstance(texts, pd.Series):
+            ans = pd.Series(ans,
+                            index=texts.index,
+                            name=texts.name,
+                            dtype=object)
+
+        return ans
+
+    # exception handling
+    except Exception as exp:
+        Err.reraise(exp, "Cleaner: clrtexts")
+
+
+def literal(text, names=None):
+    """
+    reads a python literal of the config files without running it, the
+    same as ast.literal_eval() plus the re.compile() of the attribute
+    patterns, ie.: {"class": re.compile("art-object-page-content-")}
+
+    Args:
+        text (str): literal in the config file
+        names (dict, optional): values of the names the literal can have,
+        ie.: {"str": str}. Defaults to None, no names
+
+    Raises:
+        exp: raise a generic exception if something goes wrong
+
+    Returns:
+        ans (any): the value of the literal
+    """
+    try:
+        node = ast.parse(text.strip(), mode="eval").body
+        ans = read_node(node, names or dict())
+        return ans
+
+    # exception handling
+    except Exception as exp:
+        Err.reraise(exp, "Cleaner: literal")
+
+
+def read_node(node, names):
+    """
+    reads a node of a config literal, the patterns are compiled
+
+    Args:
+        node (ast.AST): node of the parsed literal
+        names (dict): values of the names the literal can have
+
+    Raises:
+        exp: raise a generic exception if something goes wrong
+
+    Returns:
+        ans (any): the value of the node
+    """
+    try:
+        # the attribute patterns with their only argument
+        if isinstance(node, ast.Call):
+            func = node.func
+            name = (getattr(func.value, "id", None), func.attr) \
+                if isinstance(func, ast.Attribute) else None
+            if name != REGEX_CALL or len(node.args) != 1 or node.keywords:
+                raise ValueError("config call not allowed: " + ast.dump(node))
+            ans = re.compile(ast.literal_eval(node.args[0]))
+
+        elif isinstance(node, ast.Name) and node.id in names:
+            ans = names[node.id]
+
+        elif isinstance(node, ast.Dict):
+            ans = {read_node(k, names): read_node(v, names)
+                   for k, v in zip(node.keys, node.values)}
+
+        elif isinstance(node, ast.List):
+            ans = [read_node(elt, names) for elt in node.elts]
+
+        elif isinstance(node, ast.Tuple):
+            ans = tuple(read_node(elt, names) for elt in node.elts)
+
+        else:
+            ans = ast.literal_eval(node)
+
+        return ans
+
+    # exception handling
+    except Exception as exp:
+        Err.reraise(exp, "Cleaner: read_node")
+
+
+class TextCache():
+    """
+    this module keeps the last clean texts in memory, the keys, labels and
+    tags repeat in most of the collection pages so they are cleaned only
+    once and all the pages share the same interned string, the least
+    recently used texts go first when it is full
+    """
+
+    # =========================================
+    # class variables
+    # =========================================
+    maxsize = DEFAULT_TEXT_CACHE
+    index = OrderedDict()
+    hits = 0
+    misses = 0
+    evictions = 0
+    elapsed = 0.0
+    shared = 0
+    lock = None
+
+    def __init__(self, *args, **kwargs):
+        """
+        class creator for TextCache()
+
+        Args:
+            maxsize (int, optional): max number of clean texts in memory.
+            Defaults to 65536
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+
+            # default object attributes
+            self.maxsize = DEFAULT_TEXT_CACHE
+            self.index = OrderedDict()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.elapsed = 0.0
+            self.shared = 0
+            self.lock = threading.Lock()
+
+            # if there are dict decrators in the creator
+            if len(kwargs) > 0:
+
+                # iterating all over the decorators
+                for key in list(kwargs.keys()):
+
+                    # updating the cache configuration
+                    if key == "maxsize":
+                        self.maxsize = max(1, int(kwargs.get("maxsize")))
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "TextCache: __init__")
+
+    def lookup(self, key):
+        """
+        looks for the clean text of the key and marks it as recently used,
+        the caller must hold the lock
+
+        Args:
+            key (str): the text before cleaning
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (str): the clean text, None if it is not in the cache
+        """
+        try:
+            ans = self.index.get(key)
+
+            if ans is not None:
+                self.index.move_to_end(key)
+                self.hits += 1
+                self.shared += sys.getsizeof(ans)
+
+            else:
+                self.misses += 1
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "TextCache: lookup")
+
+    def store(self, key, value):
+        """
+        keeps the interned clean text of the key, removing the least
+        recently used ones over the max size, the caller must hold the lock
+
+        Args:
+            key (str): the text before cleaning
+            value (str): the clean text
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (str): the interned clean text
+        """
+        try:
+            ans = sys.intern(value)
+            self.index[key] = ans
+            self.index.move_to_end(key)
+
+            while len(self.index) > self.maxsize:
+                self.index.popitem(last=False)
+                self.evictions += 1
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "TextCache: store")
+
+    def get(self, text):
+        """
+        cleans the text with the cache, like Gallery.clrtext()
+
+        Args:
+            text (str): text to clean, it is cast to str
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (str): clean text
+        """
+        try:
+            key = str(text)
+            with self.lock:
+                ans = self.lookup(key)
+
+            # cleaning out of the lock
+            if ans is None:
+                start = time.perf_counter()
+                ans = clean_text(key)
+                elapsed = time.perf_counter() - start
+
+                with self.lock:
+                    self.elapsed += elapsed
+                    ans = self.store(key, ans)
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "TextCache: get")
+
+    def get_batch(self, texts):
+        """
+        cleans the texts with the cache, the missing ones are cleaned
+        together with clrtexts()
+
+        Args:
+            texts (list|pd.Series): texts to clean, the items are cast to
+            str
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (list|pd.Series): clean texts in the same order, a Series
+            keeps its index and name
+        """
+        try:
+            keys = [str(text) for text in texts]
+            ans = list()
+            missing = dict()
+
+            with self.lock:
+                for idx, key in enumerate(keys):
+                    value = self.lookup(key)
+                    ans.append(value)
+
+                    # the repeated missing texts are cleaned once
+                    if value is None:
+                        missing.setdefault(key, list()).append(idx)
+
+            if len(missing) > 0:
+                start = time.perf_counter()
+                values = clrtexts(list(missing.keys()))
+                elapsed = time.perf_counter() - start
+
+                with self.lock:
+                    self.elapsed += elapsed
+                    for key, value in zip(missing.keys(), values):
+                        value = self.store(key, value)
+                        for idx in missing[key]:
+                            ans[idx] = value
+
+            if isinstance(texts, pd.Series):
+                ans = pd.Series(ans,
+                                index=texts.index,
+                                name=texts.name,
+                                dtype=object)
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "TextCache: get_batch")
+
+    def stats(self):
+        """
+        reports the use of the cache, the seconds saved are the hits by the
+        mean cleaning time of the misses, the shared bytes are the size of
+        the strings the hits did not create
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): hits, misses, hit rate, texts, evictions, seconds
+            saved and shared bytes
+        """
+        try:
+            with self.lock:
+                total = self.hits + self.misses
+                mean = 0.0
+                if self.misses > 0:
+                    mean = self.elapsed / self.misses
+
+                ans = {
+                    "hits": self.hits,
+                    "misses": self.misses,
+                    "rate": self.hits / total if total > 0 else 0.0,
+                    "texts": len(self.index),
+                    "evictions": self.evictions,
+                    "saved": self.hits * mean,
+                    "shared": self.shared,
+                }
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "TextCache: stats")
+
 
 class Topic():
     """
-    this module make a request of an URL and helps translate
-    data into readable information for the dataframe
+    this module translates the scraped HTML into readable information for
+    the dataframe, the extraction plans of the columns are compiled once
+    from the html-tags.ini "fields" and the same executor runs all of them
     """
 
     # =========================================
@@ -61,15 +500,21 @@ class Topic():
     sbody = None
     shead = None
     dialect = DEFAULT_HTML_PARSER
+    clrtext = None
+    plans = dict()
 
     def __init__(self, *args, **kwargs):
         """
-        class creator for page()
+        class creator for Topic()
 
         Args:
             url (str): page url to recover. Defaults is empty str
             dialect (str): beautifulSoup parser dialect. Defaults
             "html.parser"
+            clrtext (function, optional): cleans the text of the keys and
+            values. Defaults to str.strip
+            tags (ConfigParser, optional): html-tags.ini config to compile
+            the plans of its columns with "fields". Defaults to None
 
         Raises:
             exp: raise a generic exception if something goes wrong
@@ -82,6 +527,9 @@ class Topic():
             self.request = None
             self.sbody = None
             self.shead = None
+            self.clrtext = str.strip
+            self.plans = dict()
+            tags = None
 
             # when arguments are pass as parameters
             if len(args) > 0:
@@ -103,6 +551,258 @@ class Topic():
                     if key == "dialect":
                         self.dialect = kwargs.get("dialect")
 
+                    # text cleaner of the extracted data
+                    if key == "clrtext":
+                        self.clrtext = kwargs.get("clrtext")
+
+                    # config with the extraction plans
+                    if key == "tags":
+                        tags = kwargs.get("tags")
+
+            if tags is not None:
+                self.compile(tags)
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Topic: __init__")
+
+    def compile(self, cfg):
+        """
+        compiles the extraction plans of the config columns with "fields",
+        the attributes and fields are read only here, without eval()
+
+        Args:
+            cfg (ConfigParser): html-tags.ini config
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): column names with their extraction plan
+        """
+        try:
+            ans = dict()
+
+            for column in cfg.sections():
+                if not cfg.has_option(column, "fields"):
+                    continue
+
+                div, attrs, multiple, fields = [cfg.get(column, key)
+                                                for key in PLAN_KEYS]
+                fields = [self.compile_field(spec)
+                          for spec in literal(fields)]
+
+                # the plans without keys answer a plain value
+                ans[column] = {
+                    "divs": div,
+                    "attrs": literal(attrs),
+                    "multiple": literal(multiple),
+                    "scalar": all(f["key"] is None for f in fields),
+                    "fields": fields,
+                }
+
+            self.plans = ans
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Topic: compile")
+
+    def compile_field(self, spec):
+        """
+        compiles a field of the plan, the CSS selectors of the tags it
+        finds in the section and the readers of its key and value
+
+        Args:
+            spec (dict): field of the config, ie.: {"section": 0, "find":
+            "a", "key": {"text": "string"}, "value": {"attr": "href"}}
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): the compiled field
+        """
+        try:
+            key = None
+            if spec.get("key") is not None:
+                key = self.compile_reader(spec.get("key"), True)
+
+            ans = {
+                "section": spec.get("section"),
+                "find": self.compile_selector(spec.get("find")),
+                "first": spec.get("first") is True,
+                "pair": self.compile_selector(spec.get("pair")),
+                "unique": spec.get("unique") is True,
+                "key": key,
+                "value": self.compile_reader(spec.get("value"), False),
+            }
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Topic: compile_field")
+
+    def compile_selector(self, find):
+        """
+        compiles the CSS selector of the tags a field or reader finds, a
+        tag name as "dt" or any selector as "li > a"
+
+        Args:
+            find (str): CSS selector in the config, None for the tag itself
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (SoupSieve): the compiled selector, None without find
+        """
+        try:
+            ans = None
+            if find is not None:
+                ans = soupsieve.compile(find)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Topic: compile_selector")
+
+    def compile_reader(self, spec, iskey):
+        """
+        compiles the function that reads a key or a value from a tag, the
+        keys and the texts are cleaned, the attributes (URLs) are not
+
+        Args:
+            spec (dict): reader of the config, "find" a child tag first, then
+            "attr" with its optional "strip" prefix and "join" with the root
+            URL, or "text" as the tag "string" or its "children" strings
+            iskey (bool): True for the key readers
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (function): reader with the tag and the root URL
+        """
+        try:
+            find = self.compile_selector(spec.get("find"))
+            attr = spec.get("attr")
+            strip = spec.get("strip")
+            join = spec.get("join") is True
+            text = spec.get("text", "string")
+            clean = iskey or attr is None
+            clrtext = self.clrtext
+
+            if attr is not None:
+                def read(tag, rurl):
+                    data = tag.get(attr)
+                    # multi-valued attributes as class
+                    if isinstance(data, list):
+                        data = data[0]
+                    if join:
+                        data = urljoin(rurl, data)
+                    data = str(data)
+                    if strip is not None:
+                        data = data.replace(strip, "", 1)
+                    return data
+
+            elif text == "children":
+                def read(tag, rurl):
+                    return str().join(str(child.string) for child in tag)
+
+            else:
+                def read(tag, rurl):
+                    return str(tag.string)
+
+            # reading a child tag first
+            def found(tag, rurl):
+                return read(find.select_one(tag), rurl)
+
+            located = read if find is None else found
+
+            def cleaned(tag, rurl):
+                return clrtext(located(tag, rurl))
+
+            ans = cleaned if clean else located
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Topic: compile_reader")
+
+    def extract(self, column, soup, rurl=None):
+        """
+        runs the extraction plan of the column over the scraped soup
+
+        Args:
+            column (str): column name with an extraction plan
+            soup (bs-obj): sections of the page found with the plan divs
+            and attrs, a list if the plan is multiple
+            rurl (str, optional): root URL of the domain to complete the
+            links. Defaults to None
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict|str): clean data of the column, the plain value for
+            the plans without keys
+        """
+        try:
+            plan = self.plans[column]
+            ans = dict()
+            if plan["scalar"] is True:
+                ans = None
+
+            # the page does not have the sections
+            if soup is None:
+                return ans
+
+            for field in plan["fields"]:
+                scope = soup
+
+                if field["section"] is not None:
+                    if field["section"] >= len(soup):
+                        continue
+                    scope = soup[field["section"]]
+
+                # the tags of the field inside its section
+                if field["find"] is None:
+                    tags = [scope]
+
+                elif field["first"] is True:
+                    tags = [field["find"].select_one(scope)]
+
+                else:
+                    tags = field["find"].select(scope)
+
+                # the values in their own tags, ie.: <dt> and <dd>
+                values = tags
+                if field["pair"] is not None:
+                    values = field["pair"].select(scope)
+
+                i = 1
+                for tag, vtag in zip(tags, values):
+                    if tag is None:
+                        continue
+
+                    value = field["value"](vtag, rurl)
+
+                    if plan["scalar"] is True:
+                        ans = value
+                        continue
+
+                    key = field["key"](tag, rurl)
+
+                    # similar names get an alternate key
+                    if field["unique"] is True and key in ans:
+                        key = key + " " + str(i)
+                        i += 1
+
+                    ans[key] = value
+
+            return ans
+
         # exception handling
         except Exception as exp:
-            Err.reraise(exp, "Topic: XXXXX")
+            Err.reraise(exp, "Topic: extract")
@@ -20,20 +20,28 @@
 # =========================================
 # Standard library imports
 # =========================================
+import os
+import glob
 import time
+import json
+import html
+import codecs
+import hashlib
+import threading
 
 # =========================================
 # Third party imports
 # =========================================
 import requests
 from selenium import webdriver
-from bs4 import BeautifulSoup
 
 # =========================================
 # Local application imports
 # =========================================
 import Conf
 from Lib.Utils import Err
+from Lib.Recovery.Parser import new_soup
+from Lib.Recovery.Tokenizer import Tokenizer
 assert Conf
 assert Err
 
@@ -42,6 +50,82 @@ assert Err
 # =========================================
 DEFAULT_HTML_PARSER = "html.parser"
 
+# status code of an unchanged page after a conditional request
+NOT_MODIFIED_STATUS = 304
+
+# marker of the unchanged pages, the gallery keeps its existing data
+NOT_MODIFIED = "NOT_MODIFIED"
+
+# size of the chunks written to disk by the streaming downloads
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# size of the chunks read by the tokenizer of the streaming scrap, small
+# so the connection closes soon after the last field
+DEFAULT_FIELD_CHUNK = 8 * 1024
+
+# encoding of the pages without charset in their headers
+DEFAULT_ENCODING = "utf-8"
+
+# hash algorithm of the streamed files checksum
+DEFAULT_CHECKSUM = "sha256"
+
+# extension of the partial files of the streaming downloads, the name
+# keeps the expected length and the version of the file, ie.:
+# "paint.jpg.123456.v2231612d3122.part"
+PART_EXT = ".part"
+
+# status code of a Range request answered with part of the body
+PARTIAL_STATUS = 206
+
+# status code of a Range request after the end of the body
+RANGE_NOT_SATISFIABLE_STATUS = 416
+
+# Content-Encoding of the bodies sent as they are
+IDENTITY_ENCODING = "identity"
+
+# prefix of the version of the file in the name of the partial files, the
+# hex of its ETag or Last-Modified, and the longest one kept in the name
+PART_VERSION = "v"
+MAX_PART_VERSION = 128
+
+# connect and read seconds of the requests without a pool
+DEFAULT_TIMEOUT = (10.0, 30.0)
+
+# javascript returning the href and title of the anchors rendered since the
+# last call as JSON, the harvested anchors are marked in the page
+HARVEST_SCRIPT = """
+var found = [];
+document.querySelectorAll(arguments[0]).forEach(function(elem) {
+    if (!elem.hasAttribute("data-harvested")) {
+        elem.setAttribute("data-harvested", "1");
+        found.push({
+            "href": elem.getAttribute("href"),
+            "title": elem.getAttribute("title")
+        });
+    }
+});
+return JSON.stringify(found);
+"""
+
+# seconds between the checks of the gallery growth after a scroll step
+DEFAULT_SCROLL_POLL = 0.2
+
+# max seconds of the whole scroll, 0 is no limit
+DEFAULT_SCROLL_TIME = 900.0
+
+# javascript with the number of gallery elements in the page
+COUNT_SCRIPT = "return document.querySelectorAll(arguments[0]).length;"
+
+# javascript with the height of the page, without element selector
+HEIGHT_SCRIPT = "return document.body.scrollHeight;"
+
+# HTML of a harvested element for the BeautifulSoup object of the gallery
+HARVEST_ELEMENT = """<{div} class="{eclass}" href="{href}"{title}>
+</{div}>"""
+
+# title attribute of a harvested element, only when the element has one
+HARVEST_TITLE = ' title="{title}"'
+
 
 class Page():
     """
@@ -58,6 +142,19 @@ class Page():
     shead = None
     content = None
     dialect = DEFAULT_HTML_PARSER
+    strainer = None
+    pool = None
+    cache = None
+    validator = None
+    bandwidth = None
+    checksum = None
+    received = 0
+    part = None
+    offset = 0
+    poll = DEFAULT_SCROLL_POLL
+    maxscroll = DEFAULT_SCROLL_TIME
+    scroll_stats = None
+    browsers = None
 
     def __init__(self, *args, **kwargs):
         """
@@ -67,6 +164,22 @@ class Page():
             url (str, optional): page url to recover. Defaults is empty str
             dialect (str, optional): beautifulSoup parser dialect. Defaults
             "html.parser"
+            strainer (SoupStrainer, optional): sections of the page to
+            parse. Defaults to None, the whole page
+            pool (Pool, optional): shared connection pool for the requests.
+            Defaults to None, a new connection for each request
+            cache (Cache, optional): local response cache consulted before
+            each request. Defaults to None, no cache
+            validator (Validator, optional): ETag/Last-Modified store for the
+            conditional requests. Defaults to None, no conditions
+            bandwidth (Limiter, optional): bytes per second limit of the
+            streaming downloads. Defaults to None, no limit
+            poll (float, optional): seconds between the checks of the
+            gallery growth while it scrolls. Defaults to 0.2
+            maxscroll (float, optional): max seconds of the whole scroll, 0
+            is no limit. Defaults to 900
+            browsers (BrowserPool, optional): warm browsers for the pages
+            with javascript. Defaults to None, a new browser for each page
 
         Raises:
             exp: raise a generic exception if something goes wrong
@@ -76,10 +189,23 @@ class Page():
             # default object attributes
             self.url = str()
             self.dialect = DEFAULT_HTML_PARSER
+            self.strainer = None
             self.request = None
             self.sbody = None
             self.shead = None
             self.content = None
+            self.pool = None
+            self.cache = None
+            self.validator = None
+            self.bandwidth = None
+            self.checksum = None
+            self.received = 0
+            self.part = None
+            self.offset = 0
+            self.poll = DEFAULT_SCROLL_POLL
+            self.maxscroll = DEFAULT_SCROLL_TIME
+            self.scroll_stats = None
+            self.browsers = None
 
             # when arguments are pass as parameters
             if len(args) > 0:
@@ -101,87 +227,301 @@ class Page():
                     if key == "dialect":
                         self.dialect = kwargs.get("dialect")
 
+                    # parsing only the scraped sections
+                    if key == "strainer":
+                        self.strainer = kwargs.get("strainer")
+
+                    # sharing the connection pool between pages
+                    if key == "pool":
+                        self.pool = kwargs.get("pool")
+
+                    # sharing the response cache between pages
+                    if key == "cache":
+                        self.cache = kwargs.get("cache")
+
+                    # sharing the validators between pages
+                    if key == "validator":
+                        self.validator = kwargs.get("validator")
+
+                    # sharing the download bandwidth between pages
+                    if key == "bandwidth":
+                        self.bandwidth = kwargs.get("bandwidth")
+
+                    # updating the infinite scroll waits
+                    if key == "poll":
+                        self.poll = float(kwargs.get("poll"))
+
+                    if key == "maxscroll":
+                        self.maxscroll = float(kwargs.get("maxscroll"))
+
+                    # sharing the warm browsers between pages
+                    if key == "browsers":
+                        self.browsers = kwargs.get("browsers")
+
         # exception handling
         except Exception as exp:
             Err.reraise(exp, "Page: __init__")
 
-    def get_collection(self, gurl, stime):
+    def get_collection(self, gurl, stime, div=None, attrs=None,
+                       harvest=None, stop=None):
         """
         Gets an URL and a wait time to update the BeautifulSoup
         object in the class attribute. only works with a page with an infinite
-        scroll option
+        scroll option. with the div and attrs of the elements they are
+        harvested after each scroll step and the BeautifulSoup object only
+        has them, not the whole page
 
         Args:
             gurl (str): url of the main gallery to parse.
             stime (float): waiting time between HTML request with selenium.
+            div (str, optional): HTML tag of the gallery elements. Defaults
+            to None, parse the whole page after the scroll
+            attrs (dict, optional): attributes of the gallery elements, only
+            the "class" goes into the harvest selector. Defaults to None
+            harvest (queue.Queue, optional): queue receiving the href/title
+            dict of each new element while the gallery scrolls, it ends with
+            None or with the exception that stopped the scroll. Defaults to
+            None
+            stop (threading.Event, optional): set by the consumer of the
+            harvest to end the scroll early. Defaults to None
 
         Raises:
             exp: raise a generic exception if something goes wrong
         """
+        driver = None
+        failure = None
         try:
+            # taking a warm browser of the pool
+            if self.browsers is not None:
+                driver = self.browsers.acquire()
+
             # create the driver for the scrapping of the webpage
-            self.request = webdriver.Firefox()
-            self.request.implicitly_wait(30)
+            else:
+                driver = webdriver.Firefox()
+                driver.implicitly_wait(30)
+
+            self.request = driver
             self.request.get(gurl)
 
             # scrolling in the infinite gallery
-            self.scroll_collection(self.request, stime)
-
-            # HTML from `<html>`
-            rbody = self.request.execute_script(
-                "return document.documentElement.innerHTML;")
-
-            # HTML from `<body>`
-            rbody = self.request.execute_script(
-                "return document.body.innerHTML;")
+            if div is None:
+                self.scroll_collection(self.request, stime)
+
+                # HTML from `<body>`
+                rbody = self.request.execute_script(
+                    "return document.body.innerHTML;")
+
+            # scrolling and harvesting the new elements of each step
+            elif div is not None:
+                selector, eclass = self.get_selector(div, attrs)
+                items = self.scroll_collection(self.request, stime,
+                                               selector=selector,
+                                               harvest=harvest,
+                                               stop=stop)
+
+                # HTML with only the harvested elements
+                rbody = str().join(HARVEST_ELEMENT.format(
+                    div=div,
+                    eclass=html.escape(eclass),
+                    href=html.escape(item.get("href") or str()),
+                    title=str() if item.get("title") is None
+                    else HARVEST_TITLE.format(
+                        title=html.escape(item.get("title"))))
+                    for item in items)
 
             # Once scroll returns bs4 parsers the page_source
-            self.sbody = BeautifulSoup(rbody, self.dialect)
+            self.sbody = new_soup(rbody, self.dialect)
+
+            # giving the browser back to the pool
+            if self.browsers is not None:
+                self.browsers.release(driver)
 
             # closing driver
-            self.request.close()
+            else:
+                self.request.close()
+            driver = None
 
         # exception handling
         except Exception as exp:
+            failure = exp
             Err.reraise(exp, "Page: get_collection")
 
-    def scroll_collection(self, brdriver, stime):
+        finally:
+            # the consumers of the harvest always get the end of the gallery,
+            # or the error of an incomplete one
+            if harvest is not None:
+                harvest.put(failure)
+
+            # the pool replaces the browser of a failed page
+            if driver is not None and self.browsers is not None:
+                self.browsers.release(driver, broken=True)
+
+    def get_selector(self, div, attrs):
+        """
+        creates the CSS selector of the gallery elements with their HTML tag
+        and class
+
+        Args:
+            div (str): HTML tag of the gallery elements
+            attrs (dict): attributes of the gallery elements
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (tuple): CSS selector and class of the elements
+        """
+        try:
+            eclass = str()
+            if attrs is not None and isinstance(attrs.get("class"), str):
+                eclass = attrs.get("class")
+
+            selector = div
+            for name in eclass.split():
+                selector += "." + name
+
+            ans = (selector, eclass)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Page: get_selector")
+
+    def harvest_collection(self, brdriver, selector):
+        """
+        recovers the elements rendered since the last scroll step, the
+        javascript in the page only returns their href and title
+
+        Args:
+            brdriver (driver): selenium driver scrolling the gallery
+            selector (str): CSS selector of the gallery elements
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (list): href/title dict of each new element
+        """
+        try:
+            found = brdriver.execute_script(HARVEST_SCRIPT, selector)
+            ans = json.loads(found or "[]")
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Page: harvest_collection")
+
+    def get_progress(self, brdriver, selector=None):
+        """
+        measures how much of the gallery is rendered, the number of
+        elements with a selector or the page height without it
+
+        Args:
+            brdriver (driver): selenium driver scrolling the gallery
+            selector (str, optional): CSS selector of the gallery elements.
+            Defaults to None
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (int): number of elements or height of the page
+        """
+        try:
+            if selector is not None:
+                ans = brdriver.execute_script(COUNT_SCRIPT, selector)
+
+            else:
+                ans = brdriver.execute_script(HEIGHT_SCRIPT)
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Page: get_progress")
+
+    def scroll_collection(self, brdriver, stime, selector=None,
+                          harvest=None, stop=None):
         """
         private void function to scroll an infinte gallery of items in a web
-        page with selenium driver
+        page with selenium driver, with a selector it harvests the new
+        elements after each scroll step. after each step the gallery growth
+        is checked every poll seconds, the next step starts as soon as it
+        grows and the scroll ends when it does not grow for stime seconds,
+        after maxscroll seconds or when the stop is set
 
         Args:
             driver(driver): selenium driver created to extract de information
             (firefox, chrome, safari).
-            timeout(int): wating time for the HTTP response to return to the
-            driver and compile the information.
+            stime (float): max waiting time for new elements after each
+            scroll step.
+            selector (str, optional): CSS selector of the gallery elements.
+            Defaults to None, no harvest
+            harvest (queue.Queue, optional): queue for the new elements.
+            Defaults to None
+            stop (threading.Event, optional): ends the scroll early.
+            Defaults to None, the scroll ends by itself
 
         Raises:
             exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (list): href/title dict of the harvested elements
         """
         try:
+            ans = list()
+            start = time.monotonic()
+            rounds = 0
+            grown = True
+            if stop is None:
+                stop = threading.Event()
+
+            # elements or height before the first step
+            last = self.get_progress(brdriver, selector)
+
+            while grown and not stop.is_set():
+                # harvesting the elements rendered in the last step
+                if selector is not None:
+                    for item in self.harvest_collection(brdriver, selector):
+                        ans.append(item)
+                        if harvest is not None:
+                            harvest.put(item)
 
-            scroll_pause_time = stime
-
-            # Get scroll height
-            last_height = brdriver.execute_script(
-                "return document.body.scrollHeight")
-
-            while True:
                 # Scroll down to bottom
                 brdriver.execute_script(
                     "window.scrollTo(0, document.body.scrollHeight);")
+                rounds += 1
+
+                # polling the growth until stime or the scroll deadline
+                grown = False
+                wait = time.monotonic() + stime
+                if self.maxscroll > 0.0:
+                    wait = min(wait, start + self.maxscroll)
+
+                while not grown and time.monotonic() < wait:
+                    if stop.wait(self.poll):
+                        break
+                    current = self.get_progress(brdriver, selector)
+                    grown = current != last
+                    last = current
+
+            # the elements of the last step
+            if selector is not None:
+                for item in self.harvest_collection(brdriver, selector):
+                    ans.append(item)
+                    if harvest is not None:
+                        harvest.put(item)
+
+            # scroll progress metrics
+            elapsed = max(time.monotonic() - start, 0.001)
+            self.scroll_stats = {
+                "rounds": rounds,
+                "items": len(ans),
+                "elapsed": elapsed,
+                "rate": len(ans) / elapsed,
+            }
 
-                # Wait to load page
-                time.sleep(scroll_pause_time)
-
-                # Calculate new scroll height and compare with last one
-                new_height = brdriver.execute_script(
-                    "return document.body.scrollHeight")
-                if new_height == last_height:
-                    # If heights are the same it will exit the function
-                    break
-                last_height = new_height
+            return ans
 
         # exception handling
         except Exception as exp:
@@ -220,6 +560,87 @@ class Page():
         except Exception as exp:
             Err.reraise(exp, "Page: findin")
 
+    def get_response(self, url, stream=False, extra=None):
+        """
+        Request the URL with the shared connection pool if the page has one,
+        otherwise with a new connection. if the page has a cache it answers
+        first and saves the new 200 responses, in replay mode a missing URL
+        answers 504 without any request. with a validator the request is
+        conditional and an unchanged page answers 304 without body, or the
+        cached page if the cache has it
+
+        Args:
+            url (str): page url to recover
+            stream (bool, optional): True to read only the headers and leave
+            the body in the connection, the streamed responses are not in
+            the cache and their validators are recorded by the caller once
+            the body is read. Defaults to False
+            extra (dict, optional): additional request headers, ie.: Range.
+            Defaults to None
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (requests.Response): the page's response
+        """
+        try:
+            ans = None
+            cached = None
+
+            # looking for the response in the cache, the streamed ones are
+            # never there so they are not counted as misses
+            if self.cache is not None and stream is False:
+                cached = self.cache.load(url)
+
+            # replay mode, nothing goes to the server
+            if self.cache is not None and self.cache.replay is True:
+                ans = cached
+                if ans is None:
+                    ans = self.cache.missing(url)
+                return ans
+
+            # ETag/Last-Modified of the previous scrap
+            headers = dict()
+            if self.validator is not None:
+                headers = self.validator.conditions(url)
+
+            # without validators the cached page answers at once
+            if cached is not None and len(headers) == 0:
+                return cached
+
+            if extra is not None:
+                headers.update(extra)
+
+            # reusing the keep-alive connections of the pool
+            if self.pool is not None:
+                ans = self.pool.get(url, headers=headers, stream=stream)
+
+            # opening a new connection
+            elif self.pool is None:
+                ans = requests.get(url, headers=headers, stream=stream,
+                                   timeout=DEFAULT_TIMEOUT)
+
+            # the server says the cached page is still the same
+            if ans.status_code == NOT_MODIFIED_STATUS and cached is not None:
+                ans.close()
+                return cached
+
+            # saving the good responses for the next time
+            if ans.status_code == 200:
+                if self.cache is not None and stream is False:
+                    self.cache.save(url, ans.status_code,
+                                    ans.headers, ans.content)
+
+                if self.validator is not None and stream is False:
+                    self.validator.update(url, ans.headers)
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Page: get_response")
+
     def get_body(self, *args):
         """
         Request the URL. if succesfull returns the REST page's status code and
@@ -239,17 +660,27 @@ class Page():
 
             # requesting the page with the existing url
             if len(args) == 0:
-                self.request = requests.get(self.url)
-                self.sbody = BeautifulSoup(self.request.content, self.dialect)
+                self.request = self.get_response(self.url)
                 ans = self.request.status_code
+
+                # unchanged pages have no body to parse
+                if ans != NOT_MODIFIED_STATUS:
+                    self.sbody = new_soup(self.request.content,
+                                          self.dialect,
+                                          self.strainer)
                 self.request.close()
 
             # requesting the page with the url parameter
             elif len(args) > 0:
                 self.url = args[0]
-                self.request = requests.get(self.url)
-                self.sbody = BeautifulSoup(self.request.content, self.dialect)
+                self.request = self.get_response(self.url)
                 ans = self.request.status_code
+
+                # unchanged pages have no body to parse
+                if ans != NOT_MODIFIED_STATUS:
+                    self.sbody = new_soup(self.request.content,
+                                          self.dialect,
+                                          self.strainer)
                 self.request.close()
 
             return ans
@@ -258,6 +689,99 @@ class Page():
         except Exception as exp:
             Err.reraise(exp, "Page: get_body")
 
+    def get_fields(self, url, targets, chunk=DEFAULT_FIELD_CHUNK):
+        """
+        Request the URL reading the body one chunk at a time with the
+        tokenizer, the connection closes as soon as the first tag of every
+        target is in it, so the rest of the page is never downloaded nor
+        parsed. the BODY attribute of page() keeps only the captured tags
+        and the RECEIVED one the bytes read
+
+        Args:
+            url (str): page url to recover
+            targets (list): tuples with the HTML <div> keyword and the
+            decorative attributes of each field
+            chunk (int, optional): bytes of each chunk. Defaults to 8 KB
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (int): page's request status code (i.e: 200)
+        """
+        try:
+            self.url = url
+            self.received = 0
+            self.request = self.get_response(self.url, stream=True)
+            ans = self.request.status_code
+
+            try:
+                # unchanged pages have no body to parse
+                if ans != NOT_MODIFIED_STATUS:
+                    tokens = Tokenizer(targets=targets, dialect=self.dialect)
+                    charset = self.get_charset()
+                    decoder = codecs.getincrementaldecoder(charset)("replace")
+
+                    for data in self.request.iter_content(chunk):
+                        self.received += len(data)
+                        tokens.feed(decoder.decode(data))
+
+                        # early abort, the rest of the page is not needed
+                        if tokens.complete():
+                            break
+
+                    # the whole page is read, the open tags end with it
+                    if not tokens.complete():
+                        tokens.feed(decoder.decode(bytes(), final=True))
+                        tokens.finish()
+
+                    self.sbody = new_soup(tokens.get_markup(), self.dialect)
+
+                    if ans == 200 and self.validator is not None:
+                        self.validator.update(url, self.request.headers)
+
+            # closing the connection with the unread body
+            finally:
+                self.request.close()
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Page: get_fields")
+
+    def get_charset(self):
+        """
+        reads the charset of the Content-Type header of the request, the
+        pages without it are utf-8 as BeautifulSoup guesses them
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (str): python name of the page's encoding
+        """
+        try:
+            ans = DEFAULT_ENCODING
+            ctype = self.request.headers.get("Content-Type") or str()
+
+            for param in ctype.split(";")[1:]:
+                key, _, value = param.strip().partition("=")
+                if key.lower() == "charset" and value:
+                    value = value.strip("\"' ")
+
+                    # unknown charsets keep the default
+                    try:
+                        ans = codecs.lookup(value).name
+                    except LookupError:
+                        pass
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Page: get_charset")
+
     def get_header(self, *args):
         """
         Request the URL. if succesfull returns the REST page's status code and
@@ -278,7 +802,7 @@ class Page():
             # requesting the page with the existing url
             if len(args) == 0:
 
-                self.request = requests.get(self.url)
+                self.request = self.get_response(self.url)
                 headers = self.request.headers
                 self.shead = dict(**headers)
                 ans = self.request.status_code
@@ -288,7 +812,7 @@ class Page():
             elif len(args) > 0:
 
                 self.url = args[0]
-                self.request = requests.get(self.url)
+                self.request = self.get_response(self.url)
                 headers = self.request.headers
                 self.shead = dict(**headers)
 
@@ -327,7 +851,7 @@ class Page():
             # requesting the page with the existing url
             if len(args) == 0:
 
-                self.request = requests.get(self.url)
+                self.request = self.get_response(self.url)
                 self.content = self.request.content
                 ans = self.request.status_code
                 self.request.close()
@@ -336,7 +860,7 @@ class Page():
             elif len(args) > 0:
 
                 self.url = args[0]
-                self.request = requests.get(self.url)
+                self.request = self.get_response(self.url)
                 self.content = self.request.content
                 ans = self.request.status_code
                 self.request.close()
@@ -346,3 +870,415 @@ class Page():
         # exception handling
         except Exception as exp:
             Err.reraise(exp, "Page: get_content")
+
+    def get_stream(self, *args, part=None):
+        """
+        Request the URL reading only the headers, updates the HEAD attribute
+        of page() and leaves the body in the connection for save_stream() or
+        close_stream(), one request for the headers and the content. with
+        the partial file of an interrupted download the request asks at once
+        for the bytes after it, a 206 that does not start there is dropped
+        and the whole body is requested again
+
+        Args:
+            url (str, optional): page url to recover. Defaults to empty str.
+            part (str, optional): partial file of a previous download of the
+            URL, ie.: "paint.jpg.123456.part". Defaults to None
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (int): page's request status code (i.e: 200)
+        """
+        try:
+            # requesting the page with the url parameter
+            if len(args) > 0:
+                self.url = args[0]
+
+            self.part = None
+            self.offset = 0
+            extra = None
+
+            # the Range of the bytes missing in the part
+            if part is not None and os.path.exists(part):
+                fpath, size, version = self.read_part(part)
+                offset = os.path.getsize(part)
+
+                if size is not None and 0 < offset < size:
+                    extra = {"Range": "bytes=" + str(offset) + "-"}
+
+                    # If-Range answers the whole body of a changed file
+                    if version is not None:
+                        extra["If-Range"] = version
+
+            self.request = self.get_response(self.url,
+                                             stream=True,
+                                             extra=extra)
+            ans = self.request.status_code
+
+            if extra is not None:
+                # the part only continues with its own bytes
+                if ans == PARTIAL_STATUS:
+                    if self.get_range() == (offset, size):
+                        self.part = part
+                        self.offset = offset
+
+                    else:
+                        ans = self.restart_stream()
+
+                # the part is not there anymore for the server
+                elif ans == RANGE_NOT_SATISFIABLE_STATUS:
+                    ans = self.restart_stream()
+
+            self.shead = dict(self.request.headers)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Page: get_stream")
+
+    def is_complete(self, size, nbytes):
+        """
+        checks if the body of the get_stream() request was read whole, with
+        its expected length, or with the raw bytes of its Content-Length if
+        it is encoded. a chunked body that ends before its last chunk raises
+        while it is read
+
+        Args:
+            size (int): expected length of the file, None if it is unknown
+            nbytes (int): bytes of the file
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): True if the file is complete
+        """
+        try:
+            if size is not None:
+                ans = nbytes == size
+                return ans
+
+            # the raw bytes read from the connection, before the decoding
+            ans = True
+            length = self.request.headers.get("Content-Length", str())
+            tell = getattr(self.request.raw, "tell", None)
+
+            if length.isdigit() and tell is not None:
+                ans = tell() == int(length)
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Page: is_complete")
+
+    def restart_stream(self):
+        """
+        replaces the Range request of get_stream() with a request for the
+        whole body
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (int): page's request status code (i.e: 200)
+        """
+        try:
+            self.request.close()
+            self.part = None
+            self.offset = 0
+            self.request = self.get_response(self.url, stream=True)
+            self.shead = dict(self.request.headers)
+            ans = self.request.status_code
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Page: restart_stream")
+
+    def get_range(self):
+        """
+        reads the first byte and the total length of a 206 response, ie.:
+        "bytes 100-499/500" is (100, 500)
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (tuple): first byte and total length, None if the
+            Content-Range is missing or unknown
+        """
+        try:
+            ans = None
+            crange = self.request.headers.get("Content-Range", str())
+            unit, _, span = crange.strip().partition(" ")
+            first, _, total = span.partition("/")
+            first = first.partition("-")[0]
+
+            if unit == "bytes" and first.isdigit() and total.isdigit():
+                ans = (int(first), int(total))
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Page: get_range")
+
+    def get_length(self):
+        """
+        gets the length of the file in the get_stream() response, the total
+        of the Content-Range for a 206. the encoded bodies have no known
+        length, their Content-Length is not the size of the decoded file
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (int): bytes of the file, None if the server does not say it
+        """
+        try:
+            ans = None
+            headers = self.request.headers
+            encoding = headers.get("Content-Encoding", IDENTITY_ENCODING)
+
+            if encoding.strip().lower() != IDENTITY_ENCODING:
+                return ans
+
+            if self.request.status_code == PARTIAL_STATUS:
+                crange = self.get_range()
+                if crange is not None:
+                    ans = crange[1]
+
+            elif headers.get("Content-Length", str()).isdigit():
+                ans = int(headers.get("Content-Length"))
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Page: get_length")
+
+    def find_part(self, folder):
+        """
+        looks for the partial file of an interrupted download in the local
+        folder of the file, the newest one if there are many
+
+        Args:
+            folder (str): local folder of the file
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (str): path of the partial file, None if there is not one
+        """
+        try:
+            ans = None
+            pattern = os.path.join(glob.escape(folder), "*" + PART_EXT)
+            parts = glob.glob(pattern)
+
+            if len(parts) > 0:
+                ans = max(parts, key=os.path.getmtime)
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Page: find_part")
+
+    def name_part(self, fpath, size, version):
+        """
+        names the partial file of a download with the expected length and
+        the version of the file, so the next run can resume it before any
+        request, ie.: "paint.jpg.123456.v2231612d3122.part"
+
+        Args:
+            fpath (str): local filepath of the complete file
+            size (int): expected length, None if it is unknown
+            version (str): ETag or Last-Modified of the file, None if the
+            server does not send them
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (str): path of the partial file
+        """
+        try:
+            ans = fpath
+            if size is not None:
+                ans = ans + "." + str(size)
+
+                # versions too long for the file name are left out
+                if version is not None:
+                    tag = version.encode("utf-8").hex()
+                    if len(tag) <= MAX_PART_VERSION:
+                        ans = ans + "." + PART_VERSION + tag
+
+            ans = ans + PART_EXT
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Page: name_part")
+
+    def read_part(self, part):
+        """
+        reads the local filepath, the expected length and the version of the
+        file from the name of a partial file of name_part()
+
+        Args:
+            part (str): path of the partial file
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (tuple): filepath, expected length and version, the last two
+            are None if the name does not have them
+        """
+        try:
+            fpath = part[:len(part) - len(PART_EXT)]
+            size = None
+            version = None
+
+            head, _, tail = fpath.rpartition(".")
+            if tail.startswith(PART_VERSION):
+                tag = tail[len(PART_VERSION):]
+                try:
+                    version = bytes.fromhex(tag).decode("utf-8")
+                    fpath = head
+                    head, _, tail = fpath.rpartition(".")
+                except ValueError:
+                    version = None
+
+            if tail.isdigit():
+                fpath = head
+                size = int(tail)
+
+            # without a length there is no version either
+            else:
+                version = None
+
+            ans = (fpath, size, version)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Page: read_part")
+
+    def save_stream(self, fpath, chunk=DEFAULT_CHUNK_SIZE):
+        """
+        writes the body of the get_stream() request into a partial file in
+        the same folder one chunk at a time, computing its checksum on the
+        way, and renames it to the local file once complete, so the memory
+        stays the same for any file size. a 206 of get_stream() for the
+        partial file of the same name and version appends to it, so the
+        bytes already saved are not downloaded again, any other part starts
+        with a new request for the whole body. the checksum of a complete
+        file stays in the CHECKSUM attribute of page(), None if the body was
+        cut, and the bytes downloaded in the RECEIVED one. without a known
+        length the encoded bodies are checked with their raw bytes and the
+        chunked ones with their last chunk
+
+        Args:
+            fpath (str): local filepath to save the body
+            chunk (int, optional): bytes of each chunk. Defaults to 64 KB
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (int): size of the local file in bytes, the expected length
+            if it is complete
+        """
+        try:
+            ans = 0
+            self.received = 0
+            self.checksum = None
+            digest = hashlib.new(DEFAULT_CHECKSUM)
+
+            # expected length of the file, None if the server does not say it
+            size = self.get_length()
+            headers = self.request.headers
+            version = headers.get("ETag") or headers.get("Last-Modified")
+            part = self.name_part(fpath, size, version)
+
+            # the resumed bytes belong to another file, starting again
+            offset = 0
+            if self.request.status_code == PARTIAL_STATUS:
+                if self.part == part:
+                    offset = self.offset
+
+                elif self.restart_stream() != 200:
+                    self.request.close()
+                    return ans
+
+                else:
+                    size = self.get_length()
+                    headers = self.request.headers
+                    version = (headers.get("ETag")
+                               or headers.get("Last-Modified"))
+                    part = self.name_part(fpath, size, version)
+
+            # the checksum starts with the saved bytes
+            if offset > 0:
+                with open(part, "rb") as file:
+                    for data in iter(lambda: file.read(chunk), bytes()):
+                        digest.update(data)
+
+            ans = offset
+            try:
+                # appending to the part or starting a new one
+                mode = "ab" if offset > 0 else "wb"
+                with open(part, mode) as file:
+                    for data in self.request.iter_content(chunk):
+                        file.write(data)
+                        digest.update(data)
+                        ans += len(data)
+                        self.received += len(data)
+
+                        # waiting for the bandwidth of the chunk
+                        if self.bandwidth is not None:
+                            self.bandwidth.wait(self.url, len(data))
+
+            # the part stays in the folder for the next resume
+            finally:
+                self.request.close()
+
+            # the complete file replaces the old one at once
+            if self.is_complete(size, ans):
+                os.replace(part, fpath)
+                self.checksum = digest.hexdigest()
+
+                # the next refresh asks for it only if the file is there
+                if self.validator is not None:
+                    self.validator.update(self.url, headers, fpath)
+
+                # removing the parts of older versions of the file
+                pattern = glob.escape(fpath) + ".*" + PART_EXT
+                for old in glob.glob(pattern):
+                    os.remove(old)
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Page: save_stream")
+
+    def close_stream(self):
+        """
+        closes the get_stream() request without reading its body
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            if self.request is not None:
+                self.request.close()
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Page: close_stream")
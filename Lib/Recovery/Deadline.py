@@ -0,0 +1,290 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# =========================================
+# Standard library imports
+# =========================================
+import datetime
+import threading
+from collections import deque
+
+# =========================================
+# Third party imports
+# =========================================
+from requests.models import Response
+
+# =========================================
+# Local application imports
+# =========================================
+import Conf
+from Lib.Utils import Err
+assert Conf
+assert Err
+
+# =========================================
+# Global variables
+# =========================================
+# seconds to open the connection, to wait for each read and for the whole
+# request with its body
+DEFAULT_CONNECT = 10.0
+DEFAULT_READ = 30.0
+DEFAULT_TOTAL = 60.0
+
+# send a duplicate of the slow requests
+DEFAULT_HEDGE = False
+
+# latency quantile that marks a request as slow
+DEFAULT_QUANTILE = 0.95
+
+# number of recent latencies to compute the quantile
+DEFAULT_WINDOW = 200
+
+# min number of latencies before the first duplicate request
+DEFAULT_MIN_SAMPLES = 20
+
+# status code and body of a request over its deadline
+TIMEOUT_STATUS = 504
+TIMEOUT_BODY = b"<html></html>"
+
+
+class Deadline():
+    """
+    this module keeps the deadlines of the requests, the connect and read
+    timeouts and the total time for the request with its body, it also
+    follows the recent latencies so a request still pending past the p95
+    latency can be hedged with a duplicate and the first answer wins
+    """
+
+    # =========================================
+    # class variables
+    # =========================================
+    connect = DEFAULT_CONNECT
+    read = DEFAULT_READ
+    total = DEFAULT_TOTAL
+    hedge = DEFAULT_HEDGE
+    quantile = DEFAULT_QUANTILE
+    latencies = None
+    hedged = 0
+    timeouts = 0
+    lock = None
+
+    def __init__(self, *args, **kwargs):
+        """
+        class creator for Deadline()
+
+        Args:
+            connect (float, optional): seconds to open the connection.
+            Defaults to 10
+            read (float, optional): seconds to wait for each read. Defaults
+            to 30
+            total (float, optional): seconds for the whole request, 0 is no
+            limit. Defaults to 60
+            hedge (bool, optional): send a duplicate of the requests pending
+            past the latency quantile. Defaults to False
+            quantile (float, optional): latency quantile of the slow
+            requests. Defaults to 0.95
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+
+            # default object attributes
+            self.connect = DEFAULT_CONNECT
+            self.read = DEFAULT_READ
+            self.total = DEFAULT_TOTAL
+            self.hedge = DEFAULT_HEDGE
+            self.quantile = DEFAULT_QUANTILE
+            self.latencies = deque(maxlen=DEFAULT_WINDOW)
+            self.hedged = 0
+            self.timeouts = 0
+            self.lock = threading.Lock()
+
+            # if there are dict decrators in the creator
+            if len(kwargs) > 0:
+
+                # iterating all over the decorators
+                for key in list(kwargs.keys()):
+
+                    # updating the deadlines configuration
+                    if key == "connect":
+                        self.connect = float(kwargs.get("connect"))
+
+                    if key == "read":
+                        self.read = float(kwargs.get("read"))
+
+                    if key == "total":
+                        self.total = float(kwargs.get("total"))
+
+                    if key == "hedge":
+                        self.hedge = bool(kwargs.get("hedge"))
+
+                    if key == "quantile":
+                        self.quantile = float(kwargs.get("quantile"))
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Deadline: __init__")
+
+    def timeout(self):
+        """
+        connect and read timeouts for a requests call
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (tuple): connect and read seconds
+        """
+        try:
+            ans = (self.connect, self.read)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Deadline: timeout")
+
+    def record(self, latency):
+        """
+        saves the latency of an answered request
+
+        Args:
+            latency (float): seconds to the first byte of the response
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            with self.lock:
+                self.latencies.append(latency)
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Deadline: record")
+
+    def hedge_delay(self):
+        """
+        seconds to wait before sending a duplicate of a pending request,
+        the latency quantile of the recent requests
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (float): seconds to wait, None if there is no hedging or
+            not enough latencies yet
+        """
+        try:
+            ans = None
+
+            if self.hedge is True:
+                with self.lock:
+                    samples = sorted(self.latencies)
+
+                if len(samples) >= DEFAULT_MIN_SAMPLES:
+                    idx = int(self.quantile * (len(samples) - 1))
+                    ans = samples[idx]
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Deadline: hedge_delay")
+
+    def add_hedged(self):
+        """
+        counts a duplicate request sent for a slow one
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            with self.lock:
+                self.hedged += 1
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Deadline: add_hedged")
+
+    def add_timeout(self):
+        """
+        counts a request that went over its deadline
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            with self.lock:
+                self.timeouts += 1
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Deadline: add_timeout")
+
+    def stats(self):
+        """
+        reports the requests hedged and the ones over their deadline
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): hedged and timeouts
+        """
+        try:
+            with self.lock:
+                ans = {
+                    "hedged": self.hedged,
+                    "timeouts": self.timeouts,
+                }
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Deadline: stats")
+
+    def expired(self, url, spent=0.0):
+        """
+        creates the answer of a request over its deadline, the pages take
+        it as any failed request
+
+        Args:
+            url (str): URL of the request
+            spent (float, optional): seconds spent in the request. Defaults
+            to 0.0
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (requests.Response): empty page with the 504 status
+        """
+        try:
+            self.add_timeout()
+            ans = Response()
+            ans.url = url
+            ans.status_code = TIMEOUT_STATUS
+            ans.elapsed = datetime.timedelta(seconds=spent)
+            ans._content = TIMEOUT_BODY
+            ans._content_consumed = True
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Deadline: expired")
@@ -0,0 +1,229 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# =========================================
+# Standard library imports
+# =========================================
+import time
+import asyncio
+import threading
+from urllib.parse import urlparse
+
+# =========================================
+# Local application imports
+# =========================================
+import Conf
+from Lib.Utils import Err
+assert Conf
+assert Err
+
+# =========================================
+# Global variables
+# =========================================
+# default requests per second allowed for each host, one each 3 seconds
+DEFAULT_RATE = 1.0 / 3.0
+
+# default number of requests a host can receive at once after a pause
+DEFAULT_BURST = 1.0
+
+
+class Limiter():
+    """
+    this module implements a token-bucket rate limiter with one bucket for
+    each host, every request takes a token and the tokens refill at a fixed
+    rate, so the requests go as fast as the host allows instead of waiting
+    a fixed time after each one
+    """
+
+    # =========================================
+    # class variables
+    # =========================================
+    rate = DEFAULT_RATE
+    burst = DEFAULT_BURST
+    buckets = dict()
+    lock = None
+
+    def __init__(self, *args, **kwargs):
+        """
+        class creator for Limiter()
+
+        Args:
+            rate (float, optional): tokens per second for each host. Defaults
+            to 1/3, one request each 3 seconds
+            burst (float, optional): max tokens a host can accumulate.
+            Defaults to 1.0
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+
+            # default object attributes
+            self.rate = DEFAULT_RATE
+            self.burst = DEFAULT_BURST
+            self.buckets = dict()
+            self.lock = threading.Lock()
+
+            # if there are dict decrators in the creator
+            if len(kwargs) > 0:
+
+                # iterating all over the decorators
+                for key in list(kwargs.keys()):
+
+                    # updating the bucket configuration
+                    if key == "rate":
+                        self.rate = float(kwargs.get("rate"))
+
+                    if key == "burst":
+                        self.burst = max(1.0, float(kwargs.get("burst")))
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Limiter: __init__")
+
+    def reserve(self, url, tokens=1.0):
+        """
+        takes the tokens from the bucket of the url's host, if the bucket is
+        empty the tokens are borrowed from the future and the answer is the
+        time to wait for them
+
+        Args:
+            url (str): url of the next request
+            tokens (float, optional): tokens to take, ie.: the bytes of a
+            bandwidth limit. Defaults to 1.0, one request
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (float): seconds to wait before the request
+        """
+        try:
+            # default answer, no waiting time
+            ans = 0.0
+
+            # unlimited rate
+            if self.rate <= 0.0:
+                return ans
+
+            host = urlparse(url).netloc
+
+            with self.lock:
+                now = time.monotonic()
+
+                # new hosts start with a full bucket
+                left, last = self.buckets.get(host, (self.burst, now))
+
+                # refilling the bucket since the last request
+                left = min(self.burst, left + (now - last) * self.rate)
+
+                # taking the tokens, negative tokens are future reservations
+                left = left - tokens
+                self.buckets[host] = (left, now)
+
+            if left < 0.0:
+                ans = -left / self.rate
+
+            # returning answer
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Limiter: reserve")
+
+    def take(self, url, tokens=1.0):
+        """
+        takes the tokens from the bucket of the url's host only if they are
+        already there, without borrowing them from the future
+
+        Args:
+            url (str): url of the next request
+            tokens (float, optional): tokens to take. Defaults to 1.0
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): True if the request can go now, False if the host
+            has no tokens left
+        """
+        try:
+            # unlimited rate
+            ans = True
+            if self.rate <= 0.0:
+                return ans
+
+            host = urlparse(url).netloc
+
+            with self.lock:
+                now = time.monotonic()
+                left, last = self.buckets.get(host, (self.burst, now))
+                left = min(self.burst, left + (now - last) * self.rate)
+
+                # the tokens are only taken if they are there
+                ans = left >= tokens
+                if ans is True:
+                    left = left - tokens
+                self.buckets[host] = (left, now)
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Limiter: take")
+
+    def wait(self, url, tokens=1.0):
+        """
+        blocks the thread until the host of the url allows a new request
+
+        Args:
+            url (str): url of the next request
+            tokens (float, optional): tokens to take. Defaults to 1.0
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            delay = self.reserve(url, tokens)
+            if delay > 0.0:
+                time.sleep(delay)
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Limiter: wait")
+
+    async def await_token(self, url):
+        """
+        asyncio version of wait(), waits for the host of the url without
+        blocking the event loop
+
+        Args:
+            url (str): url of the next request
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            delay = self.reserve(url)
+            if delay > 0.0:
+                await asyncio.sleep(delay)
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Limiter: await_token")
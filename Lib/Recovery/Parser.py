@@ -0,0 +1,229 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# =========================================
+# Third party imports
+# =========================================
+from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
+from bs4.builder import builder_registry
+
+# html5-parser is only needed by its own parser backend
+try:
+    import html5_parser
+except ImportError:
+    html5_parser = None
+
+# =========================================
+# Local application imports
+# =========================================
+import Conf
+from Lib.Utils import Err
+assert Conf
+assert Err
+
+# =========================================
+# Global variables
+# =========================================
+DEFAULT_HTML_PARSER = "html.parser"
+
+# C parser of the html5-parser package, it builds a BeautifulSoup tree too
+HTML5_PARSER = "html5-parser"
+
+# parser backends of the pages, the pure python one first
+PARSER_BACKENDS = ("html.parser", "lxml", "html5lib", HTML5_PARSER)
+
+# backends that parse only the strained subtrees, the others parse all
+STRAINER_BACKENDS = ("html.parser", "lxml")
+
+
+def available(dialect):
+    """
+    checks if the library of the parser backend is installed
+
+    Args:
+        dialect (str): parser backend, ie.: "lxml"
+
+    Raises:
+        exp: raise a generic exception if something goes wrong
+
+    Returns:
+        ans (bool): True if the backend can parse the pages
+    """
+    try:
+        ans = False
+
+        if dialect == HTML5_PARSER:
+            ans = html5_parser is not None
+
+        # the BeautifulSoup tree builders of the installed libraries
+        elif dialect is not None:
+            ans = builder_registry.lookup(dialect) is not None
+
+        return ans
+
+    # exception handling
+    except Exception as exp:
+        Err.reraise(exp, "Parser: available")
+
+
+def get_dialect(dialect):
+    """
+    chooses the parser backend of the pages, the pure python parser
+    replaces the backends without their library
+
+    Args:
+        dialect (str): configured parser backend, ie.: "lxml"
+
+    Raises:
+        exp: raise a generic exception if something goes wrong
+
+    Returns:
+        ans (str): the installed parser backend
+    """
+    try:
+        ans = DEFAULT_HTML_PARSER
+
+        if available(dialect):
+            ans = dialect
+
+        return ans
+
+    # exception handling
+    except Exception as exp:
+        Err.reraise(exp, "Parser: get_dialect")
+
+
+class AnyStrainer(SoupStrainer):
+    """
+    SoupStrainer of several sections, a tag is kept with all its children
+    if it matches any of the strainers of the sections, each one with its
+    own name and attributes
+    """
+
+    def __init__(self, names, strainers):
+        """
+        creates the filter of the sections with their strainers
+
+        Args:
+            names (list): HTML <div> keywords of the sections
+            strainers (list): SoupStrainer of each section
+        """
+        super().__init__(names)
+        self.strainers = list(strainers)
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        """
+        checks if any section keeps the tag while the page is parsed
+        """
+        return any(strainer.allow_tag_creation(nsprefix, name, attrs)
+                   for strainer in self.strainers)
+
+    def allow_string_creation(self, string):
+        """
+        the texts outside the sections are skipped
+        """
+        return False
+
+    def match(self, element, _known_rules=False):
+        """
+        checks if any section matches the parsed element
+        """
+        return any(strainer.match(element) for strainer in self.strainers)
+
+
+def new_strainer(targets):
+    """
+    creates the SoupStrainer of the scraped sections of a page, a tag is
+    kept with all its children if it has the name and the attributes of
+    any of the targets
+
+    Args:
+        targets (list): tuples with the HTML <div> keyword and the
+        decorative attributes of each section, ie.: [("dl", {"class":
+        "definition-list"})]
+
+    Raises:
+        exp: raise a generic exception if something goes wrong
+
+    Returns:
+        ans (SoupStrainer): filter of the sections, None without targets
+    """
+    try:
+        ans = None
+        names = list()
+        strainers = list()
+        seen = list()
+
+        # one strainer per section, merging their attributes keeps others
+        for div, attrs in targets or list():
+            target = (div, attrs or dict())
+            if target not in seen:
+                seen.append(target)
+                if div not in names:
+                    names.append(div)
+                strainers.append(SoupStrainer(div, attrs=target[1]))
+
+        if len(strainers) == 1:
+            ans = strainers[0]
+
+        elif len(strainers) > 1:
+            ans = AnyStrainer(names, strainers)
+
+        return ans
+
+    # exception handling
+    except Exception as exp:
+        Err.reraise(exp, "Parser: new_strainer")
+
+
+def new_soup(body, dialect=DEFAULT_HTML_PARSER, strainer=None):
+    """
+    parses the page with the parser backend into a BeautifulSoup object,
+    so the scrap works the same with all of them
+
+    Args:
+        body (bytes|str): HTML of the page
+        dialect (str, optional): parser backend. Defaults to "html.parser"
+        strainer (SoupStrainer, optional): sections to parse, the rest of
+        the page is skipped. Defaults to None, the whole page
+
+    Raises:
+        exp: raise a generic exception if something goes wrong
+
+    Returns:
+        ans (bs-obj): the parsed page
+    """
+    try:
+        ans = None
+
+        if dialect == HTML5_PARSER:
+            ans = html5_parser.parse(body, treebuilder="soup")
+
+        elif strainer is not None and dialect in STRAINER_BACKENDS:
+            ans = BeautifulSoup(body, dialect, parse_only=strainer)
+
+        else:
+            ans = BeautifulSoup(body, dialect)
+
+        return ans
+
+    # exception handling
+    except Exception as exp:
+        Err.reraise(exp, "Parser: new_soup")
@@ -0,0 +1,622 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# =========================================
+# Standard library imports
+# =========================================
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import wait
+
+# =========================================
+# Third party imports
+# =========================================
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# =========================================
+# Local application imports
+# =========================================
+import Conf
+from Lib.Utils import Err
+from Lib.Recovery.Throttle import retry_seconds
+from Lib.Recovery.Deadline import TIMEOUT_STATUS
+assert Conf
+assert Err
+
+# =========================================
+# Global variables
+# =========================================
+# number of different hosts with a connection pool
+DEFAULT_POOL_HOSTS = 4
+
+# number of keep-alive connections saved for each host
+DEFAULT_POOL_SIZE = 10
+
+# number of retries for failed connections and server errors
+DEFAULT_MAX_RETRIES = 3
+
+# backoff factor between retries, ie.: 0.5, 1.0, 2.0 seconds
+DEFAULT_BACKOFF = 0.5
+
+# HTTP status codes that are worth retrying
+DEFAULT_RETRY_STATUS = (500, 502, 504)
+
+# keep the TCP+TLS connections open between requests
+DEFAULT_KEEP_ALIVE = True
+
+# wait for a free connection instead of opening one over the pool size
+DEFAULT_POOL_BLOCK = False
+
+# HTTP status codes of an overloaded server, retried after its Retry-After
+OVERLOAD_STATUS = (429, 503)
+
+# size of the chunks read inside the total deadline
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class Pool():
+    """
+    this module keeps a shared HTTP session with a pool of keep-alive
+    connections per host, so all the Page() requests reuse them instead of
+    opening a new TCP+TLS handshake for each URL
+    """
+
+    # =========================================
+    # class variables
+    # =========================================
+    session = None
+    hosts = DEFAULT_POOL_HOSTS
+    poolsize = DEFAULT_POOL_SIZE
+    retries = DEFAULT_MAX_RETRIES
+    backoff = DEFAULT_BACKOFF
+    keepalive = DEFAULT_KEEP_ALIVE
+    block = DEFAULT_POOL_BLOCK
+    limiter = None
+    throttle = None
+    deadline = None
+    hedger = None
+
+    def __init__(self, *args, **kwargs):
+        """
+        class creator for Pool()
+
+        Args:
+            hosts (int, optional): number of hosts with a connection pool.
+            Defaults to 4
+            poolsize (int, optional): keep-alive connections per host.
+            Defaults to 10
+            retries (int, optional): retries for failed requests. Defaults
+            to 3
+            backoff (float, optional): backoff factor between retries.
+            Defaults to 0.5
+            keepalive (bool, optional): keep the connections open between
+            requests. Defaults to True
+            block (bool, optional): True to cap the connections per host at
+            the pool size, the requests wait for a free one. Defaults to
+            False
+            limiter (Limiter, optional): rate limiter to call before each
+            request. Defaults to None, no limit
+            throttle (Throttle, optional): adaptive concurrency control for
+            the in-flight requests. Defaults to None, no control
+            deadline (Deadline, optional): connect, read and total deadlines
+            of the requests and their hedging. Defaults to None, no limit
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+
+            # default object attributes
+            self.session = None
+            self.hosts = DEFAULT_POOL_HOSTS
+            self.poolsize = DEFAULT_POOL_SIZE
+            self.retries = DEFAULT_MAX_RETRIES
+            self.backoff = DEFAULT_BACKOFF
+            self.keepalive = DEFAULT_KEEP_ALIVE
+            self.block = DEFAULT_POOL_BLOCK
+            self.limiter = None
+            self.throttle = None
+            self.deadline = None
+            self.hedger = None
+
+            # if there are dict decrators in the creator
+            if len(kwargs) > 0:
+
+                # iterating all over the decorators
+                for key in list(kwargs.keys()):
+
+                    # updating the pool configuration
+                    if key == "hosts":
+                        self.hosts = int(kwargs.get("hosts"))
+
+                    if key == "poolsize":
+                        self.poolsize = int(kwargs.get("poolsize"))
+
+                    if key == "retries":
+                        self.retries = int(kwargs.get("retries"))
+
+                    if key == "backoff":
+                        self.backoff = float(kwargs.get("backoff"))
+
+                    if key == "keepalive":
+                        self.keepalive = bool(kwargs.get("keepalive"))
+
+                    if key == "block":
+                        self.block = bool(kwargs.get("block"))
+
+                    if key == "limiter":
+                        self.limiter = kwargs.get("limiter")
+
+                    if key == "throttle":
+                        self.throttle = kwargs.get("throttle")
+
+                    if key == "deadline":
+                        self.deadline = kwargs.get("deadline")
+
+            # creating the shared session
+            self.session = self.new_session()
+
+            # the workers of the duplicate requests
+            if self.deadline is not None and self.deadline.hedge is True:
+                self.hedger = ThreadPoolExecutor(max_workers=self.poolsize)
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Pool: __init__")
+
+    def new_session(self):
+        """
+        creates a requests session with the pool and retry configuration
+        mounted for HTTP and HTTPS
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (requests.Session): configured session
+        """
+        try:
+            ans = requests.Session()
+
+            # a read timeout is over the deadline, it is not retried
+            reads = None
+            if self.deadline is not None:
+                reads = 0
+
+            # retry policy for the connection and the server errors, the
+            # 429/503 answers go back to get() so the throttle sees them
+            retry = Retry(total=self.retries,
+                          read=reads,
+                          backoff_factor=self.backoff,
+                          status_forcelist=DEFAULT_RETRY_STATUS,
+                          allowed_methods=("GET", "HEAD"),
+                          respect_retry_after_header=False,
+                          raise_on_status=False)
+
+            # connection pool per host
+            adapter = HTTPAdapter(pool_connections=self.hosts,
+                                  pool_maxsize=self.poolsize,
+                                  pool_block=self.block,
+                                  max_retries=retry)
+
+            ans.mount("http://", adapter)
+            ans.mount("https://", adapter)
+
+            # closing the connection after each request if asked
+            if self.keepalive is False:
+                ans.headers.update({"Connection": "close"})
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Pool: new_session")
+
+    def get(self, url, **kwargs):
+        """
+        Request the URL with one of the pooled connections, waiting first
+        for the rate limiter of the host and the concurrency throttle if the
+        pool has them. 429/503 answers are retried once the server's
+        Retry-After time is over, the throttle pauses all the requests for
+        it or, without throttle, the request waits for it
+
+        Args:
+            url (str): page url to recover
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (requests.Response): the page's response
+        """
+        try:
+            ans = None
+            attempts = 0
+
+            while ans is None or (ans.status_code in OVERLOAD_STATUS
+                                  and attempts <= self.retries):
+                # waiting for the host token
+                if self.limiter is not None:
+                    self.limiter.wait(url)
+
+                # without throttle the request goes straight away
+                if self.throttle is None:
+                    ans = self.send(url, **kwargs)
+                    attempts += 1
+
+                    # waiting as the overloaded server asks
+                    if (ans.status_code in OVERLOAD_STATUS
+                            and attempts <= self.retries):
+                        retry = ans.headers.get("Retry-After")
+                        ans.close()
+                        time.sleep(self.overload_wait(retry, attempts))
+                    continue
+
+                # waiting for an in-flight slot
+                self.throttle.acquire()
+                ans = None
+                try:
+                    ans = self.send(url, **kwargs)
+
+                # the slot is free even if the request fails
+                finally:
+                    status, latency, retry = None, None, None
+                    if ans is not None:
+                        status = ans.status_code
+                        latency = ans.elapsed.total_seconds()
+                        retry = ans.headers.get("Retry-After")
+                    self.throttle.release(status, latency, retry)
+                attempts += 1
+
+                # the retried answer frees its connection, ie.: a streamed one
+                if (ans.status_code in OVERLOAD_STATUS
+                        and attempts <= self.retries):
+                    ans.close()
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Pool: get")
+
+    def overload_wait(self, retry, attempts):
+        """
+        seconds to wait before retrying a 429/503 answer without throttle,
+        the Retry-After of the server or the backoff of the attempt
+
+        Args:
+            retry (str): Retry-After header of the response, None if the
+            server did not send it
+            attempts (int): requests already sent for the URL
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (float): seconds to wait
+        """
+        try:
+            ans = self.backoff * (2 ** (attempts - 1))
+
+            if retry is not None:
+                ans = retry_seconds(retry)
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Pool: overload_wait")
+
+    def send(self, url, **kwargs):
+        """
+        sends the request within its deadlines, if hedging is on and the
+        request is still pending past the recent p95 latency since it
+        started, a duplicate is sent if the rate limiter and the throttle
+        allow it now. the first good answer wins and the other one is
+        discarded
+
+        Args:
+            url (str): page url to recover
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (requests.Response): the page's response, 504 if it went
+            over its deadline
+        """
+        try:
+            # no deadlines, the plain request
+            if self.deadline is None:
+                return self.session.get(url, **kwargs)
+
+            # the streamed bodies are read by the caller, no hedging
+            delay = self.deadline.hedge_delay()
+            if delay is None or kwargs.get("stream") is True:
+                return self.request(url, **kwargs)
+
+            # the pool is closed, no more duplicates
+            if self.hedger is None:
+                return self.request(url, **kwargs)
+
+            # the delay counts from the start of the request, not from its
+            # time in the queue of the hedger
+            started = threading.Event()
+
+            def first_request():
+                started.set()
+                return self.request(url, **kwargs)
+
+            first = self.hedger.submit(first_request)
+            started.wait()
+            done, pending = wait([first], timeout=delay)
+
+            # slow request, sending the duplicate if the host allows it
+            if len(done) == 0 and self.allow_hedge(url):
+                self.deadline.add_hedged()
+                second = self.hedger.submit(self.request, url, **kwargs)
+
+                # the duplicate frees its throttle slot with its answer
+                if self.throttle is not None:
+                    second.add_done_callback(self.release_hedge)
+
+                futures = [first, second]
+                done, pending = wait(futures, return_when=FIRST_COMPLETED)
+
+                # an error or a timeout waits for the other answer
+                if not any(self.answered(f) for f in done):
+                    if len(pending) > 0:
+                        wait(pending)
+
+                ans = self.pick(futures)
+
+                # the late answer frees its connection
+                for late in futures:
+                    if late is not ans:
+                        late.add_done_callback(self.discard)
+
+                return ans.result()
+
+            ans = first.result()
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Pool: send")
+
+    def allow_hedge(self, url):
+        """
+        checks if a duplicate request can go now with the rate limiter and
+        the throttle of the pool, a duplicate never waits for them
+
+        Args:
+            url (str): page url to recover
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): True if the duplicate can be sent, its throttle slot
+            is already taken
+        """
+        try:
+            ans = True
+
+            if self.throttle is not None:
+                ans = self.throttle.acquire_now()
+
+            # without a token the slot goes back untouched
+            if ans is True and self.limiter is not None:
+                ans = self.limiter.take(url)
+                if ans is False and self.throttle is not None:
+                    self.throttle.giveback()
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Pool: allow_hedge")
+
+    def release_hedge(self, future):
+        """
+        frees the throttle slot of a duplicate request with its answer
+
+        Args:
+            future (Future): the duplicate request
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            status, latency, retry = None, None, None
+
+            if future.exception() is None:
+                response = future.result()
+                status = response.status_code
+                latency = response.elapsed.total_seconds()
+                retry = response.headers.get("Retry-After")
+
+            self.throttle.release(status, latency, retry)
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Pool: release_hedge")
+
+    def answered(self, future):
+        """
+        checks if a finished request has a real answer, not an error nor the
+        504 of its deadline
+
+        Args:
+            future (Future): the finished request
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): True if the server answered
+        """
+        try:
+            ans = future.exception() is None
+            if ans is True:
+                ans = future.result().status_code != TIMEOUT_STATUS
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Pool: answered")
+
+    def pick(self, futures):
+        """
+        chooses the answer of the hedged requests, the first finished one
+        with a real answer, otherwise the first finished one
+
+        Args:
+            futures (list): the request and its duplicate
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (Future): the winning request
+        """
+        try:
+            finished = [f for f in futures if f.done()]
+            good = [f for f in finished if self.answered(f)]
+            ans = (good or finished)[0]
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Pool: pick")
+
+    def request(self, url, **kwargs):
+        """
+        one request with the connect and read timeouts of the deadline, the
+        body is read in chunks so the whole request stays in the total
+        deadline, a timeout answers 504 instead of stopping the scrap, the
+        connection and DNS errors are raised as without deadline
+
+        Args:
+            url (str): page url to recover
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (requests.Response): the page's response, 504 if it went
+            over its deadline
+        """
+        try:
+            start = time.monotonic()
+            stream = kwargs.pop("stream", False)
+            kwargs.setdefault("timeout", self.deadline.timeout())
+
+            try:
+                ans = self.session.get(url, stream=True, **kwargs)
+                self.deadline.record(ans.elapsed.total_seconds())
+
+                # reading the body before the total deadline, read1() answers
+                # with the bytes already received instead of a full chunk
+                if stream is False:
+                    body = list()
+                    chunks = ans.iter_content(DEFAULT_CHUNK_SIZE)
+                    if hasattr(ans.raw, "read1"):
+                        chunks = iter(lambda: ans.raw.read1(
+                            DEFAULT_CHUNK_SIZE, decode_content=True), bytes())
+
+                    for data in chunks:
+                        body.append(data)
+                        spent = time.monotonic() - start
+                        if 0.0 < self.deadline.total < spent:
+                            ans.close()
+                            return self.deadline.expired(url, spent)
+
+                    ans._content = bytes().join(body)
+                    ans._content_consumed = True
+
+            # a stalled connection or a read timeout inside the body
+            except (requests.exceptions.Timeout,
+                    urllib3.exceptions.TimeoutError):
+                spent = time.monotonic() - start
+                ans = self.deadline.expired(url, spent)
+
+            # requests wraps the read timeouts as connection errors, ie.:
+            # the MaxRetryError of a read timeout or iter_content()
+            except requests.exceptions.ConnectionError as exp:
+                reason = exp.args[0] if len(exp.args) > 0 else None
+                reason = getattr(reason, "reason", reason)
+                timeout = isinstance(reason, urllib3.exceptions.TimeoutError)
+
+                # the refused connections and DNS errors are not timeouts
+                # even if urllib3 makes them a ConnectTimeoutError
+                if isinstance(reason, urllib3.exceptions.NewConnectionError):
+                    timeout = False
+
+                if timeout is False:
+                    raise
+
+                spent = time.monotonic() - start
+                ans = self.deadline.expired(url, spent)
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Pool: request")
+
+    def discard(self, future):
+        """
+        closes the response of a hedged request that lost the race
+
+        Args:
+            future (Future): the late request
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            if future.exception() is None:
+                future.result().close()
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Pool: discard")
+
+    def close(self):
+        """
+        closes all the connections kept alive in the pool
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            self.session.close()
+            if self.hedger is not None:
+                self.hedger.shutdown(wait=False)
+                self.hedger = None
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Pool: close")
@@ -0,0 +1,428 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# =========================================
+# Standard library imports
+# =========================================
+import os
+import re
+import gzip
+import json
+import threading
+from urllib.parse import urlsplit
+from xml.etree import ElementTree
+
+# =========================================
+# Third party imports
+# =========================================
+import requests
+
+# =========================================
+# Local application imports
+# =========================================
+import Conf
+from Lib.Utils import Err
+assert Conf
+assert Err
+
+# =========================================
+# Global variables
+# =========================================
+# root sitemap of the museum site
+DEFAULT_SITEMAP_URL = "https://www.vangoghmuseum.nl/sitemap.xml"
+
+# path of the collection URLs inside the sitemaps
+DEFAULT_PATTERN = "^/en/collection/"
+
+# local file with the lastmod of the collection URLs
+DEFAULT_LASTMOD_FILE = os.path.join("Data", "sitemap.json")
+
+# skip the unchanged works, only for the refresh of a complete gallery
+DEFAULT_INCREMENTAL = False
+
+# stage of the scraps without one
+DEFAULT_STAGE = "default"
+
+# connect and read seconds of the requests without a pool
+DEFAULT_TIMEOUT = (10.0, 30.0)
+
+# extension and content types of the compressed sitemaps
+GZIP_EXT = ".gz"
+GZIP_TYPES = ("application/gzip", "application/x-gzip")
+
+
+class Sitemap():
+    """
+    this module discovers the collection URLs in the sitemap XML files of
+    the site, the files are parsed as a stream so a large sitemap never
+    loads into memory, it also keeps the lastmod of each URL in a local
+    JSON file so an incremental scrap only requests the changed works. the
+    lastmod is recorded for each stage once the stage scraps the work, a
+    work that failed or a stage that never ran is requested again
+    """
+
+    # =========================================
+    # class variables
+    # =========================================
+    url = DEFAULT_SITEMAP_URL
+    pattern = None
+    fpath = DEFAULT_LASTMOD_FILE
+    incremental = DEFAULT_INCREMENTAL
+    pool = None
+    stage = DEFAULT_STAGE
+    current = dict()
+    known = dict()
+    fresh = dict()
+    scanned = False
+    lock = None
+    slock = None
+
+    def __init__(self, *args, **kwargs):
+        """
+        class creator for Sitemap(), it loads the lastmod saved by the
+        previous scraps
+
+        Args:
+            url (str, optional): root sitemap or sitemap index. Defaults to
+            the museum sitemap
+            pattern (str, optional): regex of the collection URL paths.
+            Defaults to "^/en/collection/"
+            fpath (str, optional): local JSON file with the lastmod.
+            Defaults to "Data/sitemap.json"
+            incremental (bool, optional): answer the unchanged works without
+            request. Defaults to False, only records the lastmod
+            pool (Pool, optional): shared connection pool for the sitemap
+            requests. Defaults to None
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+
+            # default object attributes
+            self.url = DEFAULT_SITEMAP_URL
+            self.pattern = re.compile(DEFAULT_PATTERN)
+            self.fpath = DEFAULT_LASTMOD_FILE
+            self.incremental = DEFAULT_INCREMENTAL
+            self.pool = None
+            self.stage = DEFAULT_STAGE
+            self.current = dict()
+            self.known = dict()
+            self.fresh = dict()
+            self.scanned = False
+            self.lock = threading.Lock()
+            self.slock = threading.Lock()
+
+            # if there are dict decrators in the creator
+            if len(kwargs) > 0:
+
+                # iterating all over the decorators
+                for key in list(kwargs.keys()):
+
+                    # updating the sitemap configuration
+                    if key == "url":
+                        self.url = kwargs.get("url")
+
+                    if key == "pattern":
+                        self.pattern = re.compile(kwargs.get("pattern"))
+
+                    if key == "fpath":
+                        self.fpath = kwargs.get("fpath")
+
+                    if key == "incremental":
+                        self.incremental = bool(kwargs.get("incremental"))
+
+                    if key == "pool":
+                        self.pool = kwargs.get("pool")
+
+            # loading the lastmod of the previous scraps
+            if os.path.exists(self.fpath):
+                with open(self.fpath, "r", encoding="utf-8") as file:
+                    known = json.load(file)
+
+                # the lastmod without stage is not trusted, ie.: the files
+                # of the older versions
+                for stage, paths in known.items():
+                    if isinstance(paths, dict):
+                        self.known[stage] = paths
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Sitemap: __init__")
+
+    def open(self, smurl):
+        """
+        requests a sitemap file without reading its body
+
+        Args:
+            smurl (str): URL of the sitemap file
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (requests.Response): the streamed response, None if the
+            sitemap does not answer 200
+        """
+        try:
+            ans = None
+
+            if self.pool is not None:
+                response = self.pool.get(smurl, stream=True)
+
+            else:
+                response = requests.get(smurl, stream=True,
+                                        timeout=DEFAULT_TIMEOUT)
+
+            if response.status_code == 200:
+                ans = response
+
+            else:
+                response.close()
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Sitemap: open")
+
+    def parse(self, response):
+        """
+        parses a streamed sitemap file element by element, the processed
+        elements are cleared so only one is in memory at a time
+
+        Args:
+            response (requests.Response): the streamed sitemap file
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (generator): tuples with the kind of entry ("sitemap" or
+            "url"), the location, the lastmod and the image title
+        """
+        try:
+            response.raw.decode_content = True
+            source = response.raw
+
+            # the compressed files, not the gzip transfer encoding
+            ctype = response.headers.get("Content-Type", str())
+            if (urlsplit(response.url).path.endswith(GZIP_EXT)
+                    or ctype.split(";")[0].strip() in GZIP_TYPES):
+                source = gzip.GzipFile(fileobj=response.raw)
+
+            root = None
+            for event, elem in ElementTree.iterparse(source,
+                                                     ("start", "end")):
+                if root is None:
+                    root = elem
+
+                # the entries end with all their children
+                kind = elem.tag.rsplit("}", 1)[-1]
+                if event != "end" or kind not in ("sitemap", "url"):
+                    continue
+
+                loc, lastmod, title = None, None, None
+                for child in elem:
+                    ctag = child.tag.rsplit("}", 1)[-1]
+
+                    if ctag == "loc":
+                        loc = (child.text or str()).strip()
+
+                    elif ctag == "lastmod":
+                        lastmod = (child.text or str()).strip()
+
+                    # image sitemap extension with the work title
+                    elif ctag == "image" and title is None:
+                        for ichild in child:
+                            if ichild.tag.rsplit("}", 1)[-1] == "title":
+                                title = (ichild.text or str()).strip()
+
+                # freeing the processed entries
+                elem.clear()
+                root.clear()
+
+                if loc:
+                    yield (kind, loc, lastmod, title)
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Sitemap: parse")
+
+    def iterurls(self, url=None):
+        """
+        discovers the collection URLs of the sitemap and the sitemaps of
+        its index, it keeps the current lastmod of each URL
+
+        Args:
+            url (str, optional): root sitemap. Defaults to the configured one
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (generator): tuples with the collection URL, its lastmod and
+            its image title, None if the sitemap does not have them
+        """
+        try:
+            pending = [url or self.url]
+            seen = set()
+
+            while len(pending) > 0:
+                smurl = pending.pop(0)
+                if smurl in seen:
+                    continue
+                seen.add(smurl)
+
+                response = self.open(smurl)
+                if response is None:
+                    continue
+
+                try:
+                    for kind, loc, lastmod, title in self.parse(response):
+
+                        # nested sitemaps of the index
+                        if kind == "sitemap":
+                            pending.append(loc)
+                            continue
+
+                        path = urlsplit(loc).path
+                        if self.pattern.search(path):
+                            with self.lock:
+                                self.current[path] = lastmod
+                            yield (loc, lastmod, title)
+
+                finally:
+                    response.close()
+
+            self.scanned = True
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Sitemap: iterurls")
+
+    def use(self, stage):
+        """
+        sets the stage of the next scraps, ie.: the name of the scrap
+        function of the column
+
+        Args:
+            stage (str): name of the stage
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            with self.lock:
+                self.stage = str(stage)
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Sitemap: use")
+
+    def update(self, url):
+        """
+        records the current lastmod of a work the stage scraped, it is
+        used after save() so the stages of the same scrap are not skipped
+
+        Args:
+            url (str): collection URL of the work
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            path = urlsplit(url.strip()).path
+
+            with self.lock:
+                lastmod = self.current.get(path)
+                if lastmod is not None:
+                    paths = self.fresh.setdefault(self.stage, dict())
+                    paths[path] = lastmod
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Sitemap: update")
+
+    def unchanged(self, url):
+        """
+        checks if the work did not change since the last scrap, the first
+        call reads the sitemap if the index was not created with it
+
+        Args:
+            url (str): collection URL of the work
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): True if the lastmod is the same of the last scrap
+            of the stage, always False out of the incremental mode
+        """
+        try:
+            ans = False
+
+            if self.incremental is False:
+                return ans
+
+            # reading the current lastmod only once, the others wait for it
+            if self.scanned is False:
+                with self.slock:
+                    if self.scanned is False:
+                        for entry in self.iterurls():
+                            pass
+
+            path = urlsplit(url.strip()).path
+            old = self.known.get(self.stage, dict()).get(path)
+            ans = old is not None and old == self.current.get(path)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Sitemap: unchanged")
+
+    def save(self):
+        """
+        saves the lastmod of the last scrap in the local JSON file, the
+        comparisons of this scrap keep using the ones loaded at the start so
+        every stage requests the changed works
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            with self.lock:
+                known = {stage: dict(paths)
+                         for stage, paths in self.known.items()}
+                for stage, paths in self.fresh.items():
+                    known.setdefault(stage, dict()).update(paths)
+
+            folder = os.path.dirname(self.fpath)
+            if folder != str() and not os.path.exists(folder):
+                os.makedirs(folder)
+
+            # writing a temporal file first so the old one is never broken
+            tpath = self.fpath + ".tmp"
+            with open(tpath, "w", encoding="utf-8") as file:
+                json.dump(known, file, indent=1)
+            os.replace(tpath, self.fpath)
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Sitemap: save")
@@ -0,0 +1,399 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# =========================================
+# Standard library imports
+# =========================================
+import time
+import asyncio
+import threading
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+# =========================================
+# Local application imports
+# =========================================
+import Conf
+from Lib.Utils import Err
+assert Conf
+assert Err
+
+# =========================================
+# Global variables
+# =========================================
+# concurrent requests at the start of the scrapping
+DEFAULT_START = 2.0
+
+# min and max concurrent requests the throttle can reach
+DEFAULT_MIN = 1.0
+DEFAULT_MAX = 16.0
+
+# multiplicative decrease when the server is overloaded
+DEFAULT_DECREASE = 0.5
+
+# latency increase over the best recent latency that means overload
+DEFAULT_TOLERANCE = 2.0
+
+# weight of the last latency in the moving average
+DEFAULT_SMOOTHING = 0.2
+
+# number of recent moving averages of the latency with the best one, so
+# the baseline follows a server that gets slower for good
+DEFAULT_BASELINE_WINDOW = 100
+
+# HTTP status codes of an overloaded server
+OVERLOAD_STATUS = (429, 503)
+
+# waiting time between checks of the asyncio acquire
+ASYNC_POLL_TIME = 0.05
+
+
+def retry_seconds(retry):
+    """
+    translates the Retry-After header into seconds, it can be a number of
+    seconds or an HTTP date
+
+    Args:
+        retry (str): Retry-After header value
+
+    Raises:
+        exp: raise a generic exception if something goes wrong
+
+    Returns:
+        ans (float): seconds to wait, 0.0 if the header is invalid
+    """
+    try:
+        ans = 0.0
+        retry = str(retry).strip()
+
+        # number of seconds
+        if retry.isdigit():
+            ans = float(retry)
+
+        # HTTP date
+        else:
+            try:
+                date = parsedate_to_datetime(retry)
+                ans = date.timestamp() - time.time()
+            except (TypeError, ValueError):
+                ans = 0.0
+
+        ans = max(0.0, ans)
+        return ans
+
+    # exception handling
+    except Exception as exp:
+        Err.reraise(exp, "Throttle: retry_seconds")
+
+
+class Throttle():
+    """
+    this module implements an AIMD (additive increase, multiplicative
+    decrease) concurrency control, it adds one in-flight request for each
+    window of good responses and halves them when the server answers
+    429/503 or the time to first byte grows, it also pauses all the
+    requests for the Retry-After time the server asks
+    """
+
+    # =========================================
+    # class variables
+    # =========================================
+    limit = DEFAULT_START
+    minimum = DEFAULT_MIN
+    maximum = DEFAULT_MAX
+    decrease = DEFAULT_DECREASE
+    tolerance = DEFAULT_TOLERANCE
+    inflight = 0
+    latency = None
+    baseline = None
+    recent = None
+    paused = 0.0
+    last_cut = 0.0
+    cond = None
+
+    def __init__(self, *args, **kwargs):
+        """
+        class creator for Throttle()
+
+        Args:
+            start (float, optional): concurrent requests at the start.
+            Defaults to 2
+            minimum (float, optional): min concurrent requests. Defaults to 1
+            maximum (float, optional): max concurrent requests. Defaults
+            to 16
+            decrease (float, optional): multiplicative decrease factor.
+            Defaults to 0.5
+            tolerance (float, optional): latency over the best one that
+            triggers a decrease. Defaults to 2.0
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+
+            # default object attributes
+            self.limit = DEFAULT_START
+            self.minimum = DEFAULT_MIN
+            self.maximum = DEFAULT_MAX
+            self.decrease = DEFAULT_DECREASE
+            self.tolerance = DEFAULT_TOLERANCE
+            self.inflight = 0
+            self.latency = None
+            self.baseline = None
+            self.recent = deque(maxlen=DEFAULT_BASELINE_WINDOW)
+            self.paused = 0.0
+            self.last_cut = 0.0
+            self.cond = threading.Condition()
+
+            # if there are dict decrators in the creator
+            if len(kwargs) > 0:
+
+                # iterating all over the decorators
+                for key in list(kwargs.keys()):
+
+                    # updating the AIMD configuration
+                    if key == "start":
+                        self.limit = float(kwargs.get("start"))
+
+                    if key == "minimum":
+                        self.minimum = max(1.0, float(kwargs.get("minimum")))
+
+                    if key == "maximum":
+                        self.maximum = float(kwargs.get("maximum"))
+
+                    if key == "decrease":
+                        self.decrease = float(kwargs.get("decrease"))
+
+                    if key == "tolerance":
+                        self.tolerance = float(kwargs.get("tolerance"))
+
+            # the start must be inside the limits
+            self.limit = min(self.maximum, max(self.minimum, self.limit))
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Throttle: __init__")
+
+    def try_acquire(self):
+        """
+        takes an in-flight slot if the current limit allows it and the
+        server did not ask for a pause
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (float): 0.0 if the slot was taken, otherwise the seconds
+            to wait before trying again (None to wait for a release)
+        """
+        try:
+            ans = None
+            now = time.monotonic()
+
+            # the server asked to wait with Retry-After
+            if self.paused > now:
+                ans = self.paused - now
+
+            # there is a free slot in the current limit
+            elif self.inflight < int(self.limit):
+                self.inflight += 1
+                ans = 0.0
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Throttle: try_acquire")
+
+    def acquire_now(self):
+        """
+        takes an in-flight slot only if there is a free one now, ie.: for a
+        request that is not worth waiting for as a hedged duplicate
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): True if the slot was taken
+        """
+        try:
+            ans = False
+
+            # a busy lock is no free slot, it never blocks the event loop
+            if self.cond.acquire(blocking=False):
+                try:
+                    ans = self.try_acquire() == 0.0
+                finally:
+                    self.cond.release()
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Throttle: acquire_now")
+
+    def giveback(self):
+        """
+        frees an in-flight slot that was not used for any request, the limit
+        stays the same
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            with self.cond:
+                self.inflight = max(0, self.inflight - 1)
+                self.cond.notify_all()
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Throttle: giveback")
+
+    def acquire(self):
+        """
+        blocks the thread until there is a free in-flight slot
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            with self.cond:
+                delay = self.try_acquire()
+                while delay != 0.0:
+                    self.cond.wait(timeout=delay)
+                    delay = self.try_acquire()
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Throttle: acquire")
+
+    async def aacquire(self):
+        """
+        asyncio version of acquire(), waits for a free in-flight slot
+        without blocking the event loop, the lock of the worker threads is
+        only taken if it is free
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            delay = None
+
+            while delay != 0.0:
+                # the lock is busy, trying again in the next loop step
+                if not self.cond.acquire(blocking=False):
+                    await asyncio.sleep(0)
+                    continue
+
+                try:
+                    delay = self.try_acquire()
+                finally:
+                    self.cond.release()
+
+                if delay is None:
+                    await asyncio.sleep(ASYNC_POLL_TIME)
+                elif delay > 0.0:
+                    await asyncio.sleep(delay)
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Throttle: aacquire")
+
+    def release(self, status, latency, retry=None):
+        """
+        frees the in-flight slot and updates the limit with the response,
+        additive increase for good responses, multiplicative decrease for
+        429/503 or a rising latency
+
+        Args:
+            status (int): HTTP status code of the response, None if the
+            request failed
+            latency (float): time to first byte of the response in seconds
+            retry (str, optional): Retry-After header of the response
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            with self.cond:
+                now = time.monotonic()
+                self.inflight = max(0, self.inflight - 1)
+
+                # moving average of the latency and the best recent one
+                if latency is not None:
+                    if self.latency is None:
+                        self.latency = latency
+                    else:
+                        self.latency = (DEFAULT_SMOOTHING * latency +
+                                        (1.0 - DEFAULT_SMOOTHING) *
+                                        self.latency)
+
+                    self.recent.append(self.latency)
+                    self.baseline = min(self.recent)
+
+                overload = status in OVERLOAD_STATUS
+                slow = False
+                if self.baseline is not None and self.latency is not None:
+                    slow = self.latency > self.baseline * self.tolerance
+
+                # pausing all the requests as the server asks
+                if overload and retry is not None:
+                    self.paused = max(self.paused, now + self.retry_after(retry))
+
+                # multiplicative decrease, once for each round trip even
+                # for a burst of 429/503 answers
+                if overload or slow:
+                    window = self.latency or 0.0
+                    if now - self.last_cut > window:
+                        self.limit = max(self.minimum,
+                                         self.limit * self.decrease)
+                        self.last_cut = now
+
+                # additive increase, one slot for each window of responses
+                elif status is not None and status < 400:
+                    self.limit = min(self.maximum,
+                                     self.limit + 1.0 / self.limit)
+
+                self.cond.notify_all()
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Throttle: release")
+
+    def retry_after(self, retry):
+        """
+        translates the Retry-After header into seconds, it can be a number
+        of seconds or an HTTP date
+
+        Args:
+            retry (str): Retry-After header value
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (float): seconds to wait, 0.0 if the header is invalid
+        """
+        try:
+            ans = retry_seconds(retry)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Throttle: retry_after")
@@ -0,0 +1,319 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# =========================================
+# Standard library imports
+# =========================================
+from html.parser import HTMLParser
+
+# =========================================
+# Local application imports
+# =========================================
+import Conf
+from Lib.Utils import Err
+from Lib.Recovery.Parser import new_soup
+assert Conf
+assert Err
+
+# =========================================
+# Global variables
+# =========================================
+DEFAULT_HTML_PARSER = "html.parser"
+
+# HTML tags without end tag, they are complete with the start tag
+VOID_TAGS = ("area", "base", "br", "col", "embed", "hr", "img", "input",
+             "link", "meta", "param", "source", "track", "wbr")
+
+
+class Tokenizer(HTMLParser):
+    """
+    this module reads the HTML of a page one chunk at a time and keeps
+    the markup of the first tag of each target, so the page can close its
+    connection as soon as all the targets are found without downloading
+    or parsing the rest of the document
+    """
+
+    # =========================================
+    # class variables
+    # =========================================
+    targets = list()
+    found = dict()
+    dialect = DEFAULT_HTML_PARSER
+    current = None
+    markup = list()
+    depth = 0
+
+    def __init__(self, *args, **kwargs):
+        """
+        class creator for Tokenizer()
+
+        Args:
+            targets (list): tuples with the HTML <div> keyword and the
+            decorative attributes of each field, ie.: [("a", {"class":
+            "btn-icon"})]
+            dialect (str, optional): beautifulSoup parser dialect to check
+            the captured tags. Defaults "html.parser"
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            # the character references stay as they are in the markup
+            super().__init__(convert_charrefs=False)
+
+            # default object attributes
+            self.targets = list()
+            self.found = dict()
+            self.dialect = DEFAULT_HTML_PARSER
+            self.current = None
+            self.markup = list()
+            self.depth = 0
+
+            # if there are dict decrators in the creator
+            if len(kwargs) > 0:
+
+                # iterating all over the decorators
+                for key in list(kwargs.keys()):
+
+                    # updating the fields to capture
+                    if key == "targets":
+                        self.targets = list(kwargs.get("targets"))
+
+                    # updating the dialect of the captured tags
+                    if key == "dialect":
+                        self.dialect = kwargs.get("dialect")
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Tokenizer: __init__")
+
+    def complete(self):
+        """
+        checks if the tokenizer found all the targets
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): True if there is nothing more to read
+        """
+        try:
+            ans = len(self.found) == len(self.targets)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Tokenizer: complete")
+
+    def get_markup(self):
+        """
+        joins the markup of the captured tags in the order of the targets
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (str): HTML with the captured tags
+        """
+        try:
+            ans = list()
+
+            for idx in range(len(self.targets)):
+                if idx in self.found:
+                    ans.append(self.found[idx])
+
+            ans = "\n".join(ans)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Tokenizer: get_markup")
+
+    def maybe(self, tag, attrs, target):
+        """
+        quick check of a start tag against a target, the tags it accepts
+        are confirmed by BeautifulSoup once they are complete
+
+        Args:
+            tag (str): name of the start tag
+            attrs (list): (name, value) tuples of the start tag
+            target (tuple): HTML <div> keyword and decorative attributes
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): True if the tag can be the target
+        """
+        try:
+            ans = False
+            div, tattrs = target
+
+            if tag == div:
+                ans = True
+                values = dict(attrs)
+
+                for key, expected in (tattrs or dict()).items():
+                    value = values.get(key)
+
+                    if value is None:
+                        ans = False
+
+                    # plain values need all their words in the attribute
+                    elif isinstance(expected, str):
+                        words = value.split()
+                        for word in expected.split():
+                            if word not in words:
+                                ans = False
+
+                    # regular expressions, ie.: re.compile("^/asset/")
+                    elif hasattr(expected, "search"):
+                        words = [value] + value.split()
+                        if not any(expected.search(w) for w in words):
+                            ans = False
+
+                    if ans is False:
+                        break
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Tokenizer: maybe")
+
+    def confirm(self):
+        """
+        checks the captured tag with the same BeautifulSoup search of the
+        whole page and keeps it for the first target it matches
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            markup = "".join(self.markup)
+            soup = new_soup(markup, self.dialect)
+
+            for idx, target in enumerate(self.targets):
+                if idx not in self.found:
+                    div, tattrs = target
+                    if soup.find(div, attrs=tattrs) is not None:
+                        self.found[idx] = markup
+
+            self.current = None
+            self.markup = list()
+            self.depth = 0
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Tokenizer: confirm")
+
+    def finish(self):
+        """
+        ends the reading after the last chunk of the page, a target tag
+        still open is confirmed with the rest of the page as BeautifulSoup
+        does with the unclosed tags
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            self.close()
+
+            if self.current is not None:
+                self.confirm()
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Tokenizer: finish")
+
+    def handle_starttag(self, tag, attrs):
+        """
+        starts the capture of a target tag or adds the tag to the capture
+        """
+        if self.current is not None:
+            self.markup.append(self.get_starttag_text())
+            if tag == self.current and tag not in VOID_TAGS:
+                self.depth += 1
+            return
+
+        for idx, target in enumerate(self.targets):
+            if idx not in self.found and self.maybe(tag, attrs, target):
+                self.current = tag
+                self.markup = [self.get_starttag_text()]
+                self.depth = 1
+
+                # the void tags are complete with the start tag
+                if tag in VOID_TAGS:
+                    self.confirm()
+                break
+
+    def handle_startendtag(self, tag, attrs):
+        """
+        captures the self closing tags, ie.: <img src="..."/>
+        """
+        if self.current is not None:
+            self.markup.append(self.get_starttag_text())
+            return
+
+        for idx, target in enumerate(self.targets):
+            if idx not in self.found and self.maybe(tag, attrs, target):
+                self.current = tag
+                self.markup = [self.get_starttag_text()]
+                self.confirm()
+                break
+
+    def handle_endtag(self, tag):
+        """
+        adds the end tag to the capture, the last one completes it
+        """
+        if self.current is not None:
+            self.markup.append("</" + tag + ">")
+
+            if tag == self.current:
+                self.depth -= 1
+                if self.depth == 0:
+                    self.confirm()
+
+    def handle_data(self, data):
+        """
+        adds the text to the capture
+        """
+        if self.current is not None:
+            self.markup.append(data)
+
+    def handle_entityref(self, name):
+        """
+        adds the named character references to the capture, ie.: &amp;
+        """
+        if self.current is not None:
+            self.markup.append("&" + name + ";")
+
+    def handle_charref(self, name):
+        """
+        adds the numeric character references to the capture, ie.: &#38;
+        """
+        if self.current is not None:
+            self.markup.append("&#" + name + ";")
+
+    def handle_comment(self, data):
+        """
+        adds the comments to the capture
+        """
+        if self.current is not None:
+            self.markup.append("<!--" + data + "-->")
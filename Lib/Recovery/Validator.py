@@ -0,0 +1,248 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# =========================================
+# Standard library imports
+# =========================================
+import os
+import json
+import threading
+
+# =========================================
+# Local application imports
+# =========================================
+import Conf
+from Lib.Utils import Err
+assert Conf
+assert Err
+
+# =========================================
+# Global variables
+# =========================================
+# local file with the validators of the URLs
+DEFAULT_VALIDATOR_FILE = os.path.join("Data", "validators.json")
+
+# response headers saved as validators and the request headers they fill
+VALIDATOR_HEADERS = {
+    "ETag": "If-None-Match",
+    "Last-Modified": "If-Modified-Since",
+}
+
+# key of the local file of the streamed responses in the saved validators
+VALIDATOR_FILE = "file"
+
+# send the conditional requests, only for the refresh of a complete gallery
+DEFAULT_REFRESH = False
+
+# stage of the requests without one
+DEFAULT_STAGE = "default"
+
+
+class Validator():
+    """
+    this module keeps the HTTP validators (ETag and Last-Modified) of each
+    URL in a local JSON file, so the next scrap asks the server with a
+    conditional request and an unchanged page answers 304 without body,
+    the conditions are only sent in refresh mode because the gallery must
+    already have the data of the unchanged pages. the stages that request
+    the same URL for different columns keep their own validators, a 304 of
+    one stage only means its own column did not change
+    """
+
+    # =========================================
+    # class variables
+    # =========================================
+    fpath = DEFAULT_VALIDATOR_FILE
+    refresh = DEFAULT_REFRESH
+    stage = DEFAULT_STAGE
+    known = dict()
+    fresh = dict()
+    lock = None
+
+    def __init__(self, *args, **kwargs):
+        """
+        class creator for Validator(), it loads the validators saved by the
+        previous scraps
+
+        Args:
+            fpath (str, optional): local JSON file with the validators.
+            Defaults to "Data/validators.json"
+            refresh (bool, optional): send the conditional requests. Defaults
+            to False, only records the validators
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+
+            # default object attributes
+            self.fpath = DEFAULT_VALIDATOR_FILE
+            self.refresh = DEFAULT_REFRESH
+            self.stage = DEFAULT_STAGE
+            self.known = dict()
+            self.fresh = dict()
+            self.lock = threading.Lock()
+
+            # if there are dict decrators in the creator
+            if len(kwargs) > 0:
+
+                # iterating all over the decorators
+                for key in list(kwargs.keys()):
+
+                    # updating the validators file
+                    if key == "fpath":
+                        self.fpath = kwargs.get("fpath")
+
+                    if key == "refresh":
+                        self.refresh = bool(kwargs.get("refresh"))
+
+            # loading the validators of the previous scraps
+            if os.path.exists(self.fpath):
+                with open(self.fpath, "r", encoding="utf-8") as file:
+                    known = json.load(file)
+
+                # the validators without stage are not trusted, ie.: the
+                # files of the older versions
+                for stage, urls in known.items():
+                    if not any(vkey in urls for vkey in VALIDATOR_HEADERS):
+                        self.known[stage] = urls
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Validator: __init__")
+
+    def use(self, stage):
+        """
+        sets the stage of the next requests, ie.: the name of the scrap
+        function of the column
+
+        Args:
+            stage (str): name of the stage
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            with self.lock:
+                self.stage = str(stage)
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Validator: use")
+
+    def conditions(self, url):
+        """
+        creates the conditional request headers of the URL with the
+        validators of the previous scraps
+
+        Args:
+            url (str): URL of the next request
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): If-None-Match and If-Modified-Since headers, empty if
+            the URL has no validators in the stage or it is not refresh mode,
+            or if its local file is gone
+        """
+        try:
+            ans = dict()
+
+            if self.refresh is False:
+                return ans
+
+            urls = self.known.get(self.stage, dict())
+            saved = urls.get(url.strip(), dict())
+
+            # a 304 would keep a file that is not there anymore
+            fpath = saved.get(VALIDATOR_FILE)
+            if fpath is not None and not os.path.exists(fpath):
+                return ans
+
+            for vkey, rkey in VALIDATOR_HEADERS.items():
+                if saved.get(vkey) is not None:
+                    ans[rkey] = saved.get(vkey)
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Validator: conditions")
+
+    def update(self, url, headers, fpath=None):
+        """
+        records the validators of a new response, they are used after
+        save() so the requests of the same scrap are not conditional
+
+        Args:
+            url (str): URL of the response
+            headers (dict): headers of the response
+            fpath (str, optional): local file with the body of the response,
+            the next conditions are only sent if it exists. Defaults to None
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            saved = dict()
+
+            for vkey in VALIDATOR_HEADERS.keys():
+                if headers.get(vkey) is not None:
+                    saved[vkey] = headers.get(vkey)
+
+            if len(saved) > 0 and fpath is not None:
+                saved[VALIDATOR_FILE] = fpath
+
+            if len(saved) > 0:
+                with self.lock:
+                    urls = self.fresh.setdefault(self.stage, dict())
+                    urls[url.strip()] = saved
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Validator: update")
+
+    def save(self):
+        """
+        saves the validators of the last scrap in the local JSON file
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            with self.lock:
+                for stage, urls in self.fresh.items():
+                    self.known.setdefault(stage, dict()).update(urls)
+                self.fresh = dict()
+                known = dict(self.known)
+
+            folder = os.path.dirname(self.fpath)
+            if folder != str() and not os.path.exists(folder):
+                os.makedirs(folder)
+
+            # writing a temporal file first so the old one is never broken
+            tpath = self.fpath + ".tmp"
+            with open(tpath, "w", encoding="utf-8") as file:
+                json.dump(known, file, indent=1)
+            os.replace(tpath, self.fpath)
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Validator: save")
@@ -0,0 +1,149 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+*
+* benchmark of the text cleaner over the keys and values of the JSON
+* columns of a gallery CSV, one text at a time with clrtext(), the whole
+* column at once with clrtexts() and both with the text cache of the
+* repeated texts. run it from the repo root with:
+* python Tests/bench_clrtext.py [csv] [rounds]
+"""
+
+# ___________________________________________
+# importing benchmark libraries
+# ___________________________________________
+import os
+import sys
+import json
+import time
+
+import pandas as pd
+
+# the repo root and App paths
+import config
+
+# ___________________________________________
+# importing costume scrapping modules
+# ___________________________________________
+from App.Model import Gallery
+assert config
+
+# times each column is cleaned
+DEFAULT_ROUNDS = 5
+
+# gallery CSV with the scraped JSON columns
+DEFAULT_CSV = os.path.join("Data", "VVG-GalleryScrap-large.csv")
+
+# JSON columns of the collection pages
+JSON_COLUMNS = ["DESCRIPTION", "SEARCH_TAGS", "OBJ_DATA", "RELATED_WORKS"]
+
+
+def load_texts(fpath):
+    """
+    reads the keys and values of the JSON columns of the CSV, each column
+    is a pandas Series of texts
+    """
+    ans = dict()
+    gdf = pd.read_csv(fpath)
+
+    for col in JSON_COLUMNS:
+        texts = list()
+        for cell in gdf[col].dropna():
+            data = json.loads(cell)
+            for key, value in data.items():
+                texts.append(key)
+                texts.append(value)
+        ans[col] = pd.Series(texts, dtype=object)
+
+    return ans
+
+
+def timeit(func, texts, rounds):
+    """
+    mean seconds of cleaning the texts with the function
+    """
+    start = time.perf_counter()
+    for i in range(rounds):
+        func(texts)
+    return (time.perf_counter() - start) / rounds
+
+
+if __name__ == "__main__":
+
+    fpath = DEFAULT_CSV
+    rounds = DEFAULT_ROUNDS
+    if len(sys.argv) > 1:
+        fpath = sys.argv[1]
+    if len(sys.argv) > 2:
+        rounds = int(sys.argv[2])
+
+    columns = load_texts(fpath)
+    gallery = Gallery()
+    cached = Gallery(texts=dict())
+
+    def one_by_one(texts):
+        return [gallery.clrtext(text) for text in texts]
+
+    print("============== text cleaner benchmark ==============")
+    print("csv:", fpath, "| rounds:", rounds)
+
+    total_one, total_batch = 0.0, 0.0
+    for col, texts in columns.items():
+
+        # the batch must answer the same bytes
+        expected = one_by_one(texts)
+        same = list(gallery.clrtexts(texts)) == expected
+
+        one = timeit(one_by_one, texts, rounds)
+        batch = timeit(gallery.clrtexts, texts, rounds)
+        total_one += one
+        total_batch += batch
+
+        print(col.ljust(15),
+              "texts:", str(len(texts)).rjust(6),
+              "| clrtext:", round(one * 1000, 2), "ms",
+              "| clrtexts:", round(batch * 1000, 2), "ms",
+              "| speed-up:", round(one / batch, 2), "x",
+              "| identical:", same)
+
+    print("ALL".ljust(15),
+          "clrtext:", round(total_one * 1000, 2), "ms",
+          "| clrtexts:", round(total_batch * 1000, 2), "ms",
+          "| speed-up:", round(total_one / total_batch, 2), "x")
+
+    # a full run cleans each text once, like the scrap of the pages
+    print("============== text cache, one round ==============")
+    texts = [text for col in columns.values() for text in col]
+    expected = [gallery.clrtext(text) for text in texts]
+
+    start = time.perf_counter()
+    ans = [cached.clrtext(text) for text in texts]
+    elapsed = time.perf_counter() - start
+    one = timeit(lambda items: [gallery.clrtext(t) for t in items], texts, 1)
+
+    stats = cached.wtexts.stats()
+    print("texts:", len(texts),
+          "| clrtext:", round(one * 1000, 2), "ms",
+          "| cached:", round(elapsed * 1000, 2), "ms",
+          "| identical:", ans == expected)
+    print("hits:", stats.get("hits"),
+          "| misses:", stats.get("misses"),
+          "| hit rate:", round(stats.get("rate"), 3),
+          "| unique texts:", stats.get("texts"),
+          "| saved:", round(stats.get("saved") * 1000, 2), "ms",
+          "| shared:", round(stats.get("shared") / 1024), "KB")
@@ -0,0 +1,242 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+*
+* benchmark of the parser backends over saved collection pages, the
+* *.html files or the cached *.gz responses of a folder, or stub pages
+* without folder. the backends with SoupStrainer also parse only the
+* scraped sections. run it from the repo root with:
+* python Tests/bench_parser.py [folder] [rounds]
+"""
+
+# ___________________________________________
+# importing benchmark libraries
+# ___________________________________________
+import os
+import re
+import sys
+import glob
+import gzip
+import time
+import tracemalloc
+
+# the repo root and App paths
+import config
+
+# ___________________________________________
+# importing costume scrapping modules
+# ___________________________________________
+from App.Model import Gallery
+from Lib.Recovery.Parser import PARSER_BACKENDS
+from Lib.Recovery.Parser import STRAINER_BACKENDS
+from Lib.Recovery.Parser import DEFAULT_HTML_PARSER
+from Lib.Recovery.Parser import available
+from Lib.Recovery.Parser import new_soup
+from Lib.Recovery.Parser import new_strainer
+assert config
+
+# times each page is parsed by each backend
+DEFAULT_ROUNDS = 5
+
+# number of stub pages without a folder
+DEFAULT_STUB_PAGES = 20
+
+# root URL of the collection links
+ROOT_URL = "https://www.vangoghmuseum.nl"
+
+# tags of the collection page columns, the same of Config/html-tags.ini
+PAGE_TAGS = {
+    "DESCRIPTION": ("section",
+                    {"class": re.compile("art-object-page-content-")},
+                    ["h1", "p", "a"],
+                    ["class", "art-object-page-content-", "href"]),
+    "SEARCH_TAGS": ("section",
+                    {"class": "artobject-page-collection-links"},
+                    "a",
+                    "href"),
+    "OBJ_DATA": ("dl",
+                 {"class": "definition-list"},
+                 ["dt", "dd"],
+                 None),
+    "RELATED_WORKS": ("div",
+                      {"class": "teaser-row content-row grid-row"},
+                      "article",
+                      ["span", "a", "href"]),
+}
+
+# fake collection page with the sections of the museum pages
+STUB_PAGE = """<html><head><title>Stub %(n)d</title></head><body>
+<header><a class="btn-icon art-object-header-bar-button"
+href="/asset/download/s%(n)04dV1962r">Download</a></header>
+<section class="art-object-page-content-title">
+<h1 class="art-object-page-content-title">Head of a Woman %(n)d</h1>
+<p class="art-object-page-content-creator-info">Vincent van Gogh
+(1853 - 1890), Nuenen, May 1885</p>
+<p class="art-object-page-content-details">oil on canvas</p>
+</section>
+<section class="art-object-page-content-section">
+<p>In Nuenen <a href="/en/stories/x">Van Gogh</a> painted heads.</p>
+</section>
+<section class="artobject-page-collection-links"><ul>
+<li><a href="/en/collection?Date=1885">1885</a></li>
+<li><a href="/en/collection?Place=Nuenen">Nuenen</a></li>
+</ul></section>
+<dl class="definition-list"><dt>F-number</dt><dd>F%(n)04dr</dd>
+<dt>JH-number</dt><dd>JH%(n)04d</dd></dl>
+<div class="teaser-row content-row grid-row">
+<article><a href="/en/collection/s0005"><span>Peasant Woman</span></a>
+</article>
+<article><a href="/en/collection/s0006"><span>Café</span></a></article>
+</div>
+%(menu)s
+</body></html>"""
+
+# navigation and footer of the museum pages, most of their size
+STUB_MENU = "".join(
+    "<nav><ul><li><a href=\"/en/visit/%d\">Visit %d</a></li>"
+    "<li><a href=\"/en/stories/%d\">Story %d</a></li></ul></nav>"
+    % (i, i, i, i) for i in range(300))
+
+
+def load_pages(folder):
+    """
+    reads the saved pages of the folder, the cached responses are gzip
+    files with a JSON line before the body
+    """
+    ans = list()
+
+    if folder is None:
+        for n in range(DEFAULT_STUB_PAGES):
+            page = STUB_PAGE % {"n": n, "menu": STUB_MENU}
+            ans.append(page.encode("utf-8"))
+        return ans
+
+    for fpath in sorted(glob.glob(os.path.join(folder, "*.html"))):
+        with open(fpath, "rb") as file:
+            ans.append(file.read())
+
+    for fpath in sorted(glob.glob(os.path.join(folder, "*.gz"))):
+        with gzip.open(fpath, "rb") as file:
+            file.readline()
+            ans.append(file.read())
+
+    return ans
+
+
+def extract(gallery, soup):
+    """
+    cleans the page columns like the scrap of the collection pages
+    """
+    ans = dict()
+    for col, (div, attrs, elem, clean) in PAGE_TAGS.items():
+
+        if col == "OBJ_DATA":
+            tsoup = soup.find(div, attrs=attrs)
+            ans[col] = gallery.clean_objdata(tsoup, elem)
+
+        else:
+            tsoup = soup.find_all(div, attrs=attrs)
+
+            if col == "DESCRIPTION":
+                ans[col] = gallery.clean_description(tsoup, elem, clean)
+
+            elif col == "SEARCH_TAGS":
+                ans[col] = gallery.clean_searchtags(ROOT_URL, tsoup,
+                                                    elem, clean)
+
+            elif col == "RELATED_WORKS" and len(tsoup) > 0:
+                ans[col] = gallery.clean_relwork(ROOT_URL, tsoup,
+                                                 elem, clean)
+    return ans
+
+
+def run(dialect, pages, rounds, gallery, expected, strainer=None):
+    """
+    parses all the pages with the backend and reports the mean parse time,
+    the peak memory of one parse and the pages whose clean columns are not
+    the same of the pure python parser
+    """
+    start = time.perf_counter()
+    for i in range(rounds):
+        for body in pages:
+            new_soup(body, dialect, strainer)
+    elapsed = time.perf_counter() - start
+
+    peak = 0
+    for body in pages:
+        tracemalloc.start()
+        new_soup(body, dialect, strainer)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    diffs = 0
+    for body, columns in zip(pages, expected):
+        if extract(gallery, new_soup(body, dialect, strainer)) != columns:
+            diffs += 1
+
+    label = dialect
+    if strainer is not None:
+        label = dialect + "+strainer"
+
+    mean = elapsed / (rounds * len(pages)) * 1000
+    print(label.ljust(22),
+          "parse:", round(mean, 2), "ms/page",
+          "| peak:", round(peak / (1024 * 1024), 2), "MB",
+          "| different pages:", diffs)
+    return mean
+
+
+if __name__ == "__main__":
+
+    folder = None
+    rounds = DEFAULT_ROUNDS
+    if len(sys.argv) > 1:
+        folder = sys.argv[1]
+    if len(sys.argv) > 2:
+        rounds = int(sys.argv[2])
+
+    pages = load_pages(folder)
+    targets = [(div, attrs) for div, attrs, elem, clean in PAGE_TAGS.values()]
+    strainer = new_strainer(targets)
+    gallery = Gallery()
+    expected = list()
+    for body in pages:
+        soup = new_soup(body, DEFAULT_HTML_PARSER)
+        expected.append(extract(gallery, soup))
+
+    size = sum(len(body) for body in pages)
+    print("============ parser backends benchmark ============")
+    print("pages:", len(pages), "| size:", round(size / 1024), "KB",
+          "| rounds:", rounds)
+
+    base = None
+    for dialect in PARSER_BACKENDS:
+        if not available(dialect):
+            print(dialect.ljust(22), "not installed")
+            continue
+
+        mean = run(dialect, pages, rounds, gallery, expected)
+        if base is None:
+            base = mean
+        else:
+            print(" " * 22, "speed-up:", round(base / mean, 2), "x")
+
+        # only the sections of the page columns
+        if dialect in STRAINER_BACKENDS:
+            mean = run(dialect, pages, rounds, gallery, expected, strainer)
+            print(" " * 22, "speed-up:", round(base / mean, 2), "x")
@@ -0,0 +1,124 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+*
+* benchmark of the Page() requests with and without the shared connection
+* Pool() against a local stub server, run it from the repo root with:
+* python Tests/bench_pool.py [requests] [handshake seconds]
+"""
+
+# ___________________________________________
+# importing benchmark libraries
+# ___________________________________________
+import sys
+import time
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+# ___________________________________________
+# importing costume scrapping modules
+# ___________________________________________
+# the repo root and App paths
+import config
+from Lib.Recovery.Content import Page
+from Lib.Recovery.Pool import Pool
+assert config
+
+# number of pages requested in each run
+DEFAULT_REQUESTS = 200
+
+# simulated cost of a new TCP+TLS handshake in seconds
+DEFAULT_HANDSHAKE = 0.02
+
+# fake collection page served by the stub server
+STUB_BODY = b"""<html><body>
+<section class="art-object-page-content-title"><h1 class="title">Stub</h1>
+</section></body></html>"""
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    keep-alive HTTP/1.1 handler that counts the new connections and delays
+    each one to simulate the handshake
+    """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    connections = 0
+    handshake = DEFAULT_HANDSHAKE
+    lock = threading.Lock()
+
+    def setup(self):
+        with StubHandler.lock:
+            StubHandler.connections += 1
+        time.sleep(StubHandler.handshake)
+        super().setup()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(STUB_BODY)))
+        self.end_headers()
+        self.wfile.write(STUB_BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(label, npages, url, pool=None):
+    """
+    request the stub page npages times and report the wall time and the
+    number of connections the server had to accept
+    """
+    StubHandler.connections = 0
+    start = time.perf_counter()
+
+    for i in range(npages):
+        wpage = Page(pool=pool)
+        wpage.get_body(url + "/en/collection/s" + str(i))
+
+    elapsed = time.perf_counter() - start
+    print(label.ljust(16),
+          "time:", round(elapsed, 3), "s",
+          "| pages/s:", round(npages / elapsed, 1),
+          "| connections:", StubHandler.connections)
+    return elapsed
+
+
+if __name__ == "__main__":
+
+    npages = DEFAULT_REQUESTS
+    if len(sys.argv) > 1:
+        npages = int(sys.argv[1])
+    if len(sys.argv) > 2:
+        StubHandler.handshake = float(sys.argv[2])
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = "http://127.0.0.1:" + str(server.server_address[1])
+
+    print("========== Page() connection pool benchmark ==========")
+    print("requests:", npages, "| handshake:", StubHandler.handshake, "s")
+    bare = run("bare requests", npages, url)
+    wpool = Pool()
+    pooled = run("shared Pool()", npages, url, pool=wpool)
+    wpool.close()
+    print("speed-up:", round(bare / pooled, 2), "x")
+
+    server.shutdown()
@@ -6,8 +6,10 @@ import sys
 
 """
 workaround the relative explicit import limitations and altering the sys.path
-# Keep checking the '../..' parameter to go further into the app path
+# Keep checking the '..' parameter to go further into the app path, the App
+# folder has the Conf module the Lib modules import
 """
-file_path = os.path.join(os.path.dirname(__file__), '../../..')
+file_path = os.path.join(os.path.dirname(__file__), '..')
 file_dir = os.path.dirname(os.path.realpath('__file__'))
-sys.path.insert(0, os.path.abspath(file_path))
\ No newline at end of file
+sys.path.insert(0, os.path.abspath(file_path))
+sys.path.insert(0, os.path.abspath(os.path.join(file_path, 'App')))
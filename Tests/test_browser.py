@@ -0,0 +1,177 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# ___________________________________________
+# importing test framework and necesarry libraries
+# ___________________________________________
+import time
+import threading
+import pytest
+
+# the repo root and App paths
+import config
+
+# ___________________________________________
+# importing costume scrapping module
+# ___________________________________________
+from App.Model import Gallery
+from App.View import View
+from Lib.Recovery.Browser import BrowserPool
+
+# ___________________________________________
+# asserting imports in the module
+# ___________________________________________
+assert pytest
+assert config
+
+"""
+tests of the pool of warm browsers with fake selenium drivers, the memory
+of each driver is set by the test
+"""
+
+
+class FakeDriver():
+    """
+    selenium driver that only counts its quits
+    """
+    capabilities = dict()
+
+    def __init__(self):
+        self.quits = 0
+
+    def quit(self):
+        self.quits += 1
+
+
+@pytest.fixture
+def drivers(monkeypatch):
+    """
+    list->FakeDriver: the drivers started by the browser pools, with the
+    memory of the "memory" dict by driver id
+    """
+    started = list()
+    memory = dict()
+
+    def new_driver(pool):
+        driver = FakeDriver()
+        pool.uses[id(driver)] = 0
+        pool.baseline[id(driver)] = pool.get_memory(driver)
+        started.append(driver)
+        return driver
+
+    def get_memory(pool, driver):
+        return memory.get(id(driver), 100 * 1024 * 1024)
+
+    monkeypatch.setattr(BrowserPool, "new_driver", new_driver)
+    monkeypatch.setattr(BrowserPool, "get_memory", get_memory)
+    pytest.memory = memory
+    return started
+
+
+def test_browser_reuse(drivers):
+    """
+    the pages take the warm browser back until its max uses, then a new
+    one replaces it
+    """
+    pool = BrowserPool(size=1, maxuses=3, maxgrowth=0)
+
+    used = list()
+    for idx in range(7):
+        driver = pool.acquire()
+        used.append(driver)
+        pool.release(driver)
+
+    assert len(drivers) == 3
+    assert used == [drivers[0]] * 3 + [drivers[1]] * 3 + [drivers[2]]
+    assert [driver.quits for driver in drivers] == [1, 1, 0]
+    assert pool.recycled == 2 and pool.opened == 1
+
+
+def test_browser_memory_growth(drivers):
+    """
+    a browser that grows over the max memory is recycled
+    """
+    pool = BrowserPool(size=1, maxuses=0, maxgrowth=512)
+
+    driver = pool.acquire()
+    pool.release(driver)
+    assert pool.idle == [driver]
+
+    pytest.memory[id(driver)] = (100 + 600) * 1024 * 1024
+    assert pool.acquire() is driver
+    pool.release(driver)
+
+    assert pool.idle == list() and driver.quits == 1
+    assert pool.acquire() is drivers[1]
+
+
+def test_browser_broken(drivers):
+    """
+    a browser of a failed page is closed and the next page starts another
+    """
+    pool = BrowserPool(size=1)
+
+    driver = pool.acquire()
+    pool.release(driver, broken=True)
+
+    assert driver.quits == 1
+    assert pool.acquire() is drivers[1]
+
+
+def test_browser_size(drivers):
+    """
+    the pages wait for a browser when all of them are in use
+    """
+    pool = BrowserPool(size=2)
+    first = pool.acquire()
+    pool.acquire()
+    got = list()
+
+    waiting = threading.Thread(target=lambda: got.append(pool.acquire()))
+    waiting.start()
+    time.sleep(0.1)
+    assert got == list()
+
+    pool.release(first)
+    waiting.join(1.0)
+    assert got == [first]
+    assert len(drivers) == 2
+
+
+def test_view_closes_browsers(drivers, monkeypatch):
+    """
+    the menu loop closes the warm browsers however it ends, ie.: with
+    ctrl+c instead of the exit option
+    """
+    view = View()
+    view.gallery_model = Gallery(browsers={"size": 1})
+    view.gallery_controller.gallery = view.gallery_model
+    pool = view.gallery_model.wbrowsers
+    pool.release(pool.acquire())
+
+    def interrupt():
+        raise KeyboardInterrupt()
+
+    monkeypatch.setattr(view, "menu", interrupt)
+    with pytest.raises(KeyboardInterrupt):
+        view.run()
+
+    assert drivers[0].quits == 1
+    assert pool.idle == list()
@@ -0,0 +1,184 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# ___________________________________________
+# importing test framework and necesarry libraries
+# ___________________________________________
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+import pytest
+
+# the repo root and App paths
+import config
+
+# ___________________________________________
+# importing costume scrapping module
+# ___________________________________________
+from Lib.Recovery.Pool import Pool
+from Lib.Recovery.Cache import Cache
+from Lib.Recovery.Validator import Validator
+from Lib.Recovery.Content import Page
+from Lib.Recovery.Content import NOT_MODIFIED
+from App.Model import Gallery
+
+# ___________________________________________
+# asserting imports in the module
+# ___________________________________________
+assert pytest
+assert config
+
+"""
+tests of the local response cache and the validators of the conditional
+requests against a local stub server with ETags
+"""
+
+# version of the stub pages
+STUB_ETAG = '"v1"'
+
+
+class EtagHandler(BaseHTTPRequestHandler):
+    """
+    answers the pages with an ETag and 304 if the request has it, the
+    "body" changes the page without changing its ETag
+    """
+    body = b"<html><p>first</p></html>"
+    requested = list()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.requested.append((self.path,
+                               self.headers.get("If-None-Match")))
+
+        if self.headers.get("If-None-Match") == STUB_ETAG:
+            self.send_response(304)
+            self.send_header("ETag", STUB_ETAG)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("ETag", STUB_ETAG)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+
+@pytest.fixture
+def etags():
+    """
+    url->str: URL of the local stub server
+    """
+    EtagHandler.body = b"<html><p>first</p></html>"
+    EtagHandler.requested = list()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EtagHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    pytest.url = "http://127.0.0.1:%d/page" % server.server_port
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_cache_revalidate(etags, tmp_path):
+    """
+    in refresh mode a cached page is asked again with its ETag, the 304
+    answers with the cached body
+    """
+    cache = Cache(folder=str(tmp_path / "cache"))
+    vpath = str(tmp_path / "validators.json")
+    validator = Validator(fpath=vpath)
+    page = Page(pool=Pool(), cache=cache, validator=validator)
+
+    assert page.get_body(pytest.url) == 200
+    validator.save()
+
+    # without refresh the cache answers without any request
+    assert page.get_body(pytest.url) == 200
+    assert len(EtagHandler.requested) == 1
+
+    # the refresh asks the server, the cached page is still the same
+    validator = Validator(fpath=vpath, refresh=True)
+    page = Page(pool=Pool(), cache=cache, validator=validator)
+    EtagHandler.body = b"<html><p>second</p></html>"
+
+    assert page.get_body(pytest.url) == 200
+    assert EtagHandler.requested[-1] == ("/page", STUB_ETAG)
+    assert page.sbody.find("p").text == "first"
+
+
+def test_cache_replay(etags, tmp_path):
+    """
+    the replay mode answers only from the cache, without validators nor
+    requests, a missing page answers 504
+    """
+    folder = str(tmp_path / "cache")
+    vpath = str(tmp_path / "validators.json")
+    page = Page(pool=Pool(), cache=Cache(folder=folder),
+                validator=Validator(fpath=vpath))
+    page.get_body(pytest.url)
+    page.validator.save()
+
+    cache = Cache(folder=folder, replay=True)
+    page = Page(pool=Pool(), cache=cache,
+                validator=Validator(fpath=vpath, refresh=True))
+
+    assert page.get_body(pytest.url) == 200
+    assert page.get_body(pytest.url + "?other=1") == 504
+    assert len(EtagHandler.requested) == 1
+
+
+def test_cache_streams(etags, tmp_path):
+    """
+    the streamed requests are not looked up in the cache, the stats only
+    count the pages
+    """
+    cache = Cache(folder=str(tmp_path / "cache"))
+    page = Page(pool=Pool(), cache=cache)
+
+    assert page.get_stream(pytest.url) == 200
+    page.close_stream()
+    assert cache.stats().get("misses") == 0
+
+    page.get_body(pytest.url)
+    page.get_body(pytest.url)
+    assert cache.stats().get("misses") == 1
+    assert cache.stats().get("hits") == 1
+
+
+def test_fetch_not_modified(etags, tmp_path):
+    """
+    without cache the gallery answers NOT_MODIFIED for the pages with the
+    same ETag in refresh mode, the stage keeps their data
+    """
+    vpath = str(tmp_path / "validators.json")
+    gallery = Gallery(rate={"rate": 0}, validator={"fpath": vpath})
+    assert gallery.fetch(pytest.url) is not None
+    assert gallery.scrape(pytest.url, "p", {}, multiple=False).text == (
+        "first")
+    gallery.wvalidator.save()
+
+    gallery = Gallery(rate={"rate": 0}, validator={"fpath": vpath,
+                                                   "refresh": True})
+    assert gallery.fetch(pytest.url) is NOT_MODIFIED
+    assert gallery.scrape(pytest.url, "p", {}) is NOT_MODIFIED
+    assert EtagHandler.requested[-1] == ("/page", STUB_ETAG)
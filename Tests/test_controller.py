@@ -0,0 +1,215 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# ___________________________________________
+# importing test framework and necesarry libraries
+# ___________________________________________
+import json
+import time
+import asyncio
+import random
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+import pytest
+
+# the repo root and App paths
+import config
+
+# ___________________________________________
+# importing costume scrapping module
+# ___________________________________________
+from App.Model import Gallery
+from App.Controller import Controller
+
+# ___________________________________________
+# asserting imports in the module
+# ___________________________________________
+assert pytest
+assert config
+
+"""
+tests of the concurrent workers of the controller stages against a local
+stub server with a collection page for each work
+"""
+
+# download link and object data of each work, with its own number
+STUB_PAGE = """<html><body>
+<a class="btn-icon" href="/asset/download/s%04d">Download</a>
+<dl class="definition-list"><dt>F-number</dt><dd>F%04d</dd></dl>
+</body></html>"""
+
+# root URL of the download links
+ROOT_URL = "https://www.vangoghmuseum.nl"
+
+# HTML tags of the object data stage
+OBJ_DIV = "dl"
+OBJ_ATTRS = {"class": "definition-list"}
+OBJ_ELEM = ["dt", "dd"]
+
+# HTML tags of the columns scraped from the same page
+PAGE_TAGS = {
+    "DOWNLOAD_URL": (["a", {"class": "btn-icon"}, "href", None], False),
+    "OBJ_DATA": ([OBJ_DIV, OBJ_ATTRS, OBJ_ELEM, None], False),
+}
+
+
+class WorkHandler(BaseHTTPRequestHandler):
+    """
+    collection page of each work, answered after a random wait so the
+    workers finish out of order
+    """
+    active = 0
+    peak = 0
+    requested = list()
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+            cls.requested.append(self.path)
+
+        time.sleep(random.uniform(0.0, 0.05))
+        number = int(self.path.rsplit("/s", 1)[-1])
+        body = (STUB_PAGE % (number, number)).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+        with cls.lock:
+            cls.active -= 1
+
+
+@pytest.fixture
+def works():
+    """
+    url->str: URL of the collection pages in the local stub server
+    """
+    WorkHandler.active = 0
+    WorkHandler.peak = 0
+    WorkHandler.requested = list()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), WorkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    pytest.url = "http://127.0.0.1:%d/en/collection/" % server.server_port
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_run_tasks_order():
+    """
+    the workers answer in the order of the items, with at most the given
+    workers at the same time
+    """
+    ctrl = Controller(workers=4)
+    lock = threading.Lock()
+    running = {"now": 0, "peak": 0}
+
+    def task(item):
+        with lock:
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+        time.sleep(random.uniform(0.0, 0.02))
+        with lock:
+            running["now"] -= 1
+        return item * 2
+
+    items = list(range(40))
+    assert ctrl.run_tasks(task, items) == [item * 2 for item in items]
+    assert 1 < running["peak"] <= 4
+
+    running["peak"] = 0
+    assert ctrl.run_tasks(task, items, 1) == [item * 2 for item in items]
+    assert running["peak"] == 1
+
+
+def test_scrap_concurrent_pages(works):
+    """
+    the concurrent workers scrap each work from its own page, the answers
+    line up with the items and the gallery page is not shared
+    """
+    gallery = Gallery(rate={"rate": 0})
+    wpage = gallery.wpage
+    ctrl = Controller(model=gallery, workers=8)
+    numbers = list(range(1, 41))
+    urls = [pytest.url + "s%04d" % number for number in numbers]
+    ctrl.getdata = lambda coln: urls
+
+    ans = ctrl.scrap_objdata("ID", OBJ_DIV, OBJ_ATTRS, OBJ_ELEM,
+                             multiple=False)
+    assert [json.loads(tans) for tans in ans] == [
+        {"F-number": "F%04d" % number} for number in numbers]
+    assert WorkHandler.peak > 1
+    assert gallery.wpage is wpage
+
+
+def new_controller(numbers, workers=4):
+    """
+    controller with the collection pages of the numbers in the stub server
+    """
+    gallery = Gallery(rate={"rate": 0})
+    ctrl = Controller(model=gallery, workers=workers)
+    urls = [pytest.url + "s%04d" % number for number in numbers]
+    ctrl.getdata = lambda coln: urls
+    return ctrl
+
+
+def test_scrap_collection_once(works):
+    """
+    the collection stage requests each page once for all its columns, with
+    the same answers of the column stages
+    """
+    numbers = list(range(1, 11))
+    ctrl = new_controller(numbers)
+
+    ans = ctrl.scrap_collection("ID", ROOT_URL, PAGE_TAGS)
+    assert sorted(WorkHandler.requested) == [
+        "/en/collection/s%04d" % number for number in numbers]
+
+    dlurls = ctrl.scrap_paintlinks("ID", ROOT_URL,
+                                   *PAGE_TAGS["DOWNLOAD_URL"][0][:3],
+                                   multiple=False)
+    objdata = ctrl.scrap_objdata("ID", OBJ_DIV, OBJ_ATTRS, OBJ_ELEM,
+                                 multiple=False)
+    assert ans == {"DOWNLOAD_URL": dlurls, "OBJ_DATA": objdata}
+    assert dlurls[0] == ROOT_URL + "/asset/download/s0001"
+
+
+def test_ascrap_collection(works):
+    """
+    the asyncio collection stage requests each page once with the same
+    answer of the threaded stage
+    """
+    numbers = list(range(1, 11))
+    ctrl = new_controller(numbers)
+
+    ans = ctrl.scrap_collection("ID", ROOT_URL, PAGE_TAGS)
+    WorkHandler.requested = list()
+    aans = asyncio.run(ctrl.ascrap_collection("ID", ROOT_URL, PAGE_TAGS))
+    assert sorted(WorkHandler.requested) == [
+        "/en/collection/s%04d" % number for number in numbers]
+    assert aans == ans
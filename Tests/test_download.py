@@ -0,0 +1,337 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# ___________________________________________
+# importing test framework and necesarry libraries
+# ___________________________________________
+import os
+import hashlib
+import time
+import threading
+import tracemalloc
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+import pytest
+
+# the repo root and App paths
+import config
+
+# ___________________________________________
+# importing costume scrapping module
+# ___________________________________________
+from App.Model import Gallery
+from App.Controller import Controller
+from Lib.Recovery.Content import Page
+from Lib.Recovery.Content import PART_EXT
+from Lib.Recovery.Content import NOT_MODIFIED
+from Lib.Recovery.Pool import Pool
+
+# ___________________________________________
+# asserting imports in the module
+# ___________________________________________
+assert pytest
+assert config
+
+"""
+tests of the streamed image downloads, the resume of the partial files and
+the files without a known length, against a local stub server
+"""
+
+# body of the stub image, its version and the bytes sent before a cut
+STUB_IMAGE = bytes(range(256)) * 2000
+STUB_ETAG = '"img1"'
+STUB_CUT = 200000
+
+# arguments of dlimage() after the folder and the URL
+STUB_ARGS = ("Content-Disposition", {"Content-Type": "image/jpeg"},
+             ";", "filename=")
+
+
+class ImageHandler(BaseHTTPRequestHandler):
+    """
+    answers the image with its ETag, the Range requests with 206 and the
+    conditional ones with 304, the "cut" answers stop after some bytes and
+    the "chunked" ones have no Content-Length
+    """
+    protocol_version = "HTTP/1.1"
+    cut = False
+    chunked = False
+    pause = 0.0
+    requested = list()
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        try:
+            time.sleep(self.pause)
+            self.answer()
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    def answer(self):
+        rng = self.headers.get("Range")
+        self.requested.append((rng, self.headers.get("If-Range")))
+        start = 0
+
+        # the image did not change
+        if self.headers.get("If-None-Match") == STUB_ETAG:
+            self.send_response(304)
+            self.send_header("ETag", STUB_ETAG)
+            self.end_headers()
+            return
+
+        if rng is not None and self.headers.get("If-Range") == STUB_ETAG:
+            start = int(rng.split("=")[1].rstrip("-"))
+            self.send_response(206)
+            self.send_header("Content-Range", "bytes %d-%d/%d" % (
+                start, len(STUB_IMAGE) - 1, len(STUB_IMAGE)))
+        else:
+            self.send_response(200)
+
+        name = self.path.split("/")[-1]
+        body = STUB_IMAGE[start:]
+        self.send_header("Content-Type", "image/jpeg")
+        self.send_header("ETag", STUB_ETAG)
+        self.send_header("Content-Disposition",
+                         "attachment; filename=%s.jpg" % name)
+
+        # a body without length, in one chunk and the last empty one
+        if self.chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            self.wfile.write(b"%x\r\n" % len(body) + body + b"\r\n0\r\n\r\n")
+            return
+
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        # the connection closes in the middle of the body
+        if self.cut:
+            ImageHandler.cut = False
+            self.wfile.write(body[:STUB_CUT])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def images():
+    """
+    url->str: URL of the image in the local stub server
+    """
+    ImageHandler.cut = False
+    ImageHandler.chunked = False
+    ImageHandler.pause = 0.0
+    ImageHandler.requested = list()
+    ImageHandler.peak = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ImageHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    pytest.url = "http://127.0.0.1:%d/asset/p1" % server.server_port
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def new_gallery(tmp_path, images=1, **kwargs):
+    """
+    gallery without rate limit and the local folders of the images
+    """
+    gallery = Gallery(rate={"rate": 0}, **kwargs)
+    folder = tmp_path / "gallery"
+    for idx in range(1, images + 1):
+        (folder / ("p%d" % idx)).mkdir(parents=True, exist_ok=True)
+    return gallery, str(folder)
+
+
+def test_dlimage(images, tmp_path):
+    """
+    the image is saved whole with its checksum, without partial files
+    """
+    gallery, folder = new_gallery(tmp_path)
+
+    ans = gallery.dlimage(folder, pytest.url, *STUB_ARGS)
+    fpath = os.path.join(folder, "p1", "p1.jpg")
+
+    assert ans == (True, len(STUB_IMAGE))
+    assert open(fpath, "rb").read() == STUB_IMAGE
+    assert os.listdir(os.path.join(folder, "p1")) == ["p1.jpg"]
+
+    # the file name and the body come from the same request
+    assert len(ImageHandler.requested) == 1
+
+
+def test_dlimage_existing(images, tmp_path):
+    """
+    an existing file with the size of the image is kept, the request is
+    closed before its body
+    """
+    gallery, folder = new_gallery(tmp_path)
+    gallery.dlimage(folder, pytest.url, *STUB_ARGS)
+    ImageHandler.requested = list()
+
+    ans = gallery.dlimage(folder, pytest.url, *STUB_ARGS)
+    assert ans == (True, 0)
+    assert len(ImageHandler.requested) == 1
+
+
+def test_save_stream_memory(images, tmp_path):
+    """
+    the body goes to the file one chunk at a time, the memory does not
+    grow with the size of the image
+    """
+    fpath = str(tmp_path / "p1.jpg")
+    page = Page(pool=Pool())
+    page.get_stream(pytest.url)
+
+    tracemalloc.start()
+    try:
+        assert page.save_stream(fpath) == len(STUB_IMAGE)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert peak < len(STUB_IMAGE) / 2
+    assert open(fpath, "rb").read() == STUB_IMAGE
+
+
+def test_dlimage_resume(images, tmp_path):
+    """
+    an interrupted download leaves its partial file and the next one asks
+    at once only for the missing bytes
+    """
+    gallery, folder = new_gallery(tmp_path)
+    ImageHandler.cut = True
+
+    with pytest.raises(Exception):
+        gallery.dlimage(folder, pytest.url, *STUB_ARGS)
+
+    parts = os.listdir(os.path.join(folder, "p1"))
+    assert len(parts) == 1 and parts[0].endswith(PART_EXT)
+
+    ImageHandler.requested = list()
+    tans, nbytes = gallery.dlimage(folder, pytest.url, *STUB_ARGS)
+    fpath = os.path.join(folder, "p1", "p1.jpg")
+
+    assert tans is True
+    assert nbytes < len(STUB_IMAGE)
+    assert len(ImageHandler.requested) == 1
+    assert ImageHandler.requested[0][1] == STUB_ETAG
+    assert open(fpath, "rb").read() == STUB_IMAGE
+    assert os.listdir(os.path.join(folder, "p1")) == ["p1.jpg"]
+
+
+def test_save_stream_checksum(images, tmp_path):
+    """
+    the checksum of a resumed file covers the saved bytes and the new ones
+    """
+    fpath = str(tmp_path / "p1.jpg")
+    page = Page(pool=Pool())
+    page.get_stream(pytest.url)
+    part = page.name_part(fpath, len(STUB_IMAGE), STUB_ETAG)
+    page.close_stream()
+
+    with open(part, "wb") as file:
+        file.write(STUB_IMAGE[:STUB_CUT])
+
+    assert page.get_stream(pytest.url, part=part) == 206
+    assert page.save_stream(fpath) == len(STUB_IMAGE)
+    assert page.received == len(STUB_IMAGE) - STUB_CUT
+    assert page.checksum == hashlib.sha256(STUB_IMAGE).hexdigest()
+    assert not os.path.exists(part)
+
+
+def test_dlimage_unknown_length(images, tmp_path):
+    """
+    without a known length an existing file is not trusted, the image is
+    downloaded again
+    """
+    gallery, folder = new_gallery(tmp_path)
+    ImageHandler.chunked = True
+    fpath = os.path.join(folder, "p1", "p1.jpg")
+    with open(fpath, "wb") as file:
+        file.write(STUB_IMAGE[:STUB_CUT])
+
+    ans = gallery.dlimage(folder, pytest.url, *STUB_ARGS)
+
+    assert ans == (True, len(STUB_IMAGE))
+    assert open(fpath, "rb").read() == STUB_IMAGE
+
+
+def test_dlimage_not_modified(images, tmp_path):
+    """
+    in refresh mode an image with the same ETag answers 304 and the local
+    file stays, a missing file is downloaded again
+    """
+    vpath = str(tmp_path / "validators.json")
+    gallery, folder = new_gallery(tmp_path, validator={"fpath": vpath})
+    gallery.dlimage(folder, pytest.url, *STUB_ARGS)
+    gallery.wvalidator.save()
+
+    gallery, folder = new_gallery(tmp_path, validator={"fpath": vpath,
+                                                       "refresh": True})
+    fpath = os.path.join(folder, "p1", "p1.jpg")
+    ImageHandler.requested = list()
+
+    assert gallery.dlimage(folder, pytest.url, *STUB_ARGS) == (
+        NOT_MODIFIED, 0)
+    assert len(ImageHandler.requested) == 1
+    assert open(fpath, "rb").read() == STUB_IMAGE
+
+    os.remove(fpath)
+    ans = gallery.dlimage(folder, pytest.url, *STUB_ARGS)
+    assert ans == (True, len(STUB_IMAGE))
+    assert open(fpath, "rb").read() == STUB_IMAGE
+
+
+def test_dlpaints_concurrent(images, tmp_path):
+    """
+    the download workers save all the images at the same time, with at
+    most the connections per host of the gallery, and report the bytes
+    """
+    gallery, folder = new_gallery(tmp_path, 8, downloads={"perhost": 2})
+    ctrl = Controller(model=gallery, dlworkers=4)
+    urls = [pytest.url[:-1] + str(idx) for idx in range(1, 9)]
+    ctrl.getdata = lambda coln: urls
+    ImageHandler.pause = 0.05
+    reports = list()
+
+    def report(files, nbytes, seconds):
+        reports.append((files, nbytes))
+
+    ans = ctrl.dlpaints("DOWNLOAD_URL", folder, *STUB_ARGS, report=report)
+
+    assert ans == [True] * 8
+    assert ImageHandler.peak == 2
+    assert reports[-1] == (8, 8 * len(STUB_IMAGE))
+    for idx in range(1, 9):
+        fpath = os.path.join(folder, "p%d" % idx, "p%d.jpg" % idx)
+        assert open(fpath, "rb").read() == STUB_IMAGE
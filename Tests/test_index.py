@@ -0,0 +1,255 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# ___________________________________________
+# importing test framework and necesarry libraries
+# ___________________________________________
+import re
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from urllib.parse import urlsplit
+from urllib.parse import parse_qs
+import pytest
+
+# the repo root and App paths
+import config
+
+# ___________________________________________
+# importing costume scrapping module
+# ___________________________________________
+from App import Model
+from App.Model import Gallery
+from Lib.Recovery.Sitemap import Sitemap
+
+# ___________________________________________
+# asserting imports in the module
+# ___________________________________________
+assert pytest
+assert config
+
+"""
+tests of the gallery index discovery over plain HTTP against a local stub
+server with a paged collection listing and a sitemap index
+"""
+
+# elements in each listing page and number of pages with elements
+STUB_PAGE_SIZE = 20
+STUB_PAGES = 5
+
+# anchor of each element in the listing
+STUB_ELEMENT = """<a class="collection-art-object-wrapper"
+href="/en/collection/s%04d" title="Paint %d">paint</a>"""
+
+
+# sitemap index and its sitemap, with the image extension titles
+STUB_SITEMAPS = {
+    "/sitemap.xml": """<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+<sitemap><loc>{host}/works.xml</loc></sitemap>
+</sitemapindex>""",
+    "/works.xml": """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
+xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">
+<url><loc>https://x.nl/en/collection/s0001</loc>
+<lastmod>2021-01-01</lastmod>
+<image:image><image:loc>https://x.nl/s0001.jpg</image:loc>
+<image:title>Paint 1</image:title></image:image></url>
+<url><loc>https://x.nl/en/visit</loc></url>
+<url><loc>https://x.nl/en/collection/s0002</loc>
+<lastmod>2021-02-02</lastmod></url>
+</urlset>""",
+}
+
+
+class ListingHandler(BaseHTTPRequestHandler):
+    """
+    collection listing paged with the "page" query parameter, the pages
+    after the last one answer without elements
+    """
+    requested = list()
+    failing = dict()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        # sitemap index with one sitemap of works
+        if self.path in STUB_SITEMAPS:
+            host = "http://%s:%d" % self.server.server_address
+            body = STUB_SITEMAPS[self.path].replace("{host}", host)
+            body = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        query = parse_qs(urlsplit(self.path).query)
+        npage = int(query.get("page", ["1"])[0])
+        self.requested.append(npage)
+
+        # transient errors of the listing pages
+        if self.failing.get(npage, 0) > 0:
+            self.failing[npage] -= 1
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        elements = str()
+        if npage <= STUB_PAGES:
+            first = (npage - 1) * STUB_PAGE_SIZE
+            for i in range(first, first + STUB_PAGE_SIZE):
+                elements += STUB_ELEMENT % (i, i)
+
+        body = ("<html><body>" + elements +
+                "<a href='/en/visit'>visit</a></body></html>").encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def listing():
+    """
+    url->str: URL of the collection listing in the local stub server
+    """
+    ListingHandler.requested = list()
+    ListingHandler.failing = dict()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ListingHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    pytest.url = "http://127.0.0.1:%d/en/collection?q=&Type=painting" % (
+        server.server_port)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_scrapidx_pages(listing):
+    """
+    the http engine recovers all the elements of the listing in order
+    """
+    gallery = Gallery(rate={"rate": 0},
+                      index={"engine": "http", "batch": 3})
+    attrs = {
+        "class": "collection-art-object-wrapper",
+        "href": re.compile("^/en/collection/"),
+    }
+
+    gsoup = gallery.scrapidx(pytest.url, 0.0, "a", attrs)
+    ids = gallery.get_idxid(gsoup, "href", "/en/collection/")
+
+    assert len(ids) == STUB_PAGE_SIZE * STUB_PAGES
+    assert ids[0] == "s0000"
+    assert ids[-1] == "s%04d" % (STUB_PAGE_SIZE * STUB_PAGES - 1)
+    # the last batch includes the first empty page and stops there
+    assert max(ListingHandler.requested) <= STUB_PAGES + 3
+
+
+def test_scrapidx_pages_errors(listing, monkeypatch):
+    """
+    a listing page that fails is requested again, the index stops with an
+    error if it keeps failing instead of ending there
+    """
+    monkeypatch.setattr(Model, "DEFAULT_INDEX_BACKOFF", 0.0)
+    gallery = Gallery(rate={"rate": 0},
+                      pool={"retries": 0},
+                      index={"engine": "http", "batch": 3, "retries": 2})
+    attrs = {
+        "class": "collection-art-object-wrapper",
+        "href": re.compile("^/en/collection/"),
+    }
+
+    ListingHandler.failing = {2: 2}
+    gsoup = gallery.scrapidx(pytest.url, 0.0, "a", attrs)
+    ids = gallery.get_idxid(gsoup, "href", "/en/collection/")
+    assert len(ids) == STUB_PAGE_SIZE * STUB_PAGES
+
+    ListingHandler.failing = {2: 3}
+    with pytest.raises(Exception):
+        gallery.scrapidx(pytest.url, 0.0, "a", attrs)
+    ListingHandler.failing = dict()
+
+
+def test_get_idxcols(listing):
+    """
+    one walk over the index answers the same columns of the three passes
+    """
+    gallery = Gallery(rate={"rate": 0},
+                      index={"engine": "http", "batch": 3})
+    attrs = {
+        "class": "collection-art-object-wrapper",
+        "href": re.compile("^/en/collection/"),
+    }
+    root = "http://127.0.0.1:%d" % listing.server_port
+
+    gsoup = gallery.scrapidx(pytest.url, 0.0, "a", attrs)
+    ids, titles, urls = gallery.get_idxcols(gsoup, "href", "/en/collection/",
+                                            "title", root, "href")
+
+    assert ids == gallery.get_idxid(gsoup, "href", "/en/collection/")
+    assert titles == gallery.get_idxtitle(gsoup, "title")
+    assert urls == gallery.get_idxurl(gsoup, root, "href")
+    assert len(ids) == len(titles) == len(urls) == STUB_PAGE_SIZE * STUB_PAGES
+
+
+def test_get_pageurl():
+    """
+    the page number replaces the one in the gallery URL
+    """
+    gallery = Gallery(index={"param": "page"})
+    purl = gallery.get_pageurl("https://x.nl/en/collection?q=&page=9", 2)
+    assert purl == "https://x.nl/en/collection?q=&page=2"
+
+
+def test_scrapidx_sitemap(listing, tmp_path):
+    """
+    the sitemap engine recovers the collection works with their lastmod
+    """
+    root = "http://127.0.0.1:%d" % listing.server_port
+    fpath = str(tmp_path / "sitemap.json")
+    gallery = Gallery(rate={"rate": 0},
+                      sitemap={"url": root + "/sitemap.xml", "fpath": fpath})
+
+    ids, titles, urls = gallery.scrapidx_sitemap(root, "/en/collection/")
+
+    assert ids == ["s0001", "s0002"]
+    assert titles == ["Paint 1", "untitled"]
+    assert urls[0] == root + "/en/collection/s0001"
+
+    # only the works the stage scraped are recorded
+    gallery.wsitemap.use("scrap_paintlinks")
+    gallery.wsitemap.update(root + "/en/collection/s0002")
+    gallery.wsitemap.save()
+
+    # the next incremental scrap of the stage skips the unchanged works
+    sitemap = Sitemap(url=root + "/sitemap.xml", fpath=fpath,
+                      incremental=True)
+    sitemap.use("scrap_paintlinks")
+    assert sitemap.unchanged(root + "/en/collection/s0002") is True
+    assert sitemap.unchanged(root + "/en/collection/s0001") is False
+    assert sitemap.unchanged(root + "/en/collection/s0003") is False
+
+    # the other stages request it again
+    sitemap.use("scrap_objdata")
+    assert sitemap.unchanged(root + "/en/collection/s0002") is False
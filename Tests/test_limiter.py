@@ -0,0 +1,142 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# ___________________________________________
+# importing test framework and necesarry libraries
+# ___________________________________________
+import time
+import asyncio
+import threading
+import pytest
+
+# the repo root and App paths
+import config
+
+# ___________________________________________
+# importing costume scrapping module
+# ___________________________________________
+from Lib.Recovery.Limiter import Limiter
+
+# ___________________________________________
+# asserting imports in the module
+# ___________________________________________
+assert pytest
+assert config
+
+"""
+tests of the token-bucket rate limiter of the hosts, without server
+"""
+
+# two hosts with their own buckets
+HOST_A = "https://a.nl/en/collection/s0001"
+HOST_B = "https://b.nl/en/collection/s0001"
+
+
+def test_limiter_burst():
+    """
+    a new host allows its burst at once, the next requests are reserved
+    one after the other at the limiter rate
+    """
+    limiter = Limiter(rate=10.0, burst=3)
+
+    delays = [limiter.reserve(HOST_A) for idx in range(5)]
+    assert delays[:3] == [0.0, 0.0, 0.0]
+    assert delays[3] == pytest.approx(0.1, abs=0.01)
+    assert delays[4] == pytest.approx(0.2, abs=0.01)
+
+    # the other host has its own full bucket
+    assert limiter.reserve(HOST_B) == 0.0
+
+
+def test_limiter_refill():
+    """
+    the bucket refills with time up to the burst
+    """
+    limiter = Limiter(rate=20.0, burst=2)
+    limiter.reserve(HOST_A, 2)
+    assert limiter.reserve(HOST_A) > 0.0
+
+    time.sleep(0.3)
+    assert limiter.reserve(HOST_A) == 0.0
+    assert limiter.reserve(HOST_A) == 0.0
+    assert limiter.reserve(HOST_A) > 0.0
+
+
+def test_limiter_take():
+    """
+    take() only answers the tokens already in the bucket, it does not
+    borrow them from the future as reserve()
+    """
+    limiter = Limiter(rate=10.0, burst=1)
+    assert limiter.take(HOST_A) is True
+    assert limiter.take(HOST_A) is False
+    assert limiter.reserve(HOST_A) == pytest.approx(0.1, abs=0.01)
+
+    # the failed take() did not add a reservation
+    limiter = Limiter(rate=10.0, burst=1)
+    limiter.take(HOST_A)
+    limiter.take(HOST_A)
+    assert limiter.reserve(HOST_A) == pytest.approx(0.1, abs=0.01)
+
+
+def test_limiter_unlimited():
+    """
+    a rate of 0 never waits
+    """
+    limiter = Limiter(rate=0)
+    assert all(limiter.reserve(HOST_A) == 0.0 for idx in range(100))
+    assert limiter.take(HOST_A, 1000) is True
+
+
+def test_limiter_wait_threads():
+    """
+    the threads of the workers share the bucket of the host, together
+    they go at the limiter rate
+    """
+    limiter = Limiter(rate=20.0, burst=1)
+    start = time.monotonic()
+
+    def worker():
+        for idx in range(3):
+            limiter.wait(HOST_A)
+
+    threads = [threading.Thread(target=worker) for idx in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 12 requests, the first one with the burst and 11 at 20 per second
+    assert time.monotonic() - start >= 11 / 20.0 - 0.02
+
+
+def test_limiter_await_token():
+    """
+    the asyncio tasks wait for the host without blocking the event loop
+    """
+    limiter = Limiter(rate=20.0, burst=1)
+
+    async def main():
+        start = time.monotonic()
+        await asyncio.gather(*[limiter.await_token(HOST_A)
+                               for idx in range(5)])
+        return time.monotonic() - start
+
+    assert asyncio.run(main()) >= 4 / 20.0 - 0.02
@@ -0,0 +1,318 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# ___________________________________________
+# importing test framework and necesarry libraries
+# ___________________________________________
+import time
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+import pytest
+
+# the repo root and App paths
+import config
+
+# ___________________________________________
+# importing costume scrapping module
+# ___________________________________________
+from Lib.Recovery.Pool import Pool
+from Lib.Recovery.Content import Page
+from Lib.Recovery.Deadline import Deadline
+from Lib.Recovery.Throttle import Throttle
+from Lib.Recovery.Limiter import Limiter
+from Lib.Recovery.AsyncContent import AsyncPool
+
+# ___________________________________________
+# asserting imports in the module
+# ___________________________________________
+assert pytest
+assert config
+
+"""
+tests of the shared connection pool, its deadlines and the hedged requests
+against a local stub server with slow and stalled answers
+"""
+
+# latencies of the fast answers before the hedging starts
+STUB_LATENCY = 0.01
+STUB_SAMPLES = 20
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """
+    answers each request after the seconds of its position in the "plan"
+    list, the requests after the plan answer at once. the "drip" answers
+    send their body in slow chunks
+    """
+    plan = list()
+    drip = set()
+    requested = list()
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        with self.lock:
+            nreq = len(self.requested)
+            self.requested.append(self.path)
+        wait = self.plan[nreq] if nreq < len(self.plan) else 0.0
+
+        # answering the headers soon and the body in slow chunks
+        if nreq in self.drip:
+            body = b"<html>" + b"x" * 30 + b"</html>"
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            for idx in range(0, len(body), 10):
+                time.sleep(wait)
+                self.wfile.write(body[idx:idx + 10])
+                self.wfile.flush()
+            return
+
+        time.sleep(wait)
+        body = b"<html>ok</html>"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def slow():
+    """
+    url->str: URL of the local stub server
+    """
+    SlowHandler.plan = list()
+    SlowHandler.drip = set()
+    SlowHandler.requested = list()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    pytest.url = "http://127.0.0.1:%d/page" % server.server_port
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """
+    answers the pages over HTTP/1.1 and counts the accepted connections
+    """
+    protocol_version = "HTTP/1.1"
+    connections = 0
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        KeepAliveHandler.connections += 1
+        super().setup()
+
+    def do_GET(self):
+        body = b"<html><p>ok</p></html>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def keepalive():
+    """
+    url->str: URL of the local keep-alive stub server
+    """
+    KeepAliveHandler.connections = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    pytest.url = "http://127.0.0.1:%d/page" % server.server_port
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def hedging_deadline(**kwargs):
+    """
+    deadline with hedging and enough fast latencies to start it
+    """
+    deadline = Deadline(hedge=True, **kwargs)
+    for idx in range(STUB_SAMPLES):
+        deadline.record(STUB_LATENCY)
+    return deadline
+
+
+def test_deadline_timeout(slow):
+    """
+    a stalled request answers the synthetic 504 and it is counted
+    """
+    SlowHandler.plan = [2.0]
+    deadline = Deadline(connect=1.0, read=0.3, total=1.0)
+    pool = Pool(deadline=deadline, retries=0)
+
+    start = time.monotonic()
+    response = pool.get(pytest.url)
+
+    assert response.status_code == 504
+    assert time.monotonic() - start < 1.5
+    assert deadline.stats() == {"hedged": 0, "timeouts": 1}
+
+
+def test_deadline_total(slow):
+    """
+    a body that keeps coming past the total deadline answers 504
+    """
+    SlowHandler.plan = [0.2]
+    SlowHandler.drip = {0}
+    deadline = Deadline(read=1.0, total=0.3)
+    pool = Pool(deadline=deadline, retries=0)
+
+    assert pool.get(pytest.url).status_code == 504
+    assert deadline.stats().get("timeouts") == 1
+
+
+def test_hedged_request(slow):
+    """
+    a request pending past the latency quantile gets a duplicate and the
+    fast one answers
+    """
+    SlowHandler.plan = [1.0]
+    deadline = hedging_deadline()
+    pool = Pool(deadline=deadline, retries=0)
+
+    start = time.monotonic()
+    response = pool.get(pytest.url)
+
+    assert response.status_code == 200
+    assert time.monotonic() - start < 0.8
+    assert deadline.stats().get("hedged") == 1
+    assert len(SlowHandler.requested) == 2
+    pool.close()
+
+
+def test_hedged_prefers_answer(slow):
+    """
+    the 504 of the request that finishes first loses against the answer
+    of its duplicate
+    """
+    SlowHandler.plan = [3.0, 0.2]
+    SlowHandler.drip = {1}
+    deadline = hedging_deadline(read=0.5, total=5.0)
+    pool = Pool(deadline=deadline, retries=0)
+
+    response = pool.get(pytest.url)
+
+    assert response.status_code == 200
+    assert response.content.startswith(b"<html>x")
+    assert deadline.stats() == {"hedged": 1, "timeouts": 1}
+    pool.close()
+
+
+def test_hedged_throttle(slow):
+    """
+    without a free throttle slot the slow request gets no duplicate
+    """
+    SlowHandler.plan = [0.5]
+    deadline = hedging_deadline()
+    throttle = Throttle(start=1, minimum=1, maximum=1)
+    pool = Pool(deadline=deadline, throttle=throttle, retries=0)
+
+    assert pool.get(pytest.url).status_code == 200
+    assert deadline.stats().get("hedged") == 0
+    assert len(SlowHandler.requested) == 1
+    assert throttle.inflight == 0
+
+    # with a free slot the duplicate goes and frees it at the end
+    throttle.maximum = 2
+    throttle.limit = 2
+    SlowHandler.requested = list()
+    SlowHandler.plan = [0.5]
+    assert pool.get(pytest.url).status_code == 200
+    assert deadline.stats().get("hedged") == 1
+    time.sleep(0.6)
+    assert throttle.inflight == 0
+    pool.close()
+
+
+def test_hedged_limiter(slow):
+    """
+    the duplicate needs a token of the host, it never borrows one
+    """
+    SlowHandler.plan = [0.5]
+    deadline = hedging_deadline()
+    pool = Pool(deadline=deadline, limiter=Limiter(rate=0.1), retries=0)
+
+    assert pool.get(pytest.url).status_code == 200
+    assert deadline.stats().get("hedged") == 0
+    assert len(SlowHandler.requested) == 1
+    pool.close()
+
+
+def test_async_hedged_request(slow):
+    """
+    the asyncio pool hedges the slow request and the 504 of a stalled one
+    has no response
+    """
+    SlowHandler.plan = [1.0]
+    deadline = hedging_deadline(read=0.5, total=1.0)
+
+    async def scrap():
+        pool = AsyncPool(deadline=deadline)
+        try:
+            hedged = await pool.get(pytest.url)
+            SlowHandler.plan = SlowHandler.plan + [0.0, 2.0, 2.0]
+            deadline.hedge = False
+            stalled = await pool.get(pytest.url)
+        finally:
+            await pool.close()
+        return hedged, stalled
+
+    hedged, stalled = asyncio.run(scrap())
+
+    assert hedged[0].status == 200
+    assert stalled[0] is None
+    assert deadline.stats() == {"hedged": 1, "timeouts": 1}
+
+
+def test_pool_keepalive(keepalive):
+    """
+    the pages of a shared pool reuse one connection, without the pool or
+    without keep-alive each page opens its own
+    """
+    pool = Pool()
+    for idx in range(10):
+        page = Page(pool=pool)
+        assert page.get_body(pytest.url) == 200
+        assert page.sbody.find("p").text == "ok"
+    assert KeepAliveHandler.connections == 1
+
+    KeepAliveHandler.connections = 0
+    pool = Pool(keepalive=False)
+    for idx in range(10):
+        assert Page(pool=pool).get_body(pytest.url) == 200
+    assert KeepAliveHandler.connections == 10
+
+    KeepAliveHandler.connections = 0
+    for idx in range(10):
+        assert Page().get_body(pytest.url) == 200
+    assert KeepAliveHandler.connections == 10
@@ -0,0 +1,251 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# ___________________________________________
+# importing test framework and necesarry libraries
+# ___________________________________________
+import json
+import time
+import threading
+import pytest
+
+# the repo root and App paths
+import config
+
+# ___________________________________________
+# importing costume scrapping module
+# ___________________________________________
+from App.Model import Gallery
+from Lib.Recovery.Browser import BrowserPool
+from Lib.Recovery.Content import Page
+from Lib.Recovery.Content import COUNT_SCRIPT
+from Lib.Recovery.Content import HEIGHT_SCRIPT
+from Lib.Recovery.Content import HARVEST_SCRIPT
+
+# ___________________________________________
+# asserting imports in the module
+# ___________________________________________
+assert pytest
+assert config
+
+"""
+tests of the infinite scroll of the gallery index with a fake browser that
+renders more elements some time after each scroll step
+"""
+
+# URL of the gallery index and the tags of its elements
+STUB_URL = "https://x.nl/en/collection?q=&Type=painting"
+ELEM_DIV = "a"
+ELEM_ATTRS = {"class": "collection-art-object-wrapper"}
+ELEM_SELECTOR = "a.collection-art-object-wrapper"
+
+
+class FakeDriver():
+    """
+    selenium driver of a gallery with "total" elements, each scroll step
+    renders "step" more of them after "lag" seconds, without total the
+    gallery never ends
+    """
+    capabilities = dict()
+
+    def __init__(self, total=None, step=10, lag=0.02, failing=False):
+        self.total = total if total is not None else float("inf")
+        self.step = step
+        self.lag = lag
+        self.failing = failing
+        self.rendered = min(self.total, step)
+        self.harvested = 0
+        self.due = None
+        self.scrolls = 0
+        self.quits = 0
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def get(self, url):
+        self.url = url
+
+    def render(self):
+        if self.due is not None and time.monotonic() >= self.due:
+            self.rendered = min(self.total, self.rendered + self.step)
+            self.due = None
+
+    def execute_script(self, script, *args):
+        self.render()
+
+        if script == COUNT_SCRIPT:
+            return self.rendered
+
+        if script == HEIGHT_SCRIPT:
+            return self.rendered * 100
+
+        if script == HARVEST_SCRIPT:
+            found = [{"href": "/en/collection/s%04d" % idx,
+                      "title": "Paint %d" % idx}
+                     for idx in range(self.harvested, self.rendered)]
+            self.harvested = self.rendered
+            return json.dumps(found)
+
+        # the gallery fails in the middle of the scroll
+        if self.failing and self.scrolls >= 2:
+            raise RuntimeError("browser crashed")
+
+        self.scrolls += 1
+        if self.rendered < self.total:
+            self.due = time.monotonic() + self.lag
+
+    def close(self):
+        self.quits += 1
+
+    def quit(self):
+        self.quits += 1
+
+
+def new_gallery(monkeypatch, drivers, **kwargs):
+    """
+    gallery with a pool of one fake browser and a fast growth poll
+    """
+    def new_driver(pool):
+        driver = FakeDriver(**kwargs)
+        pool.uses[id(driver)] = 0
+        pool.baseline[id(driver)] = None
+        drivers.append(driver)
+        return driver
+
+    monkeypatch.setattr(BrowserPool, "new_driver", new_driver)
+    gallery = Gallery(browsers={"size": 1},
+                      scroll={"poll": 0.005, "maxscroll": 10})
+    return gallery
+
+
+def test_scroll_growth():
+    """
+    each step starts as soon as the gallery grows, the scroll ends when it
+    does not grow for stime seconds
+    """
+    page = Page(poll=0.005)
+    driver = FakeDriver(total=100, step=10, lag=0.02)
+
+    start = time.monotonic()
+    ans = page.scroll_collection(driver, 0.5, selector=ELEM_SELECTOR)
+    elapsed = time.monotonic() - start
+
+    assert len(ans) == 100
+    assert page.scroll_stats["items"] == 100
+    assert page.scroll_stats["rounds"] == 10
+    # 9 growths of 0.02 seconds and the last wait, not 10 full waits
+    assert 0.5 <= elapsed < 0.5 + 9 * 0.02 + 1.0
+
+
+def test_scroll_height():
+    """
+    without selector the growth is the height of the page
+    """
+    page = Page(poll=0.005)
+    driver = FakeDriver(total=30, step=10, lag=0.02)
+
+    assert page.scroll_collection(driver, 0.1) == list()
+    assert page.scroll_stats["rounds"] == 3
+    assert driver.rendered == 30
+
+
+def test_scroll_max_time():
+    """
+    a gallery that never ends stops after maxscroll seconds
+    """
+    page = Page(poll=0.005, maxscroll=0.3)
+    driver = FakeDriver(step=10, lag=0.01)
+
+    start = time.monotonic()
+    ans = page.scroll_collection(driver, 1.0, selector=ELEM_SELECTOR)
+
+    assert time.monotonic() - start < 1.0
+    assert len(ans) == driver.rendered > 10
+
+
+def test_scroll_stop():
+    """
+    the stop ends the scroll at the next growth check
+    """
+    page = Page(poll=0.005)
+    driver = FakeDriver(step=10, lag=0.01)
+    stop = threading.Event()
+    stop.set()
+
+    ans = page.scroll_collection(driver, 1.0, selector=ELEM_SELECTOR,
+                                 stop=stop)
+    assert len(ans) == 10
+    assert driver.scrolls == 0
+
+
+def test_iterindex_harvest(monkeypatch):
+    """
+    the elements come out while the gallery scrolls, the working page has
+    the whole index at the end and the browser goes back to the pool
+    """
+    drivers = list()
+    gallery = new_gallery(monkeypatch, drivers, total=50, step=10)
+
+    items = list(gallery.iterindex(STUB_URL, 0.2, ELEM_DIV, ELEM_ATTRS))
+
+    assert [item["href"] for item in items] == [
+        "/en/collection/s%04d" % idx for idx in range(50)]
+    assert len(gallery.wpage.findin(ELEM_DIV, attributes=ELEM_ATTRS)) == 50
+    assert gallery.wbrowsers.idle == drivers
+
+
+def test_iterindex_stop_early(monkeypatch):
+    """
+    a consumer that stops early stops the scroll, its thread ends and the
+    browser goes back to the pool
+    """
+    drivers = list()
+    gallery = new_gallery(monkeypatch, drivers, step=10, lag=0.01)
+    before = threading.active_count()
+
+    items = gallery.iterindex(STUB_URL, 5.0, ELEM_DIV, ELEM_ATTRS)
+    first = [next(items) for idx in range(15)]
+    start = time.monotonic()
+    items.close()
+
+    assert time.monotonic() - start < 1.0
+    assert threading.active_count() == before
+    assert first[-1]["href"] == "/en/collection/s0014"
+    assert gallery.wbrowsers.idle == drivers
+
+
+@pytest.mark.filterwarnings(
+    "ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_iterindex_error(monkeypatch):
+    """
+    an error of the scroll is raised to the consumer, the broken browser
+    is closed instead of going back to the pool
+    """
+    drivers = list()
+    gallery = new_gallery(monkeypatch, drivers, step=10, failing=True)
+    items = list()
+
+    with pytest.raises(Exception):
+        for item in gallery.iterindex(STUB_URL, 1.0, ELEM_DIV, ELEM_ATTRS):
+            items.append(item)
+
+    assert len(items) >= 10
+    assert gallery.wbrowsers.idle == list()
+    assert drivers[0].quits == 1
@@ -0,0 +1,131 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# ___________________________________________
+# importing test framework and necesarry libraries
+# ___________________________________________
+import time
+import asyncio
+import pytest
+
+# the repo root and App paths
+import config
+
+# ___________________________________________
+# importing costume scrapping module
+# ___________________________________________
+from Lib.Recovery import Throttle as ThrottleModule
+from Lib.Recovery.Throttle import Throttle
+from Lib.Recovery.Throttle import retry_seconds
+
+# ___________________________________________
+# asserting imports in the module
+# ___________________________________________
+assert pytest
+assert config
+
+"""
+tests of the AIMD concurrency control of the requests, without server
+"""
+
+
+def test_throttle_increase():
+    """
+    each window of good answers adds about one in-flight request
+    """
+    throttle = Throttle(start=2, maximum=4)
+
+    for idx in range(4):
+        throttle.acquire()
+        throttle.release(200, 0.1)
+
+    assert 3.0 <= throttle.limit < 4.0
+    assert throttle.inflight == 0
+
+
+def test_throttle_overload_burst():
+    """
+    a burst of 429 answers in one round trip halves the limit once
+    """
+    throttle = Throttle(start=16, maximum=16)
+    throttle.release(200, 0.5)
+
+    for idx in range(16):
+        throttle.release(429, None)
+
+    assert throttle.limit == 8.0
+
+    # the next round trip can halve it again
+    throttle.last_cut = time.monotonic() - 1.0
+    throttle.release(429, None)
+    assert throttle.limit == 4.0
+
+
+def test_throttle_retry_after():
+    """
+    the Retry-After of an overload pauses all the requests
+    """
+    throttle = Throttle(start=4)
+    throttle.release(503, 0.1, retry="2")
+
+    assert throttle.try_acquire() > 1.0
+    assert retry_seconds("2") == 2.0
+    assert retry_seconds("not a date") == 0.0
+
+
+def test_throttle_baseline(monkeypatch):
+    """
+    the best latency only counts while it is recent, a server that stays
+    slower stops being slow for the throttle
+    """
+    monkeypatch.setattr(ThrottleModule, "DEFAULT_BASELINE_WINDOW", 10)
+    throttle = Throttle(start=4, maximum=16, tolerance=2.0)
+    throttle.release(200, 0.01)
+
+    # much slower answers, the limit goes down
+    for idx in range(5):
+        throttle.last_cut = 0.0
+        throttle.release(200, 1.0)
+    assert throttle.limit == throttle.minimum
+
+    # the old fast answer leaves the window, the limit grows again
+    for idx in range(40):
+        throttle.release(200, 1.0)
+    assert throttle.limit > throttle.minimum
+
+
+def test_throttle_async():
+    """
+    the asyncio acquire waits for a slot without blocking the event loop
+    """
+    throttle = Throttle(start=1, maximum=1)
+
+    async def scrap():
+        await throttle.aacquire()
+        waiter = asyncio.ensure_future(throttle.aacquire())
+        await asyncio.sleep(0.1)
+        blocked = not waiter.done()
+        throttle.release(200, 0.01)
+        await asyncio.wait_for(waiter, timeout=1.0)
+        return blocked
+
+    assert asyncio.run(scrap()) is True
+    assert throttle.inflight == 1
+    assert throttle.acquire_now() is False
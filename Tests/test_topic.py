@@ -0,0 +1,401 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# ___________________________________________
+# importing test framework and necesarry libraries
+# ___________________________________________
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+import pytest
+
+# the repo root and App paths, the App Conf module with configGlobal()
+import config
+import Conf
+
+# ___________________________________________
+# importing costume scrapping module
+# ___________________________________________
+from App.Model import Gallery
+from App.Controller import Controller
+from Lib.Recovery.Parser import new_soup
+from Lib.Recovery.Parser import new_strainer
+from Lib.Recovery.Parser import get_dialect
+from Lib.Recovery import Parser
+from Lib.Recovery.Tokenizer import Tokenizer
+from Lib.Recovery.Cleaner import TextCache
+from Lib.Recovery.Cleaner import Topic
+from Lib.Recovery.Cleaner import literal
+
+# ___________________________________________
+# asserting imports in the module
+# ___________________________________________
+assert pytest
+assert config
+assert Conf
+
+"""
+tests of the extraction plans compiled from html-tags.ini, they must clean
+the collection pages the same as the hand written clean_*() functions
+"""
+
+# root URL of the collection links
+ROOT_URL = "https://www.vangoghmuseum.nl"
+
+# collection page with all the scraped sections and similar related works
+STUB_PAGE = """<html><body>
+<a class="btn-icon art-object-header-bar-button"
+href="/asset/download/s0004V1962r">Download</a>
+<section class="art-object-page-content-title">
+<h1 class="art-object-page-content-title">Head of a Woman</h1>
+<p class="art-object-page-content-creator-info">Vincent van Gogh</p>
+<p class="art-object-page-content-details">oil on canvas</p>
+</section>
+<section class="art-object-page-content-section">
+<p>In Nuenen <a href="/en/stories/x">Van Gogh</a> painted heads.</p>
+</section>
+<section class="artobject-page-collection-links"><ul>
+<li><a href="/en/collection?Date=1885">1885</a></li>
+<li><a href="/en/collection?Place=Nuenen">Nuenen</a></li>
+</ul></section>
+<dl class="definition-list"><dt>F-number</dt><dd>F0388r</dd>
+<dt>JH-number</dt><dd>JH0782</dd></dl>
+<div class="teaser-row content-row grid-row">
+<article><a href="/en/collection/s0005"><span>Peasant</span></a></article>
+<article><a href="/en/collection/s0006"><span>Peasant</span></a></article>
+</div>
+</body></html>"""
+
+
+class PaintHandler(BaseHTTPRequestHandler):
+    """
+    collection page of every work with the stub page
+    """
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        body = STUB_PAGE.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def paints():
+    """
+    url->str: URL of the collection pages in the local stub server
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PaintHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    pytest.url = "http://127.0.0.1:%d/en/collection/" % server.server_port
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(scope="module")
+def plans():
+    """
+    gallery with the plans of the repo html-tags.ini
+    """
+    path = os.path.join(os.path.dirname(__file__), "..", "Config")
+    cfg = Conf.configGlobal(path, "html-tags.ini")
+    pytest.cfg = cfg
+    return Gallery(tags=cfg)
+
+
+def get_soup(cfg, column, multiple, dialect="html.parser"):
+    """
+    finds the sections of the column in the stub page
+    """
+    soup = new_soup(STUB_PAGE, dialect)
+    div = cfg.get(column, "divs")
+    attrs = literal(cfg.get(column, "attrs"))
+    if multiple is True:
+        return soup.findAll(div, attrs=attrs)
+    return soup.find(div, attrs=attrs)
+
+
+def test_plan_columns(plans):
+    """
+    the page columns of html-tags.ini have their plan
+    """
+    cols = set(plans.get_plans().keys())
+    assert cols == {"DESCRIPTION", "DOWNLOAD_URL", "SEARCH_TAGS",
+                    "OBJ_DATA", "RELATED_WORKS"}
+
+
+def test_plans_clean(plans):
+    """
+    the plans answer the same data of the clean_*() functions
+    """
+    cfg = pytest.cfg
+
+    soup = get_soup(cfg, "DESCRIPTION", True)
+    expected = plans.clean_description(
+        soup, ["h1", "p", "a"], ["class", "art-object-page-content-", "href"])
+    assert plans.clean_plan("DESCRIPTION", soup, ROOT_URL) == expected
+
+    soup = get_soup(cfg, "SEARCH_TAGS", True)
+    expected = plans.clean_searchtags(ROOT_URL, soup, "a", "href")
+    assert plans.clean_plan("SEARCH_TAGS", soup, ROOT_URL) == expected
+
+    soup = get_soup(cfg, "OBJ_DATA", False)
+    expected = plans.clean_objdata(soup, ["dt", "dd"])
+    assert plans.clean_plan("OBJ_DATA", soup, ROOT_URL) == expected
+
+    soup = get_soup(cfg, "DOWNLOAD_URL", False)
+    expected = plans.clean_dlurl(soup, ROOT_URL, "href")
+    assert plans.clean_plan("DOWNLOAD_URL", soup, ROOT_URL) == expected
+
+    # the similar related works get an alternate key
+    soup = get_soup(cfg, "RELATED_WORKS", True)
+    expected = plans.clean_relwork(ROOT_URL, soup, "article",
+                                   ["span", "a", "href"])
+    ans = plans.clean_plan("RELATED_WORKS", soup, ROOT_URL)
+    assert ans == expected
+    assert list(ans.keys()) == ["Peasant", "Peasant 1"]
+
+
+def test_strainer_sections(plans):
+    """
+    the strained page parses the same sections of the whole page and skips
+    the tags with the name of a section and the attributes of another one
+    """
+    cfg = pytest.cfg
+    cols = ("DOWNLOAD_URL", "DESCRIPTION", "SEARCH_TAGS", "OBJ_DATA",
+            "RELATED_WORKS")
+    targets = [(cfg.get(col, "divs"), literal(cfg.get(col, "attrs")))
+               for col in cols]
+    decoy = '<div class="definition-list"><dt>Decoy</dt></div>'
+    body = STUB_PAGE.replace("</body>", decoy + "</body>")
+
+    for dialect in ("html.parser", "lxml"):
+        full = new_soup(body, dialect)
+        strained = new_soup(body, dialect, new_strainer(targets))
+        for div, attrs in targets:
+            assert strained.findAll(div, attrs=attrs) == full.findAll(
+                div, attrs=attrs)
+        assert "Decoy" in full.get_text()
+        assert "Decoy" not in strained.get_text()
+
+
+def test_dialect_fallback(monkeypatch):
+    """
+    the configured parser backend is used if installed, the pure python
+    parser replaces it otherwise
+    """
+    monkeypatch.setattr(Parser, "html5_parser", None)
+    assert get_dialect("lxml") == "lxml"
+    assert get_dialect("html.parser") == "html.parser"
+    assert get_dialect("html5-parser") == "html.parser"
+    assert get_dialect("nosuch-parser") == "html.parser"
+    assert get_dialect(None) == "html.parser"
+
+
+def test_dialect_plans(plans):
+    """
+    the plans clean the same data with the pure python and lxml backends
+    """
+    cfg = pytest.cfg
+    for col in plans.get_plans().keys():
+        multiple = col in ("DESCRIPTION", "SEARCH_TAGS", "RELATED_WORKS")
+        expected = plans.clean_plan(col, get_soup(cfg, col, multiple),
+                                    ROOT_URL)
+        soup = get_soup(cfg, col, multiple, "lxml")
+        assert plans.clean_plan(col, soup, ROOT_URL) == expected
+        assert expected
+
+
+def test_literal():
+    """
+    the config literals are read without eval(), the attribute patterns
+    are compiled and any other call is refused
+    """
+    ans = literal("""{
+    "class": re.compile("art-object-page-content-"),
+    "id": ["a", 1, None, True, (2, 3)],
+    }""")
+    assert ans["class"].pattern == "art-object-page-content-"
+    assert ans["id"] == ["a", 1, None, True, (2, 3)]
+    assert literal("False") is False
+
+    with pytest.raises(Exception):
+        literal("__import__('os').getcwd()")
+    with pytest.raises(Exception):
+        literal("re.compile('a', flags=2)")
+
+
+def test_plan_selectors():
+    """
+    the fields find their tags with compiled CSS selectors, a tag name or
+    any selector of a new column
+    """
+    cfg = Conf.configparser.ConfigParser()
+    cfg.read_string("""[LINKS]
+divs = section
+attrs = {"class": "artobject-page-collection-links"}
+multiple = False
+fields = [{"find": "li > a[href*=Place]",
+           "key": {"text": "string"},
+           "value": {"attr": "href", "join": True}}]
+""")
+    topic = Topic(tags=cfg)
+    soup = new_soup(STUB_PAGE).find("section", attrs=topic.plans["LINKS"][
+        "attrs"])
+    ans = topic.extract("LINKS", soup, ROOT_URL)
+    assert ans == {"Nuenen": ROOT_URL + "/en/collection?Place=Nuenen"}
+
+
+def test_scrap_stages_plans(plans, paints):
+    """
+    the scrap_*() stages clean the pages with the plans, as the
+    scrap_collection() stage and the hand written functions
+    """
+    cfg = pytest.cfg
+    gallery = Gallery(tags=cfg, rate={"rate": 0})
+    ctrl = Controller(model=gallery, workers=2)
+    urls = [pytest.url + "s0001", pytest.url + "s0002"]
+    ctrl.getdata = lambda coln: urls
+
+    def opts(column):
+        return (cfg.get(column, "divs"), literal(cfg.get(column, "attrs")))
+
+    soup = get_soup(cfg, "OBJ_DATA", False)
+    expected = ctrl.to_json(plans.clean_objdata(soup, ["dt", "dd"]))
+    ans = ctrl.scrap_objdata("ID", *opts("OBJ_DATA"), ["dt", "dd"],
+                             multiple=False)
+    assert ans == [expected, expected]
+
+    soup = get_soup(cfg, "SEARCH_TAGS", True)
+    expected = ctrl.to_json(plans.clean_searchtags(ROOT_URL, soup, "a",
+                                                   "href"))
+    ans = ctrl.scrap_searchtags("ID", ROOT_URL, *opts("SEARCH_TAGS"), "a",
+                                "href", multiple=True)
+    assert ans == [expected, expected]
+
+    soup = get_soup(cfg, "RELATED_WORKS", True)
+    expected = ctrl.to_json(plans.clean_relwork(ROOT_URL, soup, "article",
+                                                ["span", "a", "href"]))
+    ans = ctrl.scrap_relwork("ID", ROOT_URL, *opts("RELATED_WORKS"),
+                             "article", ["span", "a", "href"], multiple=True)
+    assert ans == [expected, expected]
+
+    # the hand written functions are not used with a plan
+    gallery.clean_description = None
+    soup = get_soup(cfg, "DESCRIPTION", True)
+    expected = ctrl.to_json(plans.clean_plan("DESCRIPTION", soup, None))
+    ans = ctrl.scrap_descriptions("ID", *opts("DESCRIPTION"),
+                                  ["h1", "p", "a"],
+                                  ["class", "art-object-page-content-",
+                                   "href"],
+                                  multiple=True)
+    assert ans == [expected, expected]
+
+
+def test_plan_missing_sections(plans):
+    """
+    a page without the sections answers empty data
+    """
+    assert plans.clean_plan("DESCRIPTION", list(), ROOT_URL) == dict()
+    assert plans.clean_plan("OBJ_DATA", None, ROOT_URL) == dict()
+    assert plans.clean_plan("DOWNLOAD_URL", None, ROOT_URL) is None
+
+
+def test_tokenizer_early_abort():
+    """
+    the streaming tokenizer finds the download URL before the end of the
+    page, in small chunks, with the same tag of the whole page
+    """
+    div = "a"
+    attrs = {"class": "btn-icon art-object-header-bar-button",
+             "href": re.compile("^/asset/download/")}
+    tokens = Tokenizer(targets=[(div, attrs)])
+    read = 0
+
+    while not tokens.complete() and read < len(STUB_PAGE):
+        tokens.feed(STUB_PAGE[read:read + 7])
+        read += 7
+
+    assert tokens.complete() is True
+    assert read < len(STUB_PAGE) / 2
+    soup = new_soup(tokens.get_markup())
+    expected = new_soup(STUB_PAGE).find(div, attrs=attrs)
+    assert str(soup.find(div, attrs=attrs)) == str(expected)
+
+
+def test_clrtexts_batch(plans):
+    """
+    the batch text cleaner answers the same of clrtext() one by one, even
+    for texts with the batch separator
+    """
+    texts = ["  Café\n'Nuenen'  ", "None", "a \t\n b", "", "x\x00y", None, 1885]
+    expected = [plans.clrtext(text) for text in texts]
+    assert plans.clrtexts(texts) == expected
+    assert plans.clrtexts(texts[:4]) == expected[:4]
+    assert plans.clrtexts(list()) == list()
+
+
+def test_text_cache(plans):
+    """
+    the text cache answers the clean texts of clrtext(), it counts the
+    repeated ones and forgets the least recently used over its size
+    """
+    cache = TextCache(maxsize=2)
+    texts = ["F-number", " Café ", "F-number", "1885", " Café "]
+
+    ans = [cache.get(text) for text in texts]
+    assert ans == [plans.clrtext(text) for text in texts]
+    assert ans[0] is ans[2]
+
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 4
+    assert stats["texts"] == 2 and stats["evictions"] == 2
+
+    ans = cache.get_batch(texts)
+    assert ans == [plans.clrtext(text) for text in texts]
+    assert cache.stats()["hits"] == 4
+
+
+def test_tokenizer_unclosed_tag():
+    """
+    a target tag still open at the end of the page is kept as the whole
+    page search finds it
+    """
+    page = ("<html><body><a class=\"btn-icon\" href=\"/asset/download/1\">"
+            "download <b>now</b></body></html>")
+    div = "a"
+    attrs = {"class": "btn-icon"}
+    tokens = Tokenizer(targets=[(div, attrs)])
+
+    for read in range(0, len(page), 7):
+        tokens.feed(page[read:read + 7])
+    tokens.finish()
+
+    assert tokens.complete() is True
+    soup = new_soup(tokens.get_markup())
+    expected = new_soup(page).find(div, attrs=attrs)
+    assert str(soup.find(div, attrs=attrs)) == str(expected)